@@ -19,6 +19,9 @@ LUSTRE_GROUP_QUOTA_COLLECT_EXE=lustre-group-quota-collect.py
 LUSTRE_WEEKLY_REPORTS_EXE=lustre-weekly-reports.py
 LUSTRE_MONTHLY_REPORTS_EXE=lustre-monthly-reports.py
 LUSTRE_MIGRATION_REPORT_EXE=lustre-migration-report.py
+LUSTRE_REPORTS_EXE=lustre-reports.py
+LUSTRE_COLLECTOR_DAEMON_EXE=lustre-collector-daemon.py
+LUSTRE_HISTORY_BACKFILL_EXE=lustre-history-backfill.py
 
 
 # $1 = expects executable file
@@ -56,6 +59,9 @@ case "$1" in
         build ${LUSTRE_WEEKLY_REPORTS_EXE}
         build ${LUSTRE_MONTHLY_REPORTS_EXE}
         build ${LUSTRE_MIGRATION_REPORT_EXE}
+        build ${LUSTRE_REPORTS_EXE}
+        build ${LUSTRE_COLLECTOR_DAEMON_EXE}
+        build ${LUSTRE_HISTORY_BACKFILL_EXE}
     ;;
 
     quota-collect)
@@ -74,12 +80,24 @@ case "$1" in
         build ${LUSTRE_MIGRATION_REPORT_EXE}
     ;;
 
+    reports)
+        build ${LUSTRE_REPORTS_EXE}
+    ;;
+
+    collector-daemon)
+        build ${LUSTRE_COLLECTOR_DAEMON_EXE}
+    ;;
+
+    history-backfill)
+        build ${LUSTRE_HISTORY_BACKFILL_EXE}
+    ;;
+
     clean)
         $(rm -r "$TARGET_DIR")
     ;;
 
     *)
-        echo "Usage: $0 {all|quota-collect|weekly-reports|monthly-reports|migration-report|clean}"
+        echo "Usage: $0 {all|quota-collect|weekly-reports|monthly-reports|migration-report|reports|collector-daemon|history-backfill|clean}"
         exit 1
     ;;
 
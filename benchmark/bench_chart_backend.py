@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Benchmark of the matplotlib and native svg chart backends.
+
+Run from the repository root:
+    python3 -m benchmark.bench_chart_backend -n 20 -r 5
+"""
+
+from decimal import Decimal
+
+import subprocess
+import argparse
+import tempfile
+import timeit
+import shutil
+import sys
+import os
+
+from chart.chart_backend import get_chart_class, CHART_CLASSES
+
+import dataset.item_handler as ih
+
+STORAGE_TOTAL_SIZE = 18458963071860736 * Decimal(1)
+
+
+def create_group_info_list(num_groups):
+
+    template = ih.create_dummy_group_info_list()
+    group_info_list = list()
+
+    for i in range(num_groups):
+
+        item = template[i % len(template)]
+
+        group_info_list.append(
+            ih.GroupInfoItem("group%d" % (i + 1), item.size, item.quota, item.files))
+
+    return group_info_list
+
+def create_chart(backend, chart_name, dataset, file_path):
+
+    chart_class = get_chart_class(backend, chart_name)
+
+    if chart_name == 'UsagePieChart':
+        return chart_class('Benchmark', dataset, file_path, STORAGE_TOTAL_SIZE, 8)
+
+    if chart_name == 'GroupFilesMigrationBarChart':
+
+        migration_list = \
+            [ih.GroupFilesMigrationInfoItem(item.name, item.size // 10**9, item.quota // 10**9)
+             for item in dataset]
+
+        return chart_class('Benchmark', migration_list, file_path, 'A', 'B')
+
+    return chart_class('Benchmark', dataset, file_path)
+
+def measure_import_time(backend):
+    """Measures the import time of a backend in a fresh interpreter."""
+
+    modules = sorted(set(module for module, _ in CHART_CLASSES[backend].values()))
+
+    code = "import time; t = time.perf_counter(); import %s; " \
+           "print(time.perf_counter() - t)" % ', '.join(modules)
+
+    output = subprocess.check_output([sys.executable, '-c', code],
+                                     stderr=subprocess.DEVNULL)
+
+    return float(output.decode().strip())
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Chart Backend Benchmark')
+
+    parser.add_argument('-n', '--num-groups', dest='num_groups', type=int,
+        default=20, help='Number of groups in the dataset - Default: 20')
+
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int,
+        default=5, help='Number of render repetitions - Default: 5')
+
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp()
+
+    print("%-12s %-28s %12s %12s" % ('Backend', 'Chart', 'Time (s)', 'Size (B)'))
+
+    try:
+
+        for backend in sorted(CHART_CLASSES):
+
+            try:
+                import_time = measure_import_time(backend)
+            except subprocess.CalledProcessError:
+                print("%-12s skipped - backend not importable" % backend)
+                continue
+
+            print("%-12s %-28s %12.4f" % (backend, 'import', import_time))
+
+            for chart_name in sorted(CHART_CLASSES[backend]):
+
+                file_path = os.path.join(out_dir, "%s_%s.svg" % (backend, chart_name))
+
+                def render():
+                    create_chart(backend, chart_name,
+                                 create_group_info_list(args.num_groups),
+                                 file_path).create()
+
+                best_time = min(timeit.repeat(render, number=1, repeat=args.repeat))
+
+                print("%-12s %-28s %12.4f %12d"
+                      % (backend, chart_name, best_time, os.path.getsize(file_path)))
+
+    finally:
+        shutil.rmtree(out_dir)
+
+if __name__ == '__main__':
+    main()
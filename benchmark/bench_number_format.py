@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Micro-benchmark of the byte unit formatters.
+
+Run from the repository root:
+    python3 -m benchmark.bench_number_format -n 100000
+"""
+
+from decimal import Decimal
+
+import argparse
+import random
+import timeit
+
+import numpy as np
+
+from format.number_format import number_to_base_2, number_to_base_2_fast, \
+    numbers_to_base_2
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Number Format Benchmark')
+
+    parser.add_argument('-n', '--num-values', dest='num_values', type=int,
+        default=100000, help='Number of values to format - Default: 100000')
+
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int,
+        default=5, help='Number of repetitions - Default: 5')
+
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+
+    values = [rng.randint(1, 1 << rng.randint(1, 62)) for _ in range(args.num_values)]
+    decimals = [Decimal(value) for value in values]
+    array = np.array(values, dtype=np.int64)
+
+    cases = [
+        ('number_to_base_2 (int)',
+            lambda: [number_to_base_2(value) for value in values]),
+        ('number_to_base_2_fast (int)',
+            lambda: [number_to_base_2_fast(value) for value in values]),
+        ('number_to_base_2 (Decimal)',
+            lambda: [number_to_base_2(value) for value in decimals]),
+        ('number_to_base_2_fast (Decimal)',
+            lambda: [number_to_base_2_fast(value) for value in decimals]),
+        ('numbers_to_base_2 (Decimal)',
+            lambda: numbers_to_base_2(decimals)),
+        ('numbers_to_base_2 (int64 array)',
+            lambda: numbers_to_base_2(array)),
+    ]
+
+    print("%-34s %12s %14s" % ('Formatter', 'Time (s)', 'Values/s'))
+
+    for name, func in cases:
+
+        best_time = min(timeit.repeat(func, number=1, repeat=args.repeat))
+
+        print("%-34s %12.4f %14.0f" % (name, best_time, args.num_values / best_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Benchmark of the report pipeline stages on synthetic data of any scale.
+
+Run from the repository root:
+    python3 -m benchmark.bench_pipeline --groups 100000 --osts 5000 --days 1825
+
+Results are saved as JSON, by default to benchmark/results/, and can be
+compared against a previous run to find regressions:
+    python3 -m benchmark.bench_pipeline --compare benchmark/results/<file>.json
+
+The DB write stage only runs with --db-config, a config file like the one of
+lustre-group-quota-collect.py pointing to a test database. It creates a
+table and inserts the history of --db-days days.
+"""
+
+import configparser
+import subprocess
+import itertools
+import datetime
+import argparse
+import platform
+import tempfile
+import timeit
+import shutil
+import json
+import sys
+import os
+
+from chart.svg_chart import SvgQuotaPctBarChart, SvgUsageQuotaBarChart, \
+    SvgUsagePieChart
+from utils.pandas_ import create_data_frame_weekly
+
+import dataset.synthetic_dataset as sd
+import dataset.lfs_dataset_handler as ldh
+import dataset.item_handler as ih
+import filter.group_filter_handler as gf
+
+FILE_SYSTEM = '/lustre'
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Default relative slowdown reported as regression by --compare.
+REGRESSION_THRESHOLD = 0.1
+
+
+def git_commit():
+
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def create_stages(args, work_dir):
+    """
+    Creates the input data and returns the stages as (name, items, function).
+    Creating the input data is not part of the measured time.
+    """
+
+    quota_file = os.path.join(work_dir, 'lfs_quota.out')
+    df_file = os.path.join(work_dir, 'lfs_df.out')
+
+    with open(quota_file, 'w') as f:
+        f.write(sd.create_lfs_quota_output(FILE_SYSTEM, args.groups, args.seed))
+
+    with open(df_file, 'w') as f:
+        f.write(sd.create_lfs_df_output(FILE_SYSTEM, args.osts, seed=args.seed))
+
+    group_info_list = sd.create_group_info_list(args.groups, args.seed)
+
+    date_values = sd.create_group_date_values(
+        args.trend_groups, args.days, seed=args.seed)
+
+    item_dict = ih.create_group_date_value_item_dict(date_values)
+
+    top_groups = gf.top_group_info_items(
+        group_info_list, args.chart_groups, gf.quota_used_ratio)
+
+    storage_total_size = sd.OST_KBYTES * sd.KIB * args.osts
+
+    def chart_path(name):
+        return os.path.join(work_dir, name)
+
+    stages = [
+        ('parse_lfs_quota', args.groups,
+            lambda: ldh.create_group_info_list(FILE_SYSTEM, quota_file)),
+        ('parse_lfs_df', args.osts,
+            lambda: ldh.create_storage_info(FILE_SYSTEM, df_file)),
+        ('filter_groups', args.groups,
+            lambda: gf.filter_group_info_items(group_info_list)),
+        ('top_groups', args.groups,
+            lambda: gf.top_group_info_items(
+                group_info_list, args.chart_groups, gf.quota_used_ratio)),
+        ('group_date_value_dict', len(date_values),
+            lambda: ih.create_group_date_value_item_dict(date_values)),
+        ('data_frame_weekly', len(date_values),
+            lambda: create_data_frame_weekly(item_dict)),
+        ('svg_quota_pct_bar_chart', len(top_groups),
+            lambda: SvgQuotaPctBarChart(
+                'Quota', list(top_groups), chart_path('quota_pct.svg')).create()),
+        ('svg_usage_quota_bar_chart', len(top_groups),
+            lambda: SvgUsageQuotaBarChart(
+                'Usage', list(top_groups), chart_path('usage_quota.svg')).create()),
+        ('svg_usage_pie_chart', args.groups,
+            lambda: SvgUsagePieChart(
+                'Pie', list(group_info_list), chart_path('pie.svg'),
+                storage_total_size, 8).create()),
+    ]
+
+    if not args.skip_matplotlib:
+
+        # Imported on demand, the SVG stages run without matplotlib.
+        from chart.quota_pct_bar_chart import QuotaPctBarChart
+        from chart.trend_chart import TrendChart
+
+        data_frame = create_data_frame_weekly(item_dict)
+
+        stages.extend([
+            ('matplotlib_quota_pct_bar_chart', len(top_groups),
+                lambda: QuotaPctBarChart(
+                    'Quota', list(top_groups), chart_path('mpl_quota_pct.svg')).create()),
+            ('matplotlib_trend_chart', data_frame.size,
+                lambda: TrendChart(
+                    'Trend', data_frame, chart_path('mpl_trend.svg'),
+                    'Time (Weeks)', 'Quota Used (%)').create()),
+        ])
+
+    if args.db_config:
+        stages.append(create_db_stage(args))
+
+    return stages
+
+def create_db_stage(args):
+
+    # Imported on demand, only this stage requires MySQLdb.
+    import database.group_quota_collect as gqc
+
+    config = configparser.ConfigParser()
+    config.read(args.db_config)
+
+    table = "BENCH_GROUP_QUOTA_%s" % datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+    config.set('history', 'table', table)
+
+    # Every repetition needs new dates, the dates are the primary key.
+    history = iter(list(sd.create_group_quota_history(
+        args.groups, args.db_days * args.repeat, seed=args.seed)))
+
+    gqc.create_group_quota_history_table(config)
+
+    print("Created benchmark table: %s" % table)
+
+    def store():
+        for date, group_info_list in itertools.islice(history, args.db_days):
+            gqc.store_group_quota(config, date, group_info_list)
+
+    return ('db_store_group_quota', args.groups * args.db_days, store)
+
+def run_stages(stages, repeat):
+
+    results = dict()
+
+    for name, items, func in stages:
+
+        times = timeit.repeat(func, number=1, repeat=repeat)
+
+        results[name] = {
+            'items': items,
+            'best': min(times),
+            'mean': sum(times) / len(times),
+        }
+
+        print("%-45s %10d %12.4f %14.0f" % (name, items, min(times), items / min(times)))
+
+    return results
+
+def compare_results(results, previous, threshold=REGRESSION_THRESHOLD):
+
+    print()
+    print("Compared to %s (%s)" % (previous['commit'], previous['created']))
+    print("%-45s %12s %12s %10s" % ('Stage', 'Before (s)', 'After (s)', 'Change'))
+
+    regressions = list()
+
+    for name in results:
+
+        if name not in previous['results']:
+            continue
+
+        before = previous['results'][name]['best']
+        after = results[name]['best']
+        change = after / before - 1
+
+        mark = ''
+
+        if change > threshold:
+            mark = ' REGRESSION'
+            regressions.append(name)
+
+        print("%-45s %12.4f %12.4f %+9.1f%%%s"
+              % (name, before, after, change * 100, mark))
+
+    return regressions
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Report Pipeline Benchmark')
+
+    parser.add_argument('--groups', type=int, default=10000,
+        help='Number of groups - Default: 10000')
+
+    parser.add_argument('--osts', type=int, default=1000,
+        help='Number of OSTs - Default: 1000')
+
+    parser.add_argument('--days', type=int, default=365,
+        help='Days of quota history for the trend data - Default: 365')
+
+    parser.add_argument('--trend-groups', dest='trend_groups', type=int,
+        default=50, help='Number of groups in the trend data - Default: 50')
+
+    parser.add_argument('--chart-groups', dest='chart_groups', type=int,
+        default=100, help='Number of top groups in bar charts - Default: 100')
+
+    parser.add_argument('--seed', type=int, default=0,
+        help='Seed of the synthetic data - Default: 0')
+
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+        help='Number of repetitions - Default: 5')
+
+    parser.add_argument('--skip-matplotlib', dest='skip_matplotlib',
+        action='store_true', help='Skips the matplotlib chart stages.')
+
+    parser.add_argument('--db-config', dest='db_config', type=str,
+        help='Config file of a test database for the DB write stage.')
+
+    parser.add_argument('--db-days', dest='db_days', type=int, default=1,
+        help='Days of history inserted per DB write repetition - Default: 1')
+
+    parser.add_argument('-o', '--output', type=str,
+        help='Path of the result file - Default: benchmark/results/<date>-<commit>.json')
+
+    parser.add_argument('--compare', type=str,
+        help='Result file of a previous run to compare with.')
+
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+        help='Relative slowdown reported as regression - Default: %s'
+            % REGRESSION_THRESHOLD)
+
+    args = parser.parse_args()
+
+    commit = git_commit()
+    created = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+    work_dir = tempfile.mkdtemp()
+
+    try:
+
+        print("%-45s %10s %12s %14s" % ('Stage', 'Items', 'Time (s)', 'Items/s'))
+
+        results = run_stages(create_stages(args, work_dir), args.repeat)
+
+    finally:
+        shutil.rmtree(work_dir)
+
+    output = args.output
+
+    if not output:
+
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+
+        output = os.path.join(RESULTS_DIR, "%s-%s.json"
+            % (created.replace(':', ''), commit))
+
+    params = {key: value for key, value in vars(args).items()
+              if key not in ('output', 'compare', 'threshold', 'db_config')}
+
+    with open(output, 'w') as f:
+
+        json.dump({'created': created,
+                   'commit': commit,
+                   'python': platform.python_version(),
+                   'platform': platform.platform(),
+                   'params': params,
+                   'results': results}, f, indent=2, sort_keys=True)
+
+    print("Saved results: %s" % output)
+
+    if args.compare:
+
+        with open(args.compare, 'r') as f:
+            previous = json.load(f)
+
+        if previous['params'] != params:
+            print("Warning: Parameters differ from the compared run: %s"
+                  % previous['params'])
+
+        if compare_results(results, previous, args.threshold):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
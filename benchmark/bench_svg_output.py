@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Benchmark of the SVG output options on the charts shown in Images/.
+
+Run from the repository root:
+    python3 -m benchmark.bench_svg_output
+"""
+
+from decimal import Decimal
+
+import configparser
+import argparse
+import tempfile
+import timeit
+import shutil
+import os
+
+import matplotlib
+
+from chart.chart_backend import configure_svg_output
+from chart.quota_pct_bar_chart import QuotaPctBarChart
+from chart.usage_quota_bar_chart import UsageQuotaBarChart
+from chart.usage_pie_chart import UsagePieChart
+from chart.trend_chart import TrendChart
+from utils.pandas_ import create_data_frame_weekly
+
+import dataset.item_handler as ih
+
+# Output options as (name, [base_chart] options, file extension).
+OUTPUT_OPTIONS = [
+    ('default', {}, 'svg'),
+    ('fonttype-none', {'svg_fonttype': 'none'}, 'svg'),
+    ('simplify', {'path_simplify_threshold': '0.5'}, 'svg'),
+    ('svgz', {}, 'svgz'),
+    ('all', {'svg_fonttype': 'none', 'path_simplify_threshold': '0.5'}, 'svgz'),
+]
+
+
+def create_charts(out_dir, extension):
+
+    storage_total_size = 18458963071860736 * Decimal(1)
+
+    quota_trend_frame = create_data_frame_weekly(
+        ih.create_group_date_value_item_dict(
+            ih.create_dummy_group_date_values(50, 200)))
+
+    usage_trend_frame = create_data_frame_weekly(
+        ih.create_group_date_value_item_dict(
+            ih.create_dummy_group_date_values(8, 1000)))
+
+    def path(name):
+        return os.path.join(out_dir, "%s.%s" % (name, extension))
+
+    return [
+        QuotaPctBarChart('Group Quota Usage on Lustre',
+                         ih.create_dummy_group_info_list(),
+                         path('soft_quota_pcnt')),
+        UsageQuotaBarChart('Quota and Disk Space Usage on Lustre',
+                           ih.create_dummy_group_info_list(),
+                           path('usage+quota_bar')),
+        UsagePieChart('Storage Usage on Lustre',
+                      ih.create_dummy_group_info_list(),
+                      path('usage_pie'), storage_total_size, 8),
+        TrendChart('Group Quota Trend on Lustre', quota_trend_frame,
+                   path('soft_quota_trend'), 'Time (Weeks)', 'Quota Used (%)'),
+        TrendChart('Top Groups Usage Trend on Lustre', usage_trend_frame,
+                   path('usage_trend'), 'Time (Weeks)', 'Disk Space Used (TiB)'),
+    ]
+
+def main():
+
+    parser = argparse.ArgumentParser(description='SVG Output Options Benchmark')
+
+    parser.add_argument('-r', '--repeat', dest='repeat', type=int,
+        default=3, help='Number of render repetitions - Default: 3')
+
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp()
+
+    print("%-16s %-22s %12s %12s" % ('Options', 'Chart', 'Time (s)', 'Size (B)'))
+
+    try:
+
+        for name, options, extension in OUTPUT_OPTIONS:
+
+            matplotlib.rcdefaults()
+
+            config = configparser.ConfigParser()
+            config.read_dict({'base_chart': options})
+
+            configure_svg_output(config)
+
+            total_time = 0.0
+            total_size = 0
+
+            for chart in create_charts(out_dir, extension):
+
+                best_time = min(timeit.repeat(chart.create, number=1, repeat=args.repeat))
+
+                file_size = os.path.getsize(chart.file_path)
+
+                total_time += best_time
+                total_size += file_size
+
+                print("%-16s %-22s %12.4f %12d"
+                      % (name, os.path.basename(chart.file_path), best_time, file_size))
+
+            print("%-16s %-22s %12.4f %12d" % (name, 'total', total_time, total_size))
+
+    finally:
+        shutil.rmtree(out_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Captures the output and latency of lfs, getent and sudo calls into an
+archive and replays them by stub executables, so the collectors can be
+load tested offline under production like latencies.
+
+Run from the repository root. Capture the calls of a real collection run:
+    python3 -m benchmark.lfs_replay capture -a archive -- \\
+        ./lustre-group-quota-collect.py -f collect.conf -m print
+
+Or create an archive of synthetic groups without a Lustre file system:
+    python3 -m benchmark.lfs_replay synthesize -a archive -g 5000 /lustre
+
+Replay a run with the recorded latencies halved:
+    python3 -m benchmark.lfs_replay replay -a archive --scale 0.5 -- \\
+        ./lustre-group-quota-collect.py -f collect.conf -m print
+
+Without a command, replay installs the stubs into --stub-dir to be put in
+front of PATH. The file systems of the replayed calls must exist as
+directories, since the collectors check the path before calling lfs.
+
+The archive is a directory with one JSON file per distinct command line,
+so the stubs of parallel calls read and write independent files. A call
+run by sudo is stored without sudo and timeout. Each stub starts a Python interpreter,
+which adds its startup time to the replayed latencies.
+"""
+
+import subprocess
+import argparse
+import datetime
+import tempfile
+import hashlib
+import shutil
+import shlex
+import json
+import time
+import sys
+import os
+
+# Executables replaced by stubs.
+STUB_COMMANDS = ('sudo', 'lfs', 'lctl', 'getent')
+
+CALLS_DIR = 'calls'
+MANIFEST_FILE = 'manifest.json'
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def normalize_argv(argv):
+    """
+    :return: The command line without sudo, timeout and the path of the executable.
+    """
+
+    argv = list(argv)
+
+    if argv and os.path.basename(argv[0]) == 'sudo':
+        argv = argv[1:]
+
+    # Strips the 'timeout [OPTION] DURATION' of run_lfs_quota().
+    if argv and os.path.basename(argv[0]) == 'timeout':
+
+        index = 1
+
+        while index < len(argv) and argv[index].startswith('-'):
+            index += 2 if argv[index] in ('-s', '-k') else 1
+
+        argv = argv[index + 1:]
+
+    if not argv:
+        raise RuntimeError("Empty command line!")
+
+    argv[0] = os.path.basename(argv[0])
+
+    return argv
+
+def command_key(argv):
+    """
+    :return: The archive key of a command line.
+    """
+    return hashlib.sha1('\0'.join(normalize_argv(argv)).encode()).hexdigest()
+
+
+class CallArchive:
+
+    def __init__(self, path):
+
+        self.path = path
+        self.calls_dir = os.path.join(path, CALLS_DIR)
+
+    def create(self, description):
+
+        os.makedirs(self.calls_dir, exist_ok=True)
+
+        with open(os.path.join(self.path, MANIFEST_FILE), 'w') as f:
+
+            json.dump({'created': datetime.datetime.now().isoformat(),
+                       'host': os.uname().nodename,
+                       'description': description}, f, indent=2)
+
+    def check(self):
+
+        if not os.path.isdir(self.calls_dir):
+            raise RuntimeError("Not a call archive: %s" % self.path)
+
+    def store(self, argv, latency, returncode, stdout, stderr=b''):
+        """Stores a call, a later call of the same command line replaces it."""
+
+        record = {'argv': normalize_argv(argv),
+                  'latency': latency,
+                  'returncode': returncode,
+                  'stdout': stdout.decode('utf-8', 'surrogateescape'),
+                  'stderr': stderr.decode('utf-8', 'surrogateescape')}
+
+        path = os.path.join(self.calls_dir, command_key(argv) + '.json')
+
+        fd, temp_path = tempfile.mkstemp(dir=self.calls_dir)
+
+        with os.fdopen(fd, 'w') as f:
+            json.dump(record, f)
+
+        os.rename(temp_path, path)
+
+    def load(self, argv):
+        """
+        :return: The record dict of the command line or None.
+        """
+
+        path = os.path.join(self.calls_dir, command_key(argv) + '.json')
+
+        if not os.path.isfile(path):
+            return None
+
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def records(self):
+
+        for file_name in sorted(os.listdir(self.calls_dir)):
+
+            if file_name.endswith('.json'):
+
+                with open(os.path.join(self.calls_dir, file_name), 'r') as f:
+                    yield json.load(f)
+
+
+def install_stubs(stub_dir, mode, archive_path, arg_func):
+    """
+    Writes shell stubs calling this module for STUB_COMMANDS. The stub modes
+    only need the standard library, so the interpreter skips the site
+    packages (-S) to start faster.
+    :param mode: 'serve' or 'record'.
+    :param arg_func: Returns the mode argument of a command, None skips the command.
+    """
+
+    os.makedirs(stub_dir, exist_ok=True)
+
+    installed = list()
+
+    for name in STUB_COMMANDS:
+
+        arg = arg_func(name)
+
+        if arg is None:
+            continue
+
+        path = os.path.join(stub_dir, name)
+
+        with open(path, 'w') as f:
+
+            f.write("#!/bin/sh\n")
+            f.write("PYTHONPATH=%s exec %s -S -m benchmark.lfs_replay %s %s %s %s \"$@\"\n"
+                % (shlex.quote(REPO_DIR), shlex.quote(sys.executable), mode,
+                   shlex.quote(os.path.abspath(archive_path)), shlex.quote(str(arg)), name))
+
+        os.chmod(path, 0o755)
+        installed.append(name)
+
+    return installed
+
+def run_with_stubs(stub_dir, command):
+
+    env = dict(os.environ)
+    env['PATH'] = stub_dir + os.pathsep + env.get('PATH', '')
+
+    return subprocess.call(command, env=env)
+
+def serve(archive_path, scale, argv):
+    """Writes the recorded output of argv after the scaled recorded latency."""
+
+    record = CallArchive(archive_path).load(argv)
+
+    if record is None:
+        sys.stderr.write("lfs_replay: No recorded call: %s\n" % ' '.join(argv))
+        return 1
+
+    time.sleep(record['latency'] * scale)
+
+    sys.stdout.buffer.write(record['stdout'].encode('utf-8', 'surrogateescape'))
+    sys.stderr.buffer.write(record['stderr'].encode('utf-8', 'surrogateescape'))
+
+    return record['returncode']
+
+def record(archive_path, real_path, argv):
+    """Runs the real executable and stores its output and latency."""
+
+    start_time = time.perf_counter()
+
+    process = subprocess.run([real_path] + argv[1:],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    latency = time.perf_counter() - start_time
+
+    CallArchive(archive_path).store(
+        argv, latency, process.returncode, process.stdout, process.stderr)
+
+    sys.stdout.buffer.write(process.stdout)
+    sys.stderr.buffer.write(process.stderr)
+
+    return process.returncode
+
+def synthesize(archive_path, file_systems, num_groups, latency_median, seed=0):
+    """
+    Creates an archive of getent, lfs quota and lfs df calls of synthetic
+    groups with log-normal distributed latencies.
+    """
+
+    import numpy as np
+
+    import dataset.synthetic_dataset as sd
+    import dataset.lfs_dataset_handler as ldh
+
+    archive = CallArchive(archive_path)
+    archive.create("Synthetic: %d groups, median latency %.3fs"
+                   % (num_groups, latency_median))
+
+    rng = np.random.default_rng(seed)
+
+    archive.store(['getent', 'group'], 0.01, 0,
+                  sd.create_getent_group_output(num_groups).encode())
+
+    groups = sd.create_groups(num_groups)
+
+    for index, file_system in enumerate(file_systems):
+
+        outputs = sd.create_lfs_quota_outputs(file_system, num_groups, seed + index)
+
+        latencies = rng.lognormal(np.log(latency_median), 0.5, num_groups)
+
+        for (name, _), output, latency in zip(groups, outputs, latencies):
+
+            archive.store([ldh.LFS_BIN, 'quota', '-g', name, file_system],
+                          float(latency), 0, output.encode())
+
+        archive.store([ldh.LFS_BIN, 'df', file_system], latency_median, 0,
+                      sd.create_lfs_df_output(file_system, 100, seed=seed + index).encode())
+
+def summarize(archive_path):
+
+    archive = CallArchive(archive_path)
+    archive.check()
+
+    summary = dict()
+
+    for call in archive.records():
+
+        name = ' '.join(call['argv'][:2])
+
+        calls, errors, latency = summary.get(name, (0, 0, 0.0))
+
+        summary[name] = (calls + 1, errors + int(call['returncode'] != 0),
+                         latency + call['latency'])
+
+    lines = ["%-20s %8s %7s %12s %12s" % ('Command', 'Calls', 'Errors', 'Total (s)', 'Mean (s)')]
+
+    for name, (calls, errors, latency) in sorted(summary.items()):
+        lines.append("%-20s %8d %7d %12.3f %12.4f" % (name, calls, errors, latency, latency / calls))
+
+    return lines
+
+def main():
+
+    if len(sys.argv) > 1 and sys.argv[1] in ('serve', 'record'):
+
+        # Internal modes called by the stubs: <mode> <archive> <arg> <name> <args...>
+        mode, archive_path, arg = sys.argv[1:4]
+        argv = sys.argv[4:]
+
+        if mode == 'serve':
+            return serve(archive_path, float(arg), argv)
+
+        return record(archive_path, arg, argv)
+
+    parser = argparse.ArgumentParser(description='Captures and replays lfs and getent calls.')
+
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    capture_parser = subparsers.add_parser('capture',
+        help='Runs a command and records its lfs, getent and sudo calls.')
+    capture_parser.add_argument('-a', '--archive', required=True, help='Archive directory.')
+    capture_parser.add_argument('command', nargs=argparse.REMAINDER)
+
+    synthesize_parser = subparsers.add_parser('synthesize',
+        help='Creates an archive of synthetic groups.')
+    synthesize_parser.add_argument('-a', '--archive', required=True, help='Archive directory.')
+    synthesize_parser.add_argument('-g', '--groups', type=int, default=1000,
+        help='Number of groups - Default: 1000')
+    synthesize_parser.add_argument('-l', '--latency', type=float, default=0.05,
+        help='Median latency of lfs quota in seconds - Default: 0.05')
+    synthesize_parser.add_argument('--seed', type=int, default=0)
+    synthesize_parser.add_argument('file_systems', nargs='+')
+
+    replay_parser = subparsers.add_parser('replay',
+        help='Runs a command with stubs serving the recorded calls.')
+    replay_parser.add_argument('-a', '--archive', required=True, help='Archive directory.')
+    replay_parser.add_argument('-s', '--scale', type=float, default=1.0,
+        help='Factor of the recorded latencies, 0 disables them - Default: 1.0')
+    replay_parser.add_argument('-d', '--stub-dir',
+        help='Installs the stubs into the directory instead of running a command.')
+    replay_parser.add_argument('command', nargs=argparse.REMAINDER)
+
+    info_parser = subparsers.add_parser('info', help='Summarizes an archive.')
+    info_parser.add_argument('-a', '--archive', required=True, help='Archive directory.')
+
+    args = parser.parse_args()
+
+    command = [arg for arg in getattr(args, 'command', []) if arg != '--']
+
+    if args.mode == 'capture':
+
+        if not command:
+            parser.error('capture requires a command')
+
+        CallArchive(args.archive).create(' '.join(command))
+
+        stub_dir = tempfile.mkdtemp(prefix='lfs_replay_')
+
+        try:
+            # The real executables are resolved before the stubs shadow them.
+            install_stubs(stub_dir, 'record', args.archive, shutil.which)
+            return run_with_stubs(stub_dir, command)
+        finally:
+            shutil.rmtree(stub_dir)
+
+    if args.mode == 'synthesize':
+
+        synthesize(args.archive, args.file_systems, args.groups, args.latency, args.seed)
+
+        for line in summarize(args.archive):
+            print(line)
+
+        return 0
+
+    if args.mode == 'replay':
+
+        CallArchive(args.archive).check()
+
+        if args.stub_dir:
+
+            install_stubs(args.stub_dir, 'serve', args.archive, lambda name: args.scale)
+            print("export PATH=%s:$PATH" % shlex.quote(os.path.abspath(args.stub_dir)))
+
+            return 0
+
+        if not command:
+            parser.error('replay requires a command or --stub-dir')
+
+        stub_dir = tempfile.mkdtemp(prefix='lfs_replay_')
+
+        try:
+            install_stubs(stub_dir, 'serve', args.archive, lambda name: args.scale)
+            return run_with_stubs(stub_dir, command)
+        finally:
+            shutil.rmtree(stub_dir)
+
+    for line in summarize(args.archive):
+        print(line)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
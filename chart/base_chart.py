@@ -17,6 +17,11 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
+from dataset.item_handler import AggregatedGroupInfoItem
+
+SVG_FILE_TYPE = 'svg'
+SVGZ_FILE_TYPE = 'svgz'
+
 
 class BaseChart(object):
 
@@ -36,7 +41,11 @@ class BaseChart(object):
         self.x_label = x_label
         self.y_label = y_label
 
-        self._file_type = 'svg'
+        # Compressed output is written for file paths ending with '.svgz'.
+        if file_path.endswith('.' + SVGZ_FILE_TYPE):
+            self._file_type = SVGZ_FILE_TYPE
+        else:
+            self._file_type = SVG_FILE_TYPE
 
         self._figure = None
         self._ax = None
@@ -57,7 +66,13 @@ class BaseChart(object):
     def _sort_dataset(self, key, reverse=False):
 
         if isinstance(self.dataset, list):
+
             self.dataset.sort(key=key, reverse=reverse)
+
+            # Aggregated items like 'others' are always shown last.
+            self.dataset.sort(
+                key=lambda item: isinstance(item, AggregatedGroupInfoItem))
+
         else:
             raise RuntimeError("Operation not supported for not list type!")
 
@@ -89,7 +104,7 @@ class BaseChart(object):
             (self.__class__, sys._getframe().f_code.co_name))
 
     def _save(self):
-        plt.savefig(self.file_path, type=self._file_type)
+        plt.savefig(self.file_path, format=self._file_type)
 
     def _close(self):
         plt.close(self._figure)
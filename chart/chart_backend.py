@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import logging
+
+MATPLOTLIB_BACKEND = 'matplotlib'
+SVG_BACKEND = 'svg'
+
+DEFAULT_BACKEND = MATPLOTLIB_BACKEND
+
+# Modules and classes of the charts by backend, imported on demand by
+# _import_chart_classes(), so the svg backend does not pay the import
+# cost of matplotlib.
+CHART_CLASSES = {
+    MATPLOTLIB_BACKEND: {
+        'QuotaPctBarChart':
+            ('chart.quota_pct_bar_chart', 'QuotaPctBarChart'),
+        'UsageQuotaBarChart':
+            ('chart.usage_quota_bar_chart', 'UsageQuotaBarChart'),
+        'UsagePieChart':
+            ('chart.usage_pie_chart', 'UsagePieChart'),
+        'GroupFilesMigrationBarChart':
+            ('chart.group_files_migration_bar_chart', 'GroupFilesMigrationBarChart'),
+    },
+    SVG_BACKEND: {
+        'QuotaPctBarChart':
+            ('chart.svg_chart', 'SvgQuotaPctBarChart'),
+        'UsageQuotaBarChart':
+            ('chart.svg_chart', 'SvgUsageQuotaBarChart'),
+        'UsagePieChart':
+            ('chart.svg_chart', 'SvgUsagePieChart'),
+        'GroupFilesMigrationBarChart':
+            ('chart.svg_chart', 'SvgGroupFilesMigrationBarChart'),
+    },
+}
+
+def _import_chart_classes(backend):
+    """
+    Imports the chart classes of a backend statically,
+    so PyInstaller finds the modules.
+    :return: A dict of chart name to chart class.
+    """
+
+    if backend == MATPLOTLIB_BACKEND:
+
+        from chart.quota_pct_bar_chart import QuotaPctBarChart
+        from chart.usage_quota_bar_chart import UsageQuotaBarChart
+        from chart.usage_pie_chart import UsagePieChart
+        from chart.group_files_migration_bar_chart import GroupFilesMigrationBarChart
+
+        return {'QuotaPctBarChart': QuotaPctBarChart,
+                'UsageQuotaBarChart': UsageQuotaBarChart,
+                'UsagePieChart': UsagePieChart,
+                'GroupFilesMigrationBarChart': GroupFilesMigrationBarChart}
+
+    if backend == SVG_BACKEND:
+
+        from chart.svg_chart import SvgQuotaPctBarChart, SvgUsageQuotaBarChart, \
+            SvgUsagePieChart, SvgGroupFilesMigrationBarChart
+
+        return {'QuotaPctBarChart': SvgQuotaPctBarChart,
+                'UsageQuotaBarChart': SvgUsageQuotaBarChart,
+                'UsagePieChart': SvgUsagePieChart,
+                'GroupFilesMigrationBarChart': SvgGroupFilesMigrationBarChart}
+
+    raise RuntimeError("Unsupported chart backend: %s" % backend)
+
+def get_chart_class(backend, chart_name):
+
+    if backend not in CHART_CLASSES:
+        raise RuntimeError("Unsupported chart backend: %s" % backend)
+
+    if chart_name not in CHART_CLASSES[backend]:
+        raise RuntimeError("Chart %s not supported by backend: %s"
+            % (chart_name, backend))
+
+    module_name, class_name = CHART_CLASSES[backend][chart_name]
+
+    logging.debug("Using chart class %s.%s" % (module_name, class_name))
+
+    return _import_chart_classes(backend)[chart_name]
+
+def get_backend(config):
+
+    backend = config.get('base_chart', 'backend', fallback=DEFAULT_BACKEND)
+
+    if backend not in CHART_CLASSES:
+        raise RuntimeError("Unsupported chart backend: %s" % backend)
+
+    return backend
+
+def configure_svg_output(config):
+    """
+    Sets the SVG output options of matplotlib for all charts from the
+    optional 'svg_fonttype' and 'path_simplify_threshold' options
+    of the [base_chart] config section.
+
+    svg_fonttype = none writes labels as text instead of glyph paths.
+    path_simplify_threshold enables path simplification,
+    higher values remove more vertices of line plots.
+    """
+
+    # Imported lazily, so the svg chart backend does not load matplotlib.
+    import matplotlib
+
+    svg_fonttype = config.get('base_chart', 'svg_fonttype', fallback='path')
+
+    if svg_fonttype not in ('none', 'path'):
+        raise RuntimeError("Invalid svg_fonttype: %s" % svg_fonttype)
+
+    matplotlib.rcParams['svg.fonttype'] = svg_fonttype
+
+    if config.has_option('base_chart', 'path_simplify_threshold'):
+
+        matplotlib.rcParams['path.simplify'] = True
+        matplotlib.rcParams['path.simplify_threshold'] = \
+            config.getfloat('base_chart', 'path_simplify_threshold')
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import logging
+import os
+
+from dataset.item_handler import AggregatedGroupInfoItem
+
+def page_file_path(file_path, page):
+    """Returns the file path for a page, e.g. 'chart.svg' -> 'chart_2.svg'."""
+
+    root, ext = os.path.splitext(file_path)
+
+    return "%s_%d%s" % (root, page, ext)
+
+def create_chart_pages(chart_class,
+                       title,
+                       dataset,
+                       file_path,
+                       items_per_page,
+                       sort_key,
+                       reverse=False):
+    """
+    Creates one chart per page with a fixed number of items.
+    The dataset is sorted like the chart sorts it, so the pages continue
+    each other. Aggregated items like 'others' are put on the last page.
+    :param chart_class: Chart class taking (title, dataset, file_path).
+    :param items_per_page: Number of items per page, 0 creates a single chart.
+    :param sort_key: Sort key of the chart class.
+    :param reverse: Sort order of the chart class.
+    :return: A list of the created chart file paths.
+    """
+
+    if not items_per_page or len(dataset) <= items_per_page:
+
+        chart_class(title, dataset, file_path).create()
+
+        return [file_path]
+
+    sorted_dataset = sorted(dataset, key=sort_key, reverse=reverse)
+    sorted_dataset.sort(key=lambda item: isinstance(item, AggregatedGroupInfoItem))
+
+    num_pages = (len(sorted_dataset) + items_per_page - 1) // items_per_page
+
+    chart_path_list = list()
+
+    for page in range(1, num_pages + 1):
+
+        page_dataset = \
+            sorted_dataset[(page - 1) * items_per_page:page * items_per_page]
+
+        page_title = "%s (%d/%d)" % (title, page, num_pages)
+        page_path = page_file_path(file_path, page)
+
+        chart_class(page_title, page_dataset, page_path).create()
+
+        logging.debug("Created chart page: %s" % page_path)
+        chart_path_list.append(page_path)
+
+    return chart_path_list
@@ -18,49 +18,54 @@ import matplotlib
 matplotlib.use('Agg')
 
 
+# Bar colors of the file systems, the first two as before.
+FS_COLORS = ['blue', 'orange', 'green', 'red', 'purple', 'brown']
+
+
 # TODO: One BarChart Implementation should be enough.
 #       Use x1_label, x2_label, x1_values, x2_values..
 class GroupFilesMigrationBarChart(BaseChart):
 
-    def __init__(self, title, dataset, file_path, fs1_name, fs2_name):
+    def __init__(self, title, dataset, file_path, *fs_names):
+        """
+        :param fs_names: Names of the file systems in the order of the file counts.
+        """
 
         super(GroupFilesMigrationBarChart, self).__init__(
             title, dataset, file_path,
             x_label='Group',
             y_label='File Count')
 
-        self.fs1_name = fs1_name
-        self.fs2_name = fs2_name
+        self.fs_names = fs_names
 
     def _draw(self):
 
         self._sort_dataset(
             key=lambda group_info: group_info.fs1_file_count, reverse=True)
 
-        max_y = float(self.dataset[0].fs1_file_count)
+        max_y = float(max(max(group_info_item.file_counts)
+                          for group_info_item in self.dataset))
 
         num_groups = len(self.dataset)
+        num_fs = len(self.fs_names)
 
-        group_names = list()
-        fs1_file_count_values = list()
-        fs2_file_count_values = list()
+        group_names = [group_info_item.name for group_info_item in self.dataset]
 
-        for group_info_item in self.dataset:
+        ind = np.arange(num_groups)  # The x locations for the groups
 
-            group_names.append(group_info_item.name)
-            fs1_file_count_values.append(group_info_item.fs1_file_count)
-            fs2_file_count_values.append(group_info_item.fs2_file_count)
+        bar_width = 0.7 / num_fs  # the width of the bars: can also be len(x) sequence
 
-        ind = np.arange(num_groups)  # The x locations for the groups
+        bars = list()
 
-        bar_width = 0.35  # the width of the bars: can also be len(x) sequence
+        for index in range(num_fs):
 
-        p1 = self._ax.bar(ind, fs1_file_count_values, bar_width, color='blue')
+            file_count_values = [group_info_item.file_counts[index]
+                                 for group_info_item in self.dataset]
 
-        p2 = self._ax.bar(ind + bar_width, fs2_file_count_values,
-                          bar_width, color='orange')
+            bars.append(self._ax.bar(ind + bar_width * index, file_count_values,
+                                     bar_width, color=FS_COLORS[index % len(FS_COLORS)]))
 
-        self._ax.set_xticks(ind + bar_width / 2)
+        self._ax.set_xticks(ind + bar_width * (num_fs - 1) / 2)
         self._ax.set_xticklabels(group_names, rotation=45)
 
         tick_width_y = max_y / 10
@@ -68,4 +73,4 @@ class GroupFilesMigrationBarChart(BaseChart):
         # requires floating arguments...
         self._ax.set_yticks(np.arange(0, max_y, tick_width_y))
 
-        self._ax.legend((p1[0], p2[0]), (self.fs1_name, self.fs2_name))
+        self._ax.legend([bar[0] for bar in bars], self.fs_names)
@@ -0,0 +1,691 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import abc
+import sys
+import math
+import gzip
+import bisect
+import datetime
+
+from xml.sax.saxutils import escape
+from decimal import Decimal
+
+import format.number_format as nf
+
+from dataset.item_handler import AggregatedGroupInfoItem
+
+# Points per inch, same unit matplotlib uses for SVG output.
+PT_PER_INCH = 72
+
+# Default subplot parameters of matplotlib (figure fractions).
+SUBPLOT_LEFT = 0.125
+SUBPLOT_RIGHT = 0.9
+SUBPLOT_BOTTOM = 0.11
+SUBPLOT_TOP = 0.88
+
+# Default axis margin of matplotlib for auto scaled data limits.
+AXIS_MARGIN = 0.05
+
+FONT_FAMILY = 'DejaVu Sans,Bitstream Vera Sans,Arial,sans-serif'
+
+# Anchor colors of the ColorBrewer 'Spectral' color map.
+SPECTRAL_COLORS = ['#9e0142', '#d53e4f', '#f46d43', '#fdae61', '#fee08b',
+                   '#ffffbf', '#e6f598', '#abdda4', '#66c2a5', '#3288bd',
+                   '#5e4fa2']
+
+
+def _fmt(value):
+    """Formats a coordinate compact with at most two decimal places."""
+
+    text = '%.2f' % value
+
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+
+    if text == '-0':
+        text = '0'
+
+    return text
+
+
+class SvgChart(object):
+    """
+    Lightweight chart base class writing SVG directly without matplotlib.
+
+    The layout follows the matplotlib defaults used by BaseChart,
+    so the output of both backends can be used interchangeable.
+    """
+
+    def __init__(self, title, dataset, file_path, x_label='', y_label='', width=20, height=10):
+
+        __metaclass__ = abc.ABCMeta
+
+        super(SvgChart, self).__init__()
+
+        self.title = title
+        self.dataset = dataset
+        self.file_path = file_path
+
+        self.width = width
+        self.height = height
+
+        self.x_label = x_label
+        self.y_label = y_label
+
+        self._subplot_top = SUBPLOT_TOP
+
+        self._elements = None
+
+        self._x_lim = (0.0, 1.0)
+        self._y_lim = (0.0, 1.0)
+
+    @property
+    def _px_width(self):
+        return self.width * PT_PER_INCH
+
+    @property
+    def _px_height(self):
+        return self.height * PT_PER_INCH
+
+    @property
+    def _axes_box(self):
+        """Returns the axes area as (left, top, right, bottom) in pixels."""
+
+        return (self._px_width * SUBPLOT_LEFT,
+                self._px_height * (1 - self._subplot_top),
+                self._px_width * SUBPLOT_RIGHT,
+                self._px_height * (1 - SUBPLOT_BOTTOM))
+
+    def create(self):
+
+        self._elements = list()
+
+        self._draw()
+
+        self._set_figure_and_axis_attr()
+        self._add_creation_text()
+
+        self._save()
+        self._close()
+
+    def _sort_dataset(self, key, reverse=False):
+
+        if isinstance(self.dataset, list):
+
+            self.dataset.sort(key=key, reverse=reverse)
+
+            # Aggregated items like 'others' are always shown last.
+            self.dataset.sort(
+                key=lambda item: isinstance(item, AggregatedGroupInfoItem))
+
+        else:
+            raise RuntimeError("Operation not supported for not list type!")
+
+    def _add_creation_text(self):
+
+        self._add_text(0, self._px_height - 2,
+                       datetime.datetime.now().strftime('%Y-%m-%d - %X'),
+                       size=8, anchor='start')
+
+    def _set_figure_and_axis_attr(self):
+
+        left, top, right, bottom = self._axes_box
+
+        self._add_text(self._px_width / 2, self._px_height * 0.02 + 18,
+                       self.title, size=18, weight='bold')
+
+        if self.x_label:
+            self._add_text((left + right) / 2, self._px_height - 12,
+                           self.x_label)
+
+        if self.y_label:
+            self._add_text(left - 50, (top + bottom) / 2, self.y_label,
+                           rotation=-90)
+
+    @abc.abstractmethod
+    def _draw(self):
+        raise NotImplementedError(
+            "Not implemented method: %s.%s" %
+            (self.__class__, sys._getframe().f_code.co_name))
+
+    def _save(self):
+
+        header = '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" ' \
+                 'width="%spt" height="%spt" viewBox="0 0 %s %s">\n' \
+                 '<style>text{font-family:%s;fill:#000}</style>\n' \
+                 '<rect width="100%%" height="100%%" fill="#fff"/>\n' \
+                 % (_fmt(self._px_width), _fmt(self._px_height),
+                    _fmt(self._px_width), _fmt(self._px_height), FONT_FAMILY)
+
+        # Compressed output is written for file paths ending with '.svgz'.
+        if self.file_path.endswith('.svgz'):
+            svg_file_open = gzip.open(self.file_path, 'wt')
+        else:
+            svg_file_open = open(self.file_path, 'w')
+
+        with svg_file_open as svg_file:
+            svg_file.write(header)
+            svg_file.write('\n'.join(self._elements))
+            svg_file.write('\n</svg>\n')
+
+    def _close(self):
+        self._elements = None
+
+    def _set_data_limits(self, x_min, x_max, y_min, y_max, margin=AXIS_MARGIN):
+        """Sets the data limits of the axes with matplotlib alike margins."""
+
+        # Avoid empty data ranges, e.g. if all values are zero.
+        if x_max <= x_min:
+            x_max = x_min + 1
+
+        if y_max <= y_min:
+            y_max = y_min + 1
+
+        x_delta = (x_max - x_min) * margin
+        y_delta = (y_max - y_min) * margin
+
+        self._x_lim = (x_min - x_delta, x_max + x_delta)
+
+        # Bars are sticky at zero, so no margin is added below zero.
+        if y_min == 0:
+            self._y_lim = (0.0, y_max + y_delta)
+        else:
+            self._y_lim = (y_min - y_delta, y_max + y_delta)
+
+    def _to_px(self, x, y):
+
+        left, top, right, bottom = self._axes_box
+
+        x_px = left + (float(x) - self._x_lim[0]) / \
+            (self._x_lim[1] - self._x_lim[0]) * (right - left)
+
+        y_px = bottom - (float(y) - self._y_lim[0]) / \
+            (self._y_lim[1] - self._y_lim[0]) * (bottom - top)
+
+        return x_px, y_px
+
+    def _add_rect(self, x, y, width, height, fill):
+
+        self._elements.append('<rect x="%s" y="%s" width="%s" height="%s" fill="%s"/>'
+                              % (_fmt(x), _fmt(y), _fmt(width), _fmt(height), fill))
+
+    def _add_line(self, x1, y1, x2, y2, stroke='#000', width=0.8, dash=None):
+
+        dash_attr = ''
+
+        if dash:
+            dash_attr = ' stroke-dasharray="%s"' % dash
+
+        self._elements.append('<line x1="%s" y1="%s" x2="%s" y2="%s" stroke="%s" stroke-width="%s"%s/>'
+                              % (_fmt(x1), _fmt(y1), _fmt(x2), _fmt(y2),
+                                 stroke, _fmt(width), dash_attr))
+
+    def _add_path(self, d, fill, stroke=None):
+
+        stroke_attr = ''
+
+        if stroke:
+            stroke_attr = ' stroke="%s"' % stroke
+
+        self._elements.append('<path d="%s" fill="%s"%s/>' % (d, fill, stroke_attr))
+
+    def _add_text(self, x, y, text, size=10, anchor='middle', rotation=None, weight=None):
+
+        attrs = 'x="%s" y="%s" font-size="%s"' % (_fmt(x), _fmt(y), _fmt(size))
+
+        if anchor != 'start':
+            attrs += ' text-anchor="%s"' % anchor
+
+        if weight:
+            attrs += ' font-weight="%s"' % weight
+
+        if rotation:
+            attrs += ' transform="rotate(%s %s %s)"' % (_fmt(rotation), _fmt(x), _fmt(y))
+
+        self._elements.append('<text %s>%s</text>' % (attrs, escape(str(text))))
+
+    def _draw_axes_frame(self):
+
+        left, top, right, bottom = self._axes_box
+
+        self._elements.append(
+            '<rect x="%s" y="%s" width="%s" height="%s" fill="none" stroke="#000" stroke-width="0.8"/>'
+            % (_fmt(left), _fmt(top), _fmt(right - left), _fmt(bottom - top)))
+
+    def _draw_x_ticks(self, positions, labels, rotation=None):
+
+        bottom = self._axes_box[3]
+
+        for position, label in zip(positions, labels):
+
+            x, _ = self._to_px(position, self._y_lim[0])
+
+            self._add_line(x, bottom, x, bottom + 3.5)
+
+            if rotation:
+                self._add_text(x, bottom + 10, label, anchor='end',
+                               rotation=-rotation)
+            else:
+                self._add_text(x, bottom + 15, label)
+
+    def _draw_y_ticks(self, positions):
+
+        left = self._axes_box[0]
+
+        for position in positions:
+
+            _, y = self._to_px(self._x_lim[0], position)
+
+            self._add_line(left - 3.5, y, left, y)
+            self._add_text(left - 7, y + 3.5, '%g' % position, anchor='end')
+
+    def _draw_paired_bars(self, values1, values2, bar_width, color1, color2):
+        self._draw_grouped_bars([values1, values2], bar_width, [color1, color2])
+
+    def _draw_grouped_bars(self, value_lists, bar_width, colors):
+        """
+        Draws the bars of each value list side by side.
+        :param value_lists: One list of values per series, indexed by the x position.
+        """
+
+        for index, values in enumerate(zip(*value_lists)):
+
+            for series, (value, color) in enumerate(zip(values, colors)):
+
+                offset = bar_width * series
+
+                x, y = self._to_px(index + offset - bar_width / 2, value)
+                x_end, y_base = self._to_px(index + offset + bar_width / 2, 0)
+
+                self._add_rect(x, y, x_end - x, y_base - y, color)
+
+    def _draw_legend(self, entries):
+        """
+        Draws a legend in the upper right corner of the axes.
+        :param entries: List of (label, color, kind) with kind 'bar' or 'line'.
+        """
+
+        _, top, right, _ = self._axes_box
+
+        line_height = 19
+        box_width = 40 + 7 * max(len(label) for label, _, _ in entries)
+        box_height = 8 + line_height * len(entries)
+
+        box_x = right - box_width - 8
+        box_y = top + 8
+
+        self._elements.append('<g class="legend">')
+
+        self._elements.append(
+            '<rect x="%s" y="%s" width="%s" height="%s" rx="2" fill="#fff" fill-opacity="0.8" stroke="#ccc"/>'
+            % (_fmt(box_x), _fmt(box_y), _fmt(box_width), _fmt(box_height)))
+
+        for index, (label, color, kind) in enumerate(entries):
+
+            y = box_y + 4 + line_height * index + line_height / 2
+
+            if kind == 'line':
+                self._add_line(box_x + 6, y, box_x + 26, y, stroke=color,
+                               width=0.8, dash='2.96,1.28')
+            else:
+                self._add_rect(box_x + 6, y - 3.5, 20, 7, color)
+
+            self._add_text(box_x + 32, y + 3.5, label, anchor='start')
+
+        self._elements.append('</g>')
+
+    @staticmethod
+    def _create_colors(name, n):
+        """
+        Creates n colors from a color map with the same linear interpolation
+        as matplotlib, only the 'Spectral' color map is supported.
+        """
+
+        if name != 'Spectral':
+            raise RuntimeError("Unsupported color map: %s" % name)
+
+        anchors = [(int(c[1:3], 16) / 255, int(c[3:5], 16) / 255, int(c[5:7], 16) / 255)
+                   for c in SPECTRAL_COLORS]
+
+        if n == 1:
+            return [SPECTRAL_COLORS[0]]
+
+        anchor_step = 1 / (len(anchors) - 1)
+        anchor_pos = [(k * anchor_step) * (n - 1) for k in range(len(anchors))]
+
+        color_step = 1 / (n - 1)
+
+        colors = list()
+
+        for i in range(n):
+
+            if i == 0:
+                rgb = anchors[0]
+
+            elif i == n - 1:
+                rgb = anchors[-1]
+
+            else:
+
+                pos = (n - 1) * (i * color_step)
+                index = bisect.bisect_left(anchor_pos, pos)
+
+                distance = (pos - anchor_pos[index - 1]) / \
+                    (anchor_pos[index] - anchor_pos[index - 1])
+
+                rgb = [distance * (upper - lower) + lower
+                       for lower, upper in zip(anchors[index - 1], anchors[index])]
+
+            colors.append('#' + ''.join('%02x' % int(round(value * 255)) for value in rgb))
+
+        return colors
+
+
+class SvgQuotaPctBarChart(SvgChart):
+
+    def __init__(self, title, dataset, file_path):
+
+        super(SvgQuotaPctBarChart, self).__init__(title, dataset, file_path,
+                                                  x_label='Group',
+                                                  y_label='Quota Usage (%)')
+
+    def _draw(self):
+
+        num_groups = len(self.dataset)
+
+        self._sort_dataset(lambda group_info: group_info.name)
+
+        group_names = list()
+        quota_used_pct_list = list()
+
+        for group_info in self.dataset:
+
+            group_names.append(group_info.name)
+
+            if group_info.quota and group_info.size:
+                quota_used_pct = \
+                    round((group_info.size / group_info.quota) * 100)
+
+            else:
+                quota_used_pct = 0
+
+            quota_used_pct_list.append(quota_used_pct)
+
+        bar_width = 0.35
+
+        self._subplot_top = 0.80
+
+        self._set_data_limits(-bar_width / 2, num_groups,
+                              0, max(quota_used_pct_list + [100]))
+
+        for index, quota_used_pct in enumerate(quota_used_pct_list):
+
+            x, y = self._to_px(index - bar_width / 2, quota_used_pct)
+            x_end, y_base = self._to_px(index + bar_width / 2, 0)
+
+            self._add_rect(x, y, x_end - x, y_base - y, '#0000ff')
+
+        x, y = self._to_px(0, 100)
+        x_end, _ = self._to_px(num_groups, 100)
+
+        self._add_line(x, y, x_end, y, stroke='red', dash='2.96,1.28')
+
+        self._draw_axes_frame()
+        self._draw_x_ticks(range(num_groups), group_names, rotation=45)
+        self._draw_y_ticks(range(0, 101, 10))
+
+        self._draw_legend([('Quota Limit', 'red', 'line')])
+
+
+class SvgUsageQuotaBarChart(SvgChart):
+
+    def __init__(self, title, dataset, file_path):
+
+        super(SvgUsageQuotaBarChart, self).__init__(title, dataset, file_path,
+                                                    x_label='Group',
+                                                    y_label='Disk Space / Quota Used (TiB)')
+
+    def _draw(self):
+
+        num_groups = len(self.dataset)
+
+        self._sort_dataset(
+            key=lambda group_info: group_info.quota, reverse=True)
+
+        tick_width_y = 200
+
+        # An aggregated 'others' bar can exceed the quota of the top group.
+        max_quota = max(group_info.quota for group_info in self.dataset)
+
+        max_y = float(max_quota / nf.TIB_DIVISIOR) + tick_width_y
+
+        group_names = list()
+        quota_list_values = list()
+        size_list_values = list()
+
+        for group_info in self.dataset:
+
+            group_names.append(group_info.name)
+
+            quota_list_values.append(
+                int(group_info.quota / nf.TIB_DIVISIOR))
+
+            size_list_values.append(
+                int(group_info.size / nf.TIB_DIVISIOR))
+
+        bar_width = 0.35
+
+        self._set_data_limits(-bar_width / 2, num_groups - 1 + bar_width * 1.5,
+                              0, max(quota_list_values + size_list_values))
+
+        self._draw_paired_bars(size_list_values, quota_list_values,
+                               bar_width, '#0000ff', '#ffa500')
+
+        self._draw_axes_frame()
+        self._draw_x_ticks([i + bar_width / 2 for i in range(num_groups)],
+                           group_names, rotation=45)
+
+        y_ticks = list()
+        tick = 0
+
+        while tick < max_y:
+            y_ticks.append(tick)
+            tick += tick_width_y
+
+        self._draw_y_ticks(y_ticks)
+
+        self._draw_legend([('Quota', '#ffa500', 'bar'),
+                           ('Used', '#0000ff', 'bar')])
+
+
+class SvgGroupFilesMigrationBarChart(SvgChart):
+
+    # Bar colors of the file systems, like the matplotlib chart.
+    FS_COLORS = ['#0000ff', '#ffa500', '#008000', '#ff0000', '#800080', '#a52a2a']
+
+    def __init__(self, title, dataset, file_path, *fs_names):
+
+        super(SvgGroupFilesMigrationBarChart, self).__init__(
+            title, dataset, file_path,
+            x_label='Group',
+            y_label='File Count')
+
+        self.fs_names = fs_names
+
+    def _draw(self):
+
+        self._sort_dataset(
+            key=lambda group_info: group_info.fs1_file_count, reverse=True)
+
+        num_groups = len(self.dataset)
+        num_fs = len(self.fs_names)
+
+        group_names = [group_info_item.name for group_info_item in self.dataset]
+
+        value_lists = [[float(group_info_item.file_counts[index])
+                        for group_info_item in self.dataset]
+                       for index in range(num_fs)]
+
+        max_y = max(max(values) for values in value_lists)
+
+        colors = [self.FS_COLORS[index % len(self.FS_COLORS)] for index in range(num_fs)]
+
+        bar_width = 0.7 / num_fs
+
+        self._set_data_limits(-bar_width / 2,
+                              num_groups - 1 + bar_width * (num_fs - 0.5),
+                              0, max_y)
+
+        self._draw_grouped_bars(value_lists, bar_width, colors)
+
+        self._draw_axes_frame()
+        self._draw_x_ticks([i + bar_width * (num_fs - 1) / 2 for i in range(num_groups)],
+                           group_names, rotation=45)
+
+        tick_width_y = max_y / 10
+
+        self._draw_y_ticks([tick_width_y * i for i in range(10)])
+
+        self._draw_legend([(fs_name, color, 'bar')
+                           for fs_name, color in zip(self.fs_names, colors)])
+
+
+class SvgUsagePieChart(SvgChart):
+
+    def __init__(self, title, dataset, file_path, storage_total_size, num_top_groups):
+
+        super(SvgUsagePieChart, self).__init__(title=title,
+                                               dataset=dataset,
+                                               file_path=file_path)
+
+        self.storage_total_size = storage_total_size
+
+        self.num_top_groups = num_top_groups
+
+        self.width = 14
+
+        self.color_name = 'Spectral'
+
+    def _draw(self):
+
+        labels = []
+        sizes = []
+
+        self._sort_dataset(lambda group_info: group_info.size, True)
+
+        top_groups_info_list = self.dataset[:self.num_top_groups]
+
+        groups_total_size = \
+            SvgUsagePieChart._calc_groups_total_size(self.dataset)
+
+        top_groups_total_size = \
+            SvgUsagePieChart._calc_groups_total_size(top_groups_info_list)
+
+        others_size = groups_total_size - top_groups_total_size
+
+        size_labels = nf.numbers_to_base_2(
+            [item.size for item in top_groups_info_list] + [others_size])
+
+        for item, size_label in zip(top_groups_info_list, size_labels):
+
+            label_text = item.name + " (" + size_label + ")"
+
+            labels.append(label_text)
+            sizes.append(item.size)
+
+        labels.append("others (" + size_labels[-1] + ")")
+        sizes.append(others_size)
+
+        total_size_pct_used = \
+            int((groups_total_size / self.storage_total_size) * Decimal(100))
+
+        sub_title = \
+            "Used " + nf.number_to_base_2_fast(groups_total_size) + \
+            " of " + nf.number_to_base_2_fast(self.storage_total_size) + \
+            " Volume (" + str(total_size_pct_used) + "%)"
+
+        self._subplot_top = 0.80
+
+        color_map = SvgChart._create_colors(self.color_name, len(labels))
+
+        self._draw_pie(sizes, labels, color_map)
+
+        left, top, right, bottom = self._axes_box
+
+        self._add_text((left + right) / 2, top - 0.15 * (bottom - top),
+                       sub_title, size=12)
+
+    def _draw_pie(self, sizes, labels, colors):
+
+        left, top, right, bottom = self._axes_box
+
+        cx = (left + right) / 2
+        cy = (top + bottom) / 2
+
+        # Matplotlib reserves space for the labels around the pie.
+        radius = min(right - left, bottom - top) / 2 / 1.25
+
+        total = float(sum(sizes))
+
+        # Start at 90 degrees and draw counterclockwise like matplotlib.
+        theta1 = 90.0
+
+        for size, label, color in zip(sizes, labels, colors):
+
+            frac = float(size) / total if total else 0.0
+            theta2 = theta1 + 360.0 * frac
+
+            if frac >= 1.0:
+                self._elements.append('<circle cx="%s" cy="%s" r="%s" fill="%s"/>'
+                                      % (_fmt(cx), _fmt(cy), _fmt(radius), color))
+
+            elif frac > 0.0:
+
+                x1, y1 = _polar(cx, cy, radius, theta1)
+                x2, y2 = _polar(cx, cy, radius, theta2)
+
+                large_arc = 1 if frac > 0.5 else 0
+
+                self._add_path('M%s %sL%s %sA%s %s 0 %d 0 %s %sZ'
+                               % (_fmt(cx), _fmt(cy), _fmt(x1), _fmt(y1),
+                                  _fmt(radius), _fmt(radius), large_arc,
+                                  _fmt(x2), _fmt(y2)), color)
+
+            theta_mid = (theta1 + theta2) / 2
+
+            label_x, label_y = _polar(cx, cy, radius * 1.1, theta_mid)
+
+            anchor = 'start' if label_x > cx else 'end'
+
+            self._add_text(label_x, label_y + 4, label, anchor=anchor)
+
+            pct_x, pct_y = _polar(cx, cy, radius * 0.8, theta_mid)
+
+            self._add_text(pct_x, pct_y + 4, '%1.2f%%' % (frac * 100))
+
+            theta1 = theta2
+
+    @staticmethod
+    def _calc_groups_total_size(group_info_list):
+
+        groups_total_size = 0
+
+        for group_info_item in group_info_list:
+            groups_total_size += group_info_item.size
+
+        return groups_total_size
+
+
+def _polar(cx, cy, radius, degrees):
+
+    rad = math.radians(degrees)
+
+    return cx + radius * math.cos(rad), cy - radius * math.sin(rad)
@@ -16,10 +16,11 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
 from chart.base_chart import BaseChart
+from utils.pandas_ import lttb_downsample
 
 class TrendChart(BaseChart):
 
-    def __init__(self, title, dataset, file_path, x_label, y_label):
+    def __init__(self, title, dataset, file_path, x_label, y_label, max_points=0):
 
         if type(dataset) != pd.DataFrame:
             raise RuntimeError('As dataset a Pandas Data Frame is required!')
@@ -35,6 +36,9 @@ class TrendChart(BaseChart):
         # No bright colors.
         self.color_name = 'Dark2'
 
+        # Point budget per group, no downsampling if set to 0.
+        self.max_points = max_points
+
     def _add_sorted_legend(self, df_tail):
         """
         Adds a sorted legend to the figure sorted by the last values retrieved
@@ -76,10 +80,30 @@ class TrendChart(BaseChart):
         color_map = \
             BaseChart._create_colors(self.color_name, len(self.dataset.keys()))
 
-        self.dataset.plot(ax=self._ax, legend=False, style=line_styles, color=color_map, grid=True)
+        if self.max_points and len(self.dataset) > self.max_points:
+            self._plot_downsampled(line_styles, color_map)
+        else:
+            self.dataset.plot(ax=self._ax, legend=False, style=line_styles, color=color_map, grid=True)
 
         sub_title = "Date from %s to %s" % (self.start_date, self.end_date)
 
         self._ax.set_title(sub_title, fontsize=12)
 
         self._add_sorted_legend(self.dataset.tail(1))
+
+    def _plot_downsampled(self, line_styles, color_map):
+        """
+        Plots each group with at most max_points values
+        downsampled by the Largest-Triangle-Three-Buckets algorithm.
+        """
+
+        series_dict = lttb_downsample(self.dataset, self.max_points)
+
+        for index, column in enumerate(self.dataset.columns):
+
+            series = series_dict[column]
+
+            self._ax.plot(series.index, series.values, line_styles[index],
+                          color=color_map[index], label=column)
+
+        self._ax.grid(True)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import multiprocessing
+import datetime
+import logging
+import time
+import os
+
+import pandas as pd
+
+import matplotlib
+# Force matplotlib to not use any X window backend.
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from utils.pandas_ import lttb_downsample
+
+# Batch of the worker process, set up by the pool initializer.
+_worker_batch = None
+
+
+def _init_worker(batch):
+
+    global _worker_batch
+
+    _worker_batch = batch
+    _worker_batch._setup_figure()
+
+def _create_worker_charts(groups):
+    return _worker_batch._create_charts(groups)
+
+
+class TrendChartBatch(object):
+    """
+    Creates one trend chart per group of a Pandas Data Frame.
+
+    Each process sets up a single figure as template and only swaps
+    the line data and titles per group, instead of creating a new
+    figure for each chart like TrendChart does.
+    """
+
+    def __init__(self,
+                 title,
+                 dataset,
+                 chart_dir,
+                 filename,
+                 x_label,
+                 y_label,
+                 max_points=0,
+                 processes=1,
+                 chunk_size=50,
+                 width=20,
+                 height=10):
+        """
+        :param title: Chart title with a '%s' placeholder for the group name.
+        :param dataset: Pandas Data Frame with a column per group.
+        :param chart_dir: Directory the charts are saved to.
+        :param filename: Filename with a '%s' placeholder for the group name.
+        :param max_points: Point budget per group for LTTB downsampling.
+        :param processes: Number of worker processes.
+        :param chunk_size: Number of charts per worker task.
+        """
+
+        if type(dataset) != pd.DataFrame:
+            raise RuntimeError('As dataset a Pandas Data Frame is required!')
+
+        if not len(dataset):
+            raise RuntimeError('Retrieved an empty Pandas Data Frame!')
+
+        if processes < 1:
+            raise RuntimeError("Number of processes must be at least 1!")
+
+        self.title = title
+        self.dataset = dataset
+        self.chart_dir = chart_dir
+        self.filename = filename
+
+        self.x_label = x_label
+        self.y_label = y_label
+
+        self.max_points = max_points
+        self.processes = processes
+        self.chunk_size = chunk_size
+
+        self.width = width
+        self.height = height
+
+        if filename.endswith('.svgz'):
+            self._file_type = 'svgz'
+        else:
+            self._file_type = 'svg'
+
+        self._series_dict = None
+
+        self._figure = None
+        self._ax = None
+        self._line = None
+        self._suptitle = None
+        self._sub_title = None
+        self._creation_text = None
+
+    def create(self, chart_callback=None):
+        """
+        Creates the charts of all groups holding data.
+        :param chart_callback: Called with the paths of each finished chunk.
+        :return: A list of the created chart file paths.
+        """
+
+        if self.max_points:
+            self._series_dict = lttb_downsample(self.dataset, self.max_points)
+        else:
+            self._series_dict = \
+                {group: self.dataset[group] for group in self.dataset.columns}
+
+        groups = [group for group in self.dataset.columns
+                  if self._series_dict[group].notnull().any()]
+
+        chunks = [groups[i:i + self.chunk_size]
+                  for i in range(0, len(groups), self.chunk_size)]
+
+        chart_path_list = list()
+
+        start_time = time.time()
+
+        if self.processes > 1 and len(chunks) > 1:
+
+            with multiprocessing.Pool(self.processes,
+                                      initializer=_init_worker,
+                                      initargs=(self,)) as pool:
+
+                for path_list in pool.imap_unordered(_create_worker_charts, chunks):
+
+                    chart_path_list.extend(path_list)
+
+                    if chart_callback:
+                        chart_callback(path_list)
+
+                    self._log_progress(len(chart_path_list), len(groups), start_time)
+
+        else:
+
+            self._setup_figure()
+
+            try:
+
+                for chunk in chunks:
+
+                    path_list = self._create_charts(chunk)
+
+                    chart_path_list.extend(path_list)
+
+                    if chart_callback:
+                        chart_callback(path_list)
+
+                    self._log_progress(len(chart_path_list), len(groups), start_time)
+
+            finally:
+                self._close()
+
+        return chart_path_list
+
+    @staticmethod
+    def _log_progress(num_created, num_total, start_time):
+
+        elapsed_time = time.time() - start_time
+
+        throughput = 0.0
+
+        if elapsed_time > 0:
+            throughput = num_created / elapsed_time
+
+        logging.info("Created %d/%d group trend charts (%.1f charts/s)"
+                     % (num_created, num_total, throughput))
+
+    def _setup_figure(self):
+
+        self._figure, self._ax = plt.subplots(figsize=(self.width, self.height))
+
+        self._ax.yaxis.set_major_locator(plt.MaxNLocator(12))
+
+        self._ax.set_xlabel(self.x_label)
+        self._ax.set_ylabel(self.y_label)
+
+        self._ax.grid(True)
+
+        # Initial data sets the date units of the x axis.
+        series = next(iter(self._series_dict.values()))
+
+        self._line, = self._ax.plot(series.index, series.values, color='#1b9e77')
+
+        self._suptitle = \
+            self._figure.suptitle('', fontsize=18, fontweight='bold')
+
+        self._sub_title = self._ax.set_title('', fontsize=12)
+
+        self._creation_text = self._figure.text(
+            0, 0, '', verticalalignment='bottom', horizontalalignment='left',
+            fontsize=8, transform=self._figure.transFigure)
+
+    def _create_charts(self, groups):
+
+        chart_path_list = list()
+
+        for group in groups:
+
+            series = self._series_dict[group]
+
+            self._line.set_data(series.index, series.values)
+
+            self._ax.relim()
+            self._ax.autoscale_view()
+
+            self._suptitle.set_text(self.title % group)
+
+            # Range of the group's data, like a TrendChart of the group.
+            self._sub_title.set_text("Date from %s to %s"
+                % (series.first_valid_index().strftime('%Y-%m-%d'),
+                   series.last_valid_index().strftime('%Y-%m-%d')))
+
+            self._creation_text.set_text(
+                datetime.datetime.now().strftime('%Y-%m-%d - %X'))
+
+            chart_path = os.path.join(self.chart_dir, self.filename % group)
+
+            self._figure.savefig(chart_path, format=self._file_type)
+
+            chart_path_list.append(chart_path)
+
+        return chart_path_list
+
+    def _close(self):
+
+        plt.close(self._figure)
+
+        self._figure = None
@@ -50,22 +50,25 @@ class UsagePieChart(BaseChart):
 
         others_size = groups_total_size - top_groups_total_size
 
-        for item in top_groups_info_list:
+        size_labels = nf.numbers_to_base_2(
+            [item.size for item in top_groups_info_list] + [others_size])
 
-            label_text = item.name + " (" + nf.number_to_base_2(item.size) + ")"
+        for item, size_label in zip(top_groups_info_list, size_labels):
+
+            label_text = item.name + " (" + size_label + ")"
 
             labels.append(label_text)
             sizes.append(item.size)
 
-        labels.append("others (" + nf.number_to_base_2(others_size) + ")")
+        labels.append("others (" + size_labels[-1] + ")")
         sizes.append(others_size)
 
         total_size_pct_used = \
             int((groups_total_size / self.storage_total_size) * Decimal(100))
 
         sub_title = \
-            "Used " + nf.number_to_base_2(groups_total_size) + \
-            " of " + nf.number_to_base_2(self.storage_total_size) + \
+            "Used " + nf.number_to_base_2_fast(groups_total_size) + \
+            " of " + nf.number_to_base_2_fast(self.storage_total_size) + \
             " Volume (" + str(total_size_pct_used) + "%)"
 
         self._ax.set_title(sub_title, fontsize=12, y=1.15)
@@ -34,8 +34,10 @@ class UsageQuotaBarChart(BaseChart):
 
         tick_width_y = 200
 
-        max_y = float(self.dataset[0].quota /
-                      number_format.TIB_DIVISIOR) + tick_width_y
+        # An aggregated 'others' bar can exceed the quota of the top group.
+        max_quota = max(group_info.quota for group_info in self.dataset)
+
+        max_y = float(max_quota / number_format.TIB_DIVISIOR) + tick_width_y
 
         group_names = list()
         quota_list_values = list()
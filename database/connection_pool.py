@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import contextlib
+import threading
+import logging
+import MySQLdb
+
+
+class ConnectionPool:
+    """
+    Keeps database connections open between the runs of a long running
+    process. A connection is checked by ping before use and replaced if
+    the server closed it, e.g. after wait_timeout.
+    """
+
+    def __init__(self, host, user, passwd, db, size=2):
+
+        self._connect_args = dict(host=host, user=user, passwd=passwd, db=db)
+
+        self.size = size
+
+        self._idle = list()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, size=2):
+        """Returns a pool of the [mysqld] server and [history] database of a collector config."""
+
+        return cls(config.get('mysqld', 'host'),
+                   config.get('mysqld', 'user'),
+                   config.get('mysqld', 'password'),
+                   config.get('history', 'database'),
+                   size)
+
+    def _connect(self):
+
+        conn = MySQLdb.connect(**self._connect_args)
+
+        # Each statement is stored on its own like by a new connection of a collector run.
+        conn.autocommit(True)
+
+        return conn
+
+    @contextlib.contextmanager
+    def connection(self):
+
+        conn = None
+
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+
+        if conn is not None:
+
+            try:
+                conn.ping()
+            except MySQLdb.Error:
+
+                logging.debug('Reconnecting pooled database connection')
+
+                conn.close()
+                conn = None
+
+        if conn is None:
+            conn = self._connect()
+
+        try:
+            yield conn
+
+        except Exception:
+
+            # The state of the connection is unknown after an error.
+            conn.close()
+            raise
+
+        with self._lock:
+
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                conn = None
+
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+
+        with self._lock:
+            idle, self._idle = self._idle, list()
+
+        for conn in idle:
+            conn.close()
+
+@contextlib.contextmanager
+def open_connection(config, conn=None):
+    """
+    Yields conn if given, e.g. of a ConnectionPool, otherwise a new connection
+    to the [mysqld] server and [history] database closed on exit.
+    """
+
+    if conn is not None:
+        yield conn
+        return
+
+    with contextlib.closing(MySQLdb.connect(host=config.get('mysqld', 'host'),
+                                            user=config.get('mysqld', 'user'),
+                                            passwd=config.get('mysqld', 'password'),
+                                            db=config.get('history', 'database'))) \
+                                                as conn:
+        yield conn
@@ -13,6 +13,9 @@ import MySQLdb
 
 from contextlib import closing
 
+from database.connection_pool import open_connection
+from utils.instrumentation import stage
+
 def create_disk_space_usage_table(config):
     db = config.get('history', 'database')
     table = config.get('history', 'table')
@@ -45,36 +48,48 @@ CREATE TABLE """ + table + """ (
             logging.debug(sql)
             cur.execute(sql)
 
-def store_disk_space_usage(config, date_today, storage_info_list):
+def create_insert_sql(table, date, storage_info_list, upsert=False):
+    """
+    :param upsert: Updates the rows of file systems already stored for the date.
+    :return: A multi-row INSERT statement of the OST usage of the file systems.
+    """
 
-    table = config.get('history', 'table')
+    sql = "INSERT INTO %s (date, mounted_on, total, free, used, used_percentage) VALUES" \
+        % table
 
-    with closing(MySQLdb.connect(host=config.get('mysqld', 'host'),
-                                 user=config.get('mysqld', 'user'),
-                                 passwd=config.get('mysqld', 'password'),
-                                 db=config.get('history', 'database'))) \
-                                    as conn:
+    sql += ",".join(" ('%s', '%s', %s, %s, %s, %s)"
+        % (date, item.mount_point, item.ost.total,
+           item.ost.free, item.ost.used, item.ost.used_percentage())
+        for item in storage_info_list)
 
-        with closing(conn.cursor()) as cur:
+    if upsert:
+        sql += " ON DUPLICATE KEY UPDATE total=VALUES(total), free=VALUES(free)," \
+               " used=VALUES(used), used_percentage=VALUES(used_percentage)"
 
-            sql = "INSERT INTO %s (date, mounted_on, total, free, used, used_percentage) VALUES" \
-                % table
+    return sql + ";"
 
-            for index, item in enumerate(storage_info_list, start=1):
+def store_disk_space_usage(config, date_today, storage_info_list, upsert=False, conn=None):
+    """
+    :param upsert: Updates the rows of file systems already stored for the date.
+    :param conn: Open database connection to use, otherwise one is opened.
+    """
 
-                sql_end = ","
+    table = config.get('history', 'table')
+
+    with open_connection(config, conn) as conn:
 
-                if index == len(storage_info_list):
-                    sql_end = ";"
+        with closing(conn.cursor()) as cur:
 
-                sql += " ('%s', '%s', %s, %s, %s, %s)%s" \
-                    % (date_today, item.mount_point, item.ost.total,
-                    item.ost.free, item.ost.used, item.ost.used_percentage(), sql_end)
+            sql = create_insert_sql(table, date_today, storage_info_list, upsert)
 
             logging.debug(sql)
-            cur.execute(sql)
 
-            if not cur.rowcount:
+            with stage('sql_store_disk_space_usage') as span:
+                cur.execute(sql)
+                span.items = cur.rowcount
+
+            # MySQL counts no rows for an upsert of unchanged values.
+            if not upsert and not cur.rowcount:
                 raise RuntimeError("Snapshot failed for date: %s." % date_today)
 
             logging.debug("Inserted rows: %d into table: %s for date: %s" \
@@ -8,13 +8,24 @@
 # the terms of the GNU General Public Licence version 3 (GPL Version 3),
 # copied verbatim in the file "LICENCE".
 
+import threading
 import logging
 import MySQLdb
+import queue
 
 from contextlib import closing
 
+from database.connection_pool import open_connection
+from database.group_quota_runs import store_group_quota_runs, create_group_quota_runs_table
+from dataset.item_handler import CarriedGroupInfoItem
+from utils.instrumentation import stage
+
 def create_group_quota_history_table(config):
 
+    if config.getboolean('history', 'compact', fallback=False):
+        create_group_quota_runs_table(config)
+        return
+
     db = config.get('history', 'database')
     table = config.get('history', 'table')
 
@@ -39,43 +50,221 @@ CREATE TABLE """ + table + """ (
    used bigint(20) unsigned DEFAULT NULL,
    quota bigint(20) unsigned DEFAULT '0',
    files bigint(20) unsigned DEFAULT '0',
-   PRIMARY KEY (gid,date)
+   carried tinyint(1) NOT NULL DEFAULT '0',
+   PRIMARY KEY (gid,date),
+   KEY date (date)
 ) ENGINE=MyISAM DEFAULT CHARSET=latin1
 """
             logging.debug(sql)
             cur.execute(sql)
 
-def store_group_quota(config, date, group_info_list):
+def create_insert_sql(table, date, group_info_list, carried_column=False, upsert=False):
+    """
+    :param upsert: Updates the rows of groups already stored for the date.
+    :return: A multi-row INSERT statement of the group quotas.
+    """
 
-    table = config.get('history', 'table')
+    columns = ['date', 'gid', 'used', 'quota', 'files']
 
-    with closing(MySQLdb.connect(host=config.get('mysqld', 'host'),
-                                 user=config.get('mysqld', 'user'),
-                                 passwd=config.get('mysqld', 'password'),
-                                 db=config.get('history', 'database'))) \
-                                    as conn:
+    if carried_column:
 
-        with closing(conn.cursor()) as cur:
+        columns.append('carried')
+
+        values = ["('%s', '%s', %s, %s, %s, %d)"
+                  % (date, item.name, item.size, item.quota, item.files,
+                     isinstance(item, CarriedGroupInfoItem))
+                  for item in group_info_list]
 
-            sql = "INSERT INTO %s (date, gid, used, quota, files) VALUES" \
-                % table
+    else:
+
+        values = ["('%s', '%s', %s, %s, %s)"
+                  % (date, item.name, item.size, item.quota, item.files)
+                  for item in group_info_list]
+
+    sql = "INSERT INTO %s (%s) VALUES" % (table, ', '.join(columns))
+    sql += ", ".join(values)
+
+    if upsert:
+        sql += " ON DUPLICATE KEY UPDATE " + ', '.join(
+            "%s=VALUES(%s)" % (column, column) for column in columns[2:])
+
+    return sql
+
+def store_group_quota(config, date, group_info_list, carried_column=False,
+                      upsert=False, conn=None):
+    """
+    :param carried_column: Stores the carried flag of CarriedGroupInfoItems,
+                           requires the carried column of the table.
+    :param upsert: Updates the rows of groups already stored for the date,
+                   compact storage always replaces them.
+    :param conn: Open database connection to use, otherwise one is opened.
+    """
+
+    if config.getboolean('history', 'compact', fallback=False):
+        store_group_quota_runs(config, date, group_info_list, carried_column, conn)
+        return
+
+    table = config.get('history', 'table')
 
-            iter_list = iter(group_info_list)
+    with open_connection(config, conn) as conn:
 
-            item = next(iter_list)
+        with closing(conn.cursor()) as cur:
 
-            sql += "('%s', '%s', %s, %s, %s)" \
-                % (date, item.name, item.size, item.quota, item.files)
+            if not group_info_list:
+                raise RuntimeError("No group quotas to store for date: %s." % date)
 
-            for item in iter_list:
-                sql += ", ('%s', '%s', %s, %s, %s)" \
-                    % (date, item.name, item.size, item.quota, item.files)
+            sql = create_insert_sql(table, date, group_info_list, carried_column, upsert)
 
             logging.debug(sql)
-            cur.execute(sql)
 
-            if not cur.rowcount:
+            with stage('sql_store_group_quota') as span:
+                cur.execute(sql)
+                span.items = cur.rowcount
+
+            # MySQL counts no rows for an upsert of unchanged values.
+            if not upsert and not cur.rowcount:
                 raise RuntimeError("Snapshot failed for date: %s." % date)
 
             logging.debug("Inserted rows: %d into table: %s for date: %s" \
-                % (cur.rowcount, table, date))
\ No newline at end of file
+                % (cur.rowcount, table, date))
+
+
+class GroupQuotaWriter(object):
+    """
+    Stores group quotas by a background thread while they are collected.
+
+    Items put into the writer are held in a bounded queue, a full queue
+    blocks the collection until the database caught up. The writer sends
+    chunks of chunk_size rows as multi-row INSERT on one connection and
+    commits them at once by close(). On tables without transactions like
+    MyISAM the chunks are visible as written. Rows of groups already stored
+    for the date are updated, so a failed run can be repeated.
+    """
+
+    def __init__(self, config, date, chunk_size=1000, queue_size=10000, carried_column=False):
+
+        self.config = config
+        self.date = date
+        self.chunk_size = chunk_size
+        self.carried_column = carried_column
+
+        self.num_rows = 0
+        self.error = None
+
+        self._table = config.get('history', 'table')
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._conn = None
+
+    @classmethod
+    def from_config(cls, config, date, carried_column=False):
+
+        return cls(config, date,
+                   config.getint('history', 'chunk_size', fallback=1000),
+                   config.getint('history', 'queue_size', fallback=10000),
+                   carried_column)
+
+    def start(self):
+
+        self._conn = MySQLdb.connect(host=self.config.get('mysqld', 'host'),
+                                     user=self.config.get('mysqld', 'user'),
+                                     passwd=self.config.get('mysqld', 'password'),
+                                     db=self.config.get('history', 'database'))
+
+        self._conn.autocommit(False)
+
+        self._thread = threading.Thread(target=self._run,
+                                        name='GroupQuotaWriter',
+                                        daemon=True)
+        self._thread.start()
+
+    def put_all(self, group_info_list):
+        """Queues the items, may be called by several threads."""
+
+        if self._thread is None:
+            raise RuntimeError('Group quota writer is not started!')
+
+        # Stops the collection early, the run fails anyway.
+        if self.error:
+            raise RuntimeError("Storing group quotas failed: %s" % self.error)
+
+        for item in group_info_list:
+            self._queue.put(item)
+
+    def close(self, commit=True):
+        """
+        Waits until all queued items are written and commits them.
+        :param commit: False rolls back, e.g. after a failed collection.
+        """
+
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        try:
+
+            if self.error or not commit:
+
+                self._conn.rollback()
+
+                if self.error and commit:
+                    raise RuntimeError("Storing group quotas failed: %s" % self.error)
+
+            else:
+
+                if not self.num_rows:
+                    raise RuntimeError("Snapshot failed for date: %s." % self.date)
+
+                self._conn.commit()
+
+                logging.debug("Inserted rows: %d into table: %s for date: %s"
+                    % (self.num_rows, self._table, self.date))
+
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def _run(self):
+
+        chunk = list()
+
+        while True:
+
+            item = self._queue.get()
+
+            # Keeps draining the queue after an error, so producers do not block.
+            if self.error and item is not None:
+                continue
+
+            if item is not None:
+                chunk.append(item)
+
+            if chunk and (item is None or len(chunk) >= self.chunk_size):
+
+                try:
+                    self._write(chunk)
+                except Exception as e:
+                    logging.exception('Failed to store group quotas')
+                    self.error = e
+
+                chunk = list()
+
+            if item is None:
+                break
+
+    def _write(self, chunk):
+
+        sql = create_insert_sql(self._table, self.date, chunk, self.carried_column, upsert=True)
+
+        logging.debug("Writing %d group quotas" % len(chunk))
+
+        with closing(self._conn.cursor()) as cur:
+
+            with stage('sql_store_group_quota') as span:
+                cur.execute(sql)
+                span.items = len(chunk)
+
+        self.num_rows += len(chunk)
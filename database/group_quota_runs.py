@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Compact storage of the group quota history as runs of unchanged values.
+
+A row holds the values of a group from start_date to end_date. A collection
+extends the run of a group ending on the previous day if used, quota, files
+and the carried flag are unchanged, otherwise a new run starts. A group or
+day not collected ends the run, so QuotaHistoryTable(compact=True) expands
+the runs into exactly the daily rows of the history table. Collections are
+appended in date order, a repeated collection of the latest date replaces
+its values.
+"""
+
+import datetime
+import MySQLdb
+import logging
+
+from contextlib import closing
+
+from database.connection_pool import open_connection
+from dataset.item_handler import CarriedGroupInfoItem
+from utils.instrumentation import stage
+
+CHUNK_SIZE = 1000
+
+ONE_DAY = datetime.timedelta(days=1)
+
+def create_group_quota_runs_table(config):
+
+    db = config.get('history', 'database')
+    table = config.get('history', 'table')
+
+    with open_connection(config) as conn:
+
+        with closing(conn.cursor()) as cur:
+
+            conn.autocommit(True)
+
+            sql = "USE " + db
+
+            logging.debug(sql)
+            cur.execute(sql)
+
+            sql = """
+CREATE TABLE """ + table + """ (
+   gid varchar(127) NOT NULL DEFAULT 'unknown',
+   start_date date NOT NULL,
+   end_date date NOT NULL,
+   used bigint(20) unsigned DEFAULT NULL,
+   quota bigint(20) unsigned DEFAULT '0',
+   files bigint(20) unsigned DEFAULT '0',
+   carried tinyint(1) NOT NULL DEFAULT '0',
+   PRIMARY KEY (gid,start_date),
+   KEY end_date (end_date)
+) ENGINE=MyISAM DEFAULT CHARSET=latin1
+"""
+            logging.debug(sql)
+            cur.execute(sql)
+
+def create_runs_insert_sql(table, runs):
+    """
+    :param runs: List of (gid, start_date, end_date, used, quota, files, carried).
+    :return: A multi-row INSERT statement of the runs.
+    """
+
+    sql = "INSERT INTO %s (gid, start_date, end_date, used, quota, files, carried) VALUES" \
+        % table
+
+    sql += ", ".join("('%s', '%s', '%s', %d, %d, %d, %d)" % tuple(run) for run in runs)
+
+    return sql
+
+def create_group_quota_runs(rows):
+    """
+    :param rows: Iterable of daily (gid, date, used, quota, files, carried) sorted by date,
+                 the dates are datetime.date.
+    :return: A list of (gid, start_date, end_date, used, quota, files, carried).
+    """
+
+    runs = list()
+    open_runs = dict()
+
+    for gid, date, used, quota, files, carried in rows:
+
+        values = (int(used or 0), int(quota or 0), int(files or 0), int(carried or 0))
+
+        run = open_runs.get(gid)
+
+        if run and run[1] == date - ONE_DAY and run[2] == values:
+            run[1] = date
+            continue
+
+        if run:
+            runs.append((gid, run[0], run[1]) + run[2])
+
+        open_runs[gid] = [date, date, values]
+
+    for gid, run in open_runs.items():
+        runs.append((gid, run[0], run[1]) + run[2])
+
+    runs.sort(key=lambda run: (run[0], run[1]))
+
+    return runs
+
+def store_group_quota_runs(config, date, group_info_list, carried_column=False, conn=None):
+    """
+    Extends the runs of unchanged groups to date and inserts runs of the others.
+    :param carried_column: Stores the carried flag of CarriedGroupInfoItems.
+    :param conn: Open database connection to use, otherwise one is opened.
+    :return: The number of inserted runs.
+    """
+
+    if not group_info_list:
+        raise RuntimeError("No group quotas to store for date: %s." % date)
+
+    table = config.get('history', 'table')
+
+    previous_date = datetime.datetime.strptime(str(date)[:10], '%Y-%m-%d').date() - ONE_DAY
+    date = str(date)
+
+    with open_connection(config, conn) as conn:
+
+        with closing(conn.cursor()) as cur, stage('sql_store_group_quota') as span:
+
+            cur.execute("SELECT MAX(end_date) FROM %s" % table)
+            latest_date = cur.fetchone()[0]
+
+            if latest_date and str(latest_date) > date:
+                raise RuntimeError("Compact history is appended in date order, "
+                                   "latest date %s is after %s" % (latest_date, date))
+
+            # A repeated collection of the date replaces its values.
+            if latest_date and str(latest_date) == date:
+
+                cur.execute("DELETE FROM %s WHERE start_date = '%s'" % (table, date))
+                cur.execute("UPDATE %s SET end_date = '%s' WHERE end_date = '%s'"
+                            % (table, previous_date, date))
+
+            open_runs = dict()
+
+            cur.execute("SELECT gid, used, quota, files, carried FROM %s WHERE end_date = '%s'"
+                        % (table, previous_date))
+
+            for gid, used, quota, files, carried in cur.fetchall():
+                open_runs[gid.decode()] = (int(used or 0), int(quota or 0),
+                                           int(files or 0), int(carried))
+
+            extended = list()
+            inserted = list()
+
+            for item in group_info_list:
+
+                carried = int(carried_column and isinstance(item, CarriedGroupInfoItem))
+
+                values = (int(item.size), int(item.quota), int(item.files), carried)
+
+                if open_runs.get(item.name) == values:
+                    extended.append(item.name)
+                else:
+                    inserted.append((item.name, date, date) + values)
+
+            for index in range(0, len(extended), CHUNK_SIZE):
+
+                sql = "UPDATE %s SET end_date = '%s' WHERE end_date = '%s' AND gid IN (%s)" \
+                    % (table, date, previous_date,
+                       ', '.join("'%s'" % name for name in extended[index:index + CHUNK_SIZE]))
+
+                logging.debug(sql)
+                cur.execute(sql)
+
+            for index in range(0, len(inserted), CHUNK_SIZE):
+
+                sql = create_runs_insert_sql(table, inserted[index:index + CHUNK_SIZE])
+
+                logging.debug(sql)
+                cur.execute(sql)
+
+            conn.commit()
+
+            span.items = len(group_info_list)
+
+    logging.info("Stored %d groups for date %s - Extended runs: %d - New runs: %d"
+                 % (len(group_info_list), date, len(extended), len(inserted)))
+
+    return len(inserted)
+
+def convert_group_quota_history(config, source_table):
+    """
+    Fills the compact [history] table with the runs of a daily history table
+    of the same database.
+    :return: A tuple of the number of daily rows and runs.
+    """
+
+    table = config.get('history', 'table')
+
+    with open_connection(config) as conn:
+
+        with closing(conn.cursor()) as cur:
+
+            cur.execute("SHOW COLUMNS FROM %s LIKE 'carried'" % source_table)
+
+            carried_column = 'carried' if cur.fetchall() else '0'
+
+        # Streams the rows instead of loading the table into memory.
+        with closing(conn.cursor(MySQLdb.cursors.SSCursor)) as cur:
+
+            sql = "SELECT gid, date, used, quota, files, %s FROM %s ORDER BY date, gid" \
+                % (carried_column, source_table)
+
+            logging.debug(sql)
+
+            num_rows = 0
+
+            def rows():
+
+                nonlocal num_rows
+
+                for row in cur:
+                    num_rows += 1
+                    yield (row[0].decode(),) + tuple(row[1:])
+
+            with stage('convert_group_quota_history') as span:
+
+                cur.execute(sql)
+
+                runs = create_group_quota_runs(rows())
+                span.items = num_rows
+
+        with closing(conn.cursor()) as cur:
+
+            for index in range(0, len(runs), CHUNK_SIZE):
+                cur.execute(create_runs_insert_sql(table, runs[index:index + CHUNK_SIZE]))
+
+            conn.commit()
+
+    logging.info("Converted %d daily rows of %s into %d runs of %s"
+                 % (num_rows, source_table, len(runs), table))
+
+    return num_rows, len(runs)
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Backfill of the history tables from archived 'lfs quota' and 'lfs df' outputs.
+
+Each dump file holds the output of one day, the date is taken from the file
+name. The files are parsed in a process pool, the rows of a file are written
+by the main process in multi-row upserts of chunk_size rows and committed per
+file. On tables without transactions like MyISAM a file failing to store may
+be stored partially, repeating the import updates its rows by the upsert.
+Files failing to parse or to store are reported and skipped.
+"""
+
+import concurrent.futures
+import collections
+import contextlib
+import datetime
+import logging
+import glob
+import json
+import time
+import os
+import re
+
+from database.connection_pool import open_connection
+from utils.instrumentation import stage
+
+import database.disk_space_usage_collect as dsuc
+import database.group_quota_collect as gqc
+import dataset.lfs_dataset_handler as ldh
+
+QUOTA_KIND = 'quota'
+DF_KIND = 'df'
+
+DATE_REGEX = r"(\d{4})-?(\d{2})-?(\d{2})"
+
+FileResult = collections.namedtuple('FileResult', ['path', 'date', 'items', 'error'])
+
+# Dict of gid to group name set in the worker processes by _init_worker().
+_gid_names = None
+
+
+def find_dump_files(paths):
+    """
+    :param paths: Files, directories or glob patterns.
+    :return: The sorted list of dump files, a directory adds all its files.
+    """
+
+    dump_files = set()
+
+    for path in paths:
+
+        if os.path.isdir(path):
+            matches = [os.path.join(path, name) for name in os.listdir(path)]
+        elif os.path.isfile(path):
+            matches = [path]
+        else:
+            matches = glob.glob(path)
+
+        if not matches:
+            raise RuntimeError("No dump files found: %s" % path)
+
+        dump_files.update(match for match in matches if os.path.isfile(match))
+
+    return sorted(dump_files)
+
+def parse_dump_date(path, date_pattern):
+    """
+    :return: The date in the file name of path.
+    """
+
+    result = date_pattern.search(os.path.basename(path))
+
+    if not result:
+        raise RuntimeError("No date in file name: %s" % path)
+
+    return datetime.date(*(int(value) for value in result.groups()[:3]))
+
+def _init_worker(gid_names):
+
+    global _gid_names
+    _gid_names = gid_names
+
+def parse_dump_file(path, kind, date_regex=DATE_REGEX):
+    """
+    Runs in a worker process, errors are returned instead of raised.
+    :return: A FileResult of the GroupInfoItems or StorageInfos of the file.
+    """
+
+    date = None
+
+    try:
+        date = parse_dump_date(path, re.compile(date_regex))
+
+        with open(path, 'r') as f:
+            input_data = f.read()
+
+        if kind == QUOTA_KIND:
+            items = ldh.parse_group_info_list(input_data, _gid_names)
+        else:
+            items = list(ldh.parse_storage_info(input_data).values())
+
+        if not items:
+            raise RuntimeError("No %s data found" % kind)
+
+        return FileResult(path, date, items, None)
+
+    except Exception as e:
+        return FileResult(path, date, None, "%s: %s" % (type(e).__name__, e))
+
+def create_upsert_sql_list(kind, table, date, items, chunk_size):
+
+    if kind == QUOTA_KIND:
+        create_insert_sql = gqc.create_insert_sql
+    else:
+        create_insert_sql = dsuc.create_insert_sql
+
+    return [create_insert_sql(table, date, items[index:index + chunk_size], upsert=True)
+            for index in range(0, len(items), chunk_size)]
+
+
+class BackfillStats:
+
+    def __init__(self, num_files):
+
+        self.num_files = num_files
+        self.done_files = 0
+        self.failed_files = 0
+        self.rows = 0
+
+        self.start_time = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def rows_per_second(self):
+        return self.rows / max(self.elapsed(), 1e-9)
+
+    def summary(self):
+
+        return "Files: %d/%d - Failed: %d - Rows: %d - Elapsed: %.1fs - Rows/s: %.0f" \
+            % (self.done_files, self.num_files, self.failed_files, self.rows,
+               self.elapsed(), self.rows_per_second())
+
+
+def backfill(config, kind, dump_files, store=True, jobs=None, chunk_size=1000,
+             date_regex=DATE_REGEX, gid_names=None, report_file=None,
+             progress_interval=10):
+    """
+    :param kind: QUOTA_KIND or DF_KIND.
+    :param store: Writes the rows to the [history] table of config, otherwise only parses.
+    :param jobs: Number of parsing processes, default is the number of CPUs.
+    :param gid_names: Dict of gid to group name for dumps of 'lfs quota' by gid (optional).
+    :param report_file: Path of a JSON lines report of each file (optional).
+    :return: The BackfillStats of the import.
+    """
+
+    if kind not in (QUOTA_KIND, DF_KIND):
+        raise RuntimeError("Invalid dump kind: %s" % kind)
+
+    if store and config.getboolean('history', 'compact', fallback=False):
+        raise RuntimeError("Backfill requires a daily history table, "
+                           "convert it with --convert-from afterwards")
+
+    # Fails before parsing on an invalid pattern.
+    re.compile(date_regex)
+
+    jobs = jobs or os.cpu_count() or 1
+
+    stats = BackfillStats(len(dump_files))
+
+    logging.info("Importing %d %s dump files with %d processes" % (len(dump_files), kind, jobs))
+
+    with contextlib.ExitStack() as stack:
+
+        conn = None
+        cur = None
+        report = None
+
+        if store:
+
+            table = config.get('history', 'table')
+
+            conn = stack.enter_context(open_connection(config))
+            conn.autocommit(False)
+
+            cur = stack.enter_context(contextlib.closing(conn.cursor()))
+
+        if report_file:
+            report = stack.enter_context(open(report_file, 'w'))
+
+        executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(gid_names,)))
+
+        path_iter = iter(dump_files)
+        pending = set()
+
+        def submit_next():
+
+            path = next(path_iter, None)
+
+            if path is not None:
+                pending.add(executor.submit(parse_dump_file, path, kind, date_regex))
+
+        # Bounds the parsed files waiting in memory for the database.
+        for _ in range(2 * jobs):
+            submit_next()
+
+        last_progress = time.perf_counter()
+
+        try:
+
+            while pending:
+
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+
+                    pending.remove(future)
+                    submit_next()
+
+                    result = future.result()
+
+                    rows = 0
+                    error = result.error
+
+                    if not error and store:
+
+                        try:
+
+                            with stage('sql_backfill') as span:
+
+                                for sql in create_upsert_sql_list(
+                                        kind, table, result.date, result.items, chunk_size):
+                                    cur.execute(sql)
+
+                                conn.commit()
+                                span.items = len(result.items)
+
+                        except Exception as e:
+
+                            error = "%s: %s" % (type(e).__name__, e)
+
+                            try:
+                                conn.rollback()
+                            except Exception:
+                                logging.exception("Rollback failed")
+
+                    if error:
+                        stats.failed_files += 1
+                        logging.warning("Failed to import %s: %s" % (result.path, error))
+                    else:
+                        rows = len(result.items)
+
+                    stats.done_files += 1
+                    stats.rows += rows
+
+                    if report:
+                        report.write(json.dumps({'path': result.path,
+                                                 'date': str(result.date) if result.date else None,
+                                                 'rows': rows,
+                                                 'error': error}) + '\n')
+
+                if time.perf_counter() - last_progress >= progress_interval:
+                    logging.info(stats.summary())
+                    last_progress = time.perf_counter()
+
+        except Exception:
+
+            for future in pending:
+                future.cancel()
+
+            if conn:
+                conn.rollback()
+
+            raise
+
+    logging.info(stats.summary())
+
+    return stats
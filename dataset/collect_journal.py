@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Local journal of the group quotas collected in a run, so an interrupted
+collection resumes with the remaining groups.
+
+The journal is a JSON lines file. The first line holds the date and file
+system of the run, each further line one collected group. A journal of
+another date or file system is discarded. A line cut off by a crash is
+skipped, that group is collected again.
+"""
+
+import threading
+import logging
+import json
+import os
+
+from dataset.item_handler import GroupInfoItem
+
+
+class CollectJournal:
+
+    def __init__(self, path, date, file_system):
+
+        self.path = path
+        self.header = {'date': str(date), 'file_system': file_system}
+
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, date, file_system):
+        """Returns a journal if [journal] path is set, otherwise None."""
+
+        path = config.get('journal', 'path', fallback=None)
+
+        if not path:
+            return None
+
+        return cls(path, date, file_system)
+
+    def load(self):
+        """
+        Reads the groups journaled by a previous run of the same date and
+        file system and opens the journal for appending.
+        :return: A dict of group name to GroupInfoItem.
+        """
+
+        group_info_dict = dict()
+
+        if os.path.isfile(self.path):
+
+            with open(self.path, 'r') as f:
+
+                lines = f.read().splitlines()
+
+            try:
+                header = json.loads(lines[0]) if lines else None
+            except ValueError:
+                header = None
+
+            if header == self.header:
+
+                for line in lines[1:]:
+
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logging.debug("Skipping incomplete journal line: %s" % line)
+                        continue
+
+                    group_info_dict[entry['name']] = GroupInfoItem(
+                        entry['name'], entry['size'], entry['quota'], entry['files'])
+
+            else:
+                logging.info("Discarding journal of another run: %s" % self.path)
+
+        if group_info_dict:
+
+            logging.info("Resuming collection with %d journaled groups from: %s"
+                         % (len(group_info_dict), self.path))
+
+            self._file = open(self.path, 'a')
+
+            # Terminates a line cut off by a crash.
+            self._file.write('\n')
+
+        else:
+
+            self._file = open(self.path, 'w')
+            self._file.write(json.dumps(self.header) + '\n')
+
+        self._file.flush()
+
+        return group_info_dict
+
+    def append(self, group_info_list):
+        """Writes the items to the journal, may be called by several threads."""
+
+        lines = [json.dumps({'name': item.name,
+                             'size': int(item.size),
+                             'quota': int(item.quota),
+                             'files': int(item.files)}) + '\n'
+                 for item in group_info_list]
+
+        with self._lock:
+
+            self._file.write(''.join(lines))
+
+            # Flushed to the OS, it survives a killed process.
+            self._file.flush()
+
+    def close(self):
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Closes and deletes the journal after the collected data is stored."""
+
+        self.close()
+
+        if os.path.isfile(self.path):
+            os.remove(self.path)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Tiered scheduling of the group quota collection.
+
+Groups are classified by their stored history: hot groups changed recently,
+are near their quota or have no history and are queried every run. Cold
+groups are queried once per interval, spread over the days of the interval
+by a hash of the group name, and carry forward their last collected values
+in between. A full sweep of all groups runs every full_sweep_interval days.
+"""
+
+import collections
+import datetime
+import logging
+import zlib
+
+from dataset.item_handler import CarriedGroupInfoItem
+
+CollectSchedule = collections.namedtuple('CollectSchedule',
+    ['query_entries', 'carried_items', 'full_sweep'])
+
+
+class CollectScheduler:
+
+    def __init__(self,
+                 interval=14,
+                 full_sweep_interval=28,
+                 change_threshold=0.01,
+                 pressure_threshold=0.9):
+        """
+        :param interval: Days between the queries of a cold group.
+        :param full_sweep_interval: Days between full sweeps, 0 disables them.
+        :param change_threshold: Relative change of used size or file count
+                                 between two collections making a group hot.
+        :param pressure_threshold: Ratio of used size to quota making a group hot.
+        """
+
+        if interval < 1:
+            raise RuntimeError("Invalid scheduler interval: %s" % interval)
+
+        self.interval = interval
+        self.full_sweep_interval = full_sweep_interval
+        self.change_threshold = change_threshold
+        self.pressure_threshold = pressure_threshold
+
+    @classmethod
+    def from_config(cls, config, section='scheduler'):
+
+        return cls(config.getint(section, 'interval', fallback=14),
+                   config.getint(section, 'full_sweep_interval', fallback=28),
+                   config.getfloat(section, 'change_threshold', fallback=0.01),
+                   config.getfloat(section, 'pressure_threshold', fallback=0.9))
+
+    def history_start_date(self, date):
+        """Returns the first date of the history needed for the schedule of date."""
+        return date - datetime.timedelta(days=2 * self.interval)
+
+    def is_full_sweep(self, date):
+
+        if not self.full_sweep_interval:
+            return False
+
+        return date.toordinal() % self.full_sweep_interval == 0
+
+    def is_hot(self, collected):
+        """
+        :param collected: List of (date, GroupInfoItem) collected for a group, sorted by date.
+        """
+
+        if len(collected) < 2:
+            return True
+
+        last = collected[-1][1]
+
+        # GroupInfoItem holds Decimals, which do not mix with float thresholds.
+        if last.quota and float(last.size) >= float(last.quota) * self.pressure_threshold:
+            return True
+
+        for (_, previous), (_, current) in zip(collected, collected[1:]):
+
+            for previous_value, current_value in ((previous.size, current.size),
+                                                  (previous.files, current.files)):
+
+                if abs(float(current_value - previous_value)) > \
+                        max(float(previous_value), 1.0) * self.change_threshold:
+                    return True
+
+        return False
+
+    def is_due(self, group_name, date):
+        """Cold groups are due on one day per interval, spread by name."""
+        return zlib.crc32(group_name.encode()) % self.interval == date.toordinal() % self.interval
+
+    def create_schedule(self, group_entries, history, date, full_sweep=False):
+        """
+        :param group_entries: List of (gid, group name) of the user groups.
+        :param history: Dict of group name to a list of (date, GroupInfoItem, carried)
+                        sorted by date, see QuotaHistoryTable.get_group_info_history().
+        :param full_sweep: Forces a query of all groups.
+        :return: A CollectSchedule of the group entries to query and the
+                 CarriedGroupInfoItems of the other groups.
+        """
+
+        full_sweep = full_sweep or self.is_full_sweep(date)
+
+        query_entries = list()
+        carried_items = list()
+
+        for gid, group_name in group_entries:
+
+            collected = [(item_date, item)
+                         for item_date, item, carried in history.get(group_name, ())
+                         if not carried]
+
+            if full_sweep or not collected:
+                query_entries.append((gid, group_name))
+                continue
+
+            last_date, last = collected[-1]
+
+            if (date - last_date).days >= self.interval \
+                    or self.is_hot(collected) \
+                    or self.is_due(group_name, date):
+
+                query_entries.append((gid, group_name))
+
+            else:
+                carried_items.append(CarriedGroupInfoItem(
+                    group_name, last.size, last.quota, last.files, last_date))
+
+        logging.info("Scheduled %d of %d groups - Carried: %d - Full sweep: %s"
+                     % (len(query_entries), len(group_entries), len(carried_items), full_sweep))
+
+        return CollectSchedule(query_entries, carried_items, full_sweep)
+
+def merge_group_info_lists(group_entries, collected_list, carried_items):
+    """
+    :return: The collected and carried GroupInfoItems in the order of group_entries.
+    """
+
+    item_dict = {item.name: item for item in collected_list}
+    item_dict.update((item.name, item) for item in carried_items)
+
+    return [item_dict[group_name] for _, group_name in group_entries
+            if group_name in item_dict]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Sharded group quota collection across several client nodes.
+
+The user groups are split by a hash of the gid into count shards, shard
+index is collected by one collector instance into a shard file. The shard
+file holds the date, file system and shard of the run, the group entries
+of the shard and the collected groups. The merge step reads the shard files
+of a date, checks that all shards are present and every group of a shard
+was collected, and returns the groups to store in one batch.
+"""
+
+import datetime
+import tempfile
+import logging
+import glob
+import json
+import zlib
+import os
+
+from dataset.item_handler import GroupInfoItem, CarriedGroupInfoItem
+
+SHARD_FILE_PREFIX = 'group_quota_shard'
+
+
+def parse_shard(shard):
+    """
+    :param shard: Shard as 'index/count', e.g. '0/4'.
+    :return: A tuple of index and count.
+    """
+
+    try:
+        index, count = (int(value) for value in shard.split('/'))
+    except ValueError:
+        raise RuntimeError("Invalid shard, expected index/count: %s" % shard)
+
+    if count < 1 or not 0 <= index < count:
+        raise RuntimeError("Invalid shard index or count: %s" % shard)
+
+    return index, count
+
+def shard_of(gid, count):
+    """
+    :return: The shard index of a gid.
+    """
+    return zlib.crc32(str(gid).encode()) % count
+
+def select_shard_entries(group_entries, index, count):
+    """
+    :return: The (gid, group name) entries of shard index.
+    """
+
+    shard_entries = [(gid, group_name) for gid, group_name in group_entries
+                     if shard_of(gid, count) == index]
+
+    logging.info("Shard %d/%d - Groups: %d of %d"
+                 % (index, count, len(shard_entries), len(group_entries)))
+
+    return shard_entries
+
+def shard_file_path(shard_dir, date, index, count):
+    return os.path.join(shard_dir, "%s_%s_%d-of-%d.json"
+                        % (SHARD_FILE_PREFIX, date, index, count))
+
+def write_shard_file(shard_dir, date, file_system, index, count, group_entries, group_info_list):
+    """
+    Writes the collected groups of a shard, replacing the file atomically.
+    :return: The path of the shard file.
+    """
+
+    items = list()
+
+    for item in group_info_list:
+
+        entry = {'name': item.name,
+                 'size': int(item.size),
+                 'quota': int(item.quota),
+                 'files': int(item.files)}
+
+        if isinstance(item, CarriedGroupInfoItem):
+            entry['collected_date'] = item.collected_date.isoformat()
+
+        items.append(entry)
+
+    shard = {'date': str(date),
+             'file_system': file_system,
+             'index': index,
+             'count': count,
+             'group_entries': [list(entry) for entry in group_entries],
+             'items': items}
+
+    path = shard_file_path(shard_dir, date, index, count)
+
+    fd, temp_path = tempfile.mkstemp(dir=shard_dir, prefix='.' + SHARD_FILE_PREFIX)
+
+    with os.fdopen(fd, 'w') as f:
+        json.dump(shard, f)
+
+    os.replace(temp_path, path)
+
+    logging.info("Wrote %d groups to shard file: %s" % (len(items), path))
+
+    return path
+
+def read_shard_file(path):
+
+    with open(path, 'r') as f:
+        shard = json.load(f)
+
+    group_info_list = list()
+
+    for entry in shard['items']:
+
+        if 'collected_date' in entry:
+            group_info_list.append(CarriedGroupInfoItem(
+                entry['name'], entry['size'], entry['quota'], entry['files'],
+                datetime.datetime.strptime(entry['collected_date'], '%Y-%m-%d').date()))
+        else:
+            group_info_list.append(GroupInfoItem(
+                entry['name'], entry['size'], entry['quota'], entry['files']))
+
+    shard['group_entries'] = [tuple(entry) for entry in shard['group_entries']]
+    shard['items'] = group_info_list
+
+    return shard
+
+def merge_shard_files(shard_dir, date, file_system, group_entries=None):
+    """
+    :param group_entries: User groups of the merging node, groups missing
+                          from all shards are logged (optional).
+    :return: A tuple of the GroupInfoItems of all shards sorted by gid and
+             the paths of the shard files.
+    """
+
+    paths = sorted(glob.glob(os.path.join(
+        shard_dir, "%s_%s_*-of-*.json" % (SHARD_FILE_PREFIX, date))))
+
+    if not paths:
+        raise RuntimeError("No shard files found for date %s in: %s" % (date, shard_dir))
+
+    shards = [read_shard_file(path) for path in paths]
+
+    counts = {shard['count'] for shard in shards}
+
+    if len(counts) != 1:
+        raise RuntimeError("Shard files of different shard counts: %s" % sorted(counts))
+
+    count = counts.pop()
+
+    indexes = [shard['index'] for shard in shards]
+
+    missing_shards = sorted(set(range(count)) - set(indexes))
+
+    if missing_shards:
+        raise RuntimeError("Missing shards %s of %d for date: %s" % (missing_shards, count, date))
+
+    gid_items = list()
+
+    for shard in shards:
+
+        if shard['file_system'] != file_system or shard['date'] != str(date):
+            raise RuntimeError("Shard %d/%d of another run: %s %s"
+                % (shard['index'], count, shard['date'], shard['file_system']))
+
+        item_dict = {item.name: item for item in shard['items']}
+
+        for gid, group_name in shard['group_entries']:
+
+            if shard_of(gid, count) != shard['index']:
+                raise RuntimeError("Group %s (gid %s) does not belong to shard %d/%d"
+                    % (group_name, gid, shard['index'], count))
+
+            if group_name not in item_dict:
+                raise RuntimeError("Group %s not collected by shard %d/%d"
+                    % (group_name, shard['index'], count))
+
+            gid_items.append((gid, item_dict[group_name]))
+
+    if group_entries is not None:
+
+        merged_gids = {gid for gid, _ in gid_items}
+
+        for gid, group_name in group_entries:
+
+            if gid not in merged_gids:
+                logging.warning("Group %s (gid %s) not in any shard" % (group_name, gid))
+
+    gid_items.sort(key=lambda gid_item: gid_item[0])
+
+    logging.info("Merged %d groups of %d shards" % (len(gid_items), count))
+
+    return [item for _, item in gid_items], paths
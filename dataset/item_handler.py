@@ -21,13 +21,44 @@ class GroupInfoItem:
         self.quota = Decimal(quota)
         self.files = Decimal(files)
 
+class AggregatedGroupInfoItem(GroupInfoItem):
+    """Sum of several groups shown as a single item, e.g. 'others'."""
+
+    def __init__(self, name, size=0, quota=0, files=0, num_groups=0):
+
+        super(AggregatedGroupInfoItem, self).__init__(name, size, quota, files)
+
+        self.num_groups = num_groups
+
+class CarriedGroupInfoItem(GroupInfoItem):
+    """Last collected values of a group not queried in the current run."""
+
+    def __init__(self, name, size=0, quota=0, files=0, collected_date=None):
+
+        super(CarriedGroupInfoItem, self).__init__(name, size, quota, files)
+
+        self.collected_date = collected_date
+
 class GroupFilesMigrationInfoItem:
 
-    def __init__(self, name, fs1_file_count, fs2_file_count):
+    def __init__(self, name, *file_counts):
+        """
+        :param file_counts: File count of the group on each file system.
+        """
+
+        if len(file_counts) < 2:
+            raise RuntimeError("At least two file counts are required: %s" % name)
 
         self.name = name
-        self.fs1_file_count = Decimal(fs1_file_count)
-        self.fs2_file_count = Decimal(fs2_file_count)
+        self.file_counts = [Decimal(file_count) for file_count in file_counts]
+
+    @property
+    def fs1_file_count(self):
+        return self.file_counts[0]
+
+    @property
+    def fs2_file_count(self):
+        return self.file_counts[1]
 
 class GroupDateValueItem:
 
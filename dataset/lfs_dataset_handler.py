@@ -10,17 +10,36 @@
 
 import re
 import os
+import time
+import signal
 import logging
 import subprocess
 from enum import IntEnum
 
 from dataset.item_handler import GroupInfoItem
-from utils.getent_group import get_user_groups
+from utils.getent_group import get_user_group_entries
+from utils.instrumentation import stage
 
 LFS_BIN = 'lfs'
+LCTL_BIN = 'lctl'
+TIMEOUT_BIN = 'timeout'
+
+# Exit status of 'timeout -s KILL' if the command timed out, it kills its own
+# process group, a shell in between reports the signal as 128 + signal.
+TIMEOUT_KILL_STATUS = (-signal.SIGKILL, 128 + signal.SIGKILL)
+
+# Seconds to wait for a killed lfs call before killing harder.
+KILL_GRACE = 5
+
+# Quota accounting of the targets and global limits of the quota master, see lctl-get_param.
+LCTL_PARAM_ACCT_GROUP = "osd-*.%s-*.quota_slave.acct_group"
+LCTL_PARAM_GLB_GROUP = "qmt.%s-*.*.glb-grp"
+
+# Limits of the default pools, other pools limit subsets of the OSTs.
+LCTL_DEFAULT_POOL = '0x0'
 
 REGEX_QUOTA_STR_BLOCK = r"(?:(?:Disk quotas for grp .*?$).*?(?:(?:[\d\w\/]+){1}(?:(?:\s+[\d\*]+){3}\s+(?:[\d\w|-]+){1}){2}))"
-REGEX_QUOTA_STR_HEADER = r"^Disk\s+quotas\s+for\s+grp\s+([\d\w\-_]+)\s+\(gid\s+\d+\):$"
+REGEX_QUOTA_STR_HEADER = r"^Disk\s+quotas\s+for\s+grp\s+([\d\w\-_]+)\s+\(gid\s+(\d+)\):$"
 REGEX_QUOTA_STR_INFO = r"^\s*Filesystem(:?\s+[kbytes|files]+\s+quota\s+limit\s+grace){2}$"
 REGEX_QUOTA_STR_DATA = r"^\s*([\d\w\-/]+)\s+([\d\*]+)\s+([\d\*]+)\s+([\d\*]+)\s+([\d\w|-]+)\s+([\d\*]+)\s+([\d\*]+)\s+([\d\*]+)\s+([\d\w|-]+)$"
 REGEX_QUOTA_PATTERN_BLOCK = re.compile(REGEX_QUOTA_STR_BLOCK, re.MULTILINE|re.DOTALL)
@@ -37,6 +56,17 @@ REGEX_STORAGE_PATTERN_HEADER = re.compile(REGEX_STORAGE_STR_HEADER)
 REGEX_STORAGE_PATTERN_DATA = re.compile(REGEX_STORAGE_STR_DATA)
 REGEX_STORAGE_PATTERN_TAIL = re.compile(REGEX_STORAGE_STR_TAIL)
 
+REGEX_LCTL_STR_PARAM = r"^([\w.*\-]+)=\s*$"
+REGEX_LCTL_STR_ACCT_HEADER = r"^osd-\w+\.([\w\-]+)-(MDT|OST)[\da-fA-F]+\.quota_slave\.acct_group$"
+REGEX_LCTL_STR_ACCT_ENTRY = r"^-\s+id:\s+(\d+)\s*\n\s+usage:\s+\{\s*inodes:\s+(\d+),\s*kbytes:\s+(\d+)\s*\}"
+REGEX_LCTL_STR_GLB_HEADER = r"^qmt\.([\w\-]+)-QMT[\da-fA-F]+\.(dt|md)-([\w\-]+)\.glb-grp$"
+REGEX_LCTL_STR_GLB_ENTRY = r"^-\s+id:\s+(\d+)\s*\n\s+limits:\s+\{\s*hard:\s+(\d+),\s*soft:\s+(\d+),"
+REGEX_LCTL_PATTERN_PARAM = re.compile(REGEX_LCTL_STR_PARAM, re.MULTILINE)
+REGEX_LCTL_PATTERN_ACCT_HEADER = re.compile(REGEX_LCTL_STR_ACCT_HEADER)
+REGEX_LCTL_PATTERN_ACCT_ENTRY = re.compile(REGEX_LCTL_STR_ACCT_ENTRY, re.MULTILINE)
+REGEX_LCTL_PATTERN_GLB_HEADER = re.compile(REGEX_LCTL_STR_GLB_HEADER)
+REGEX_LCTL_PATTERN_GLB_ENTRY = re.compile(REGEX_LCTL_STR_GLB_ENTRY, re.MULTILINE)
+
 class GroupQuotaCapturing(IntEnum):
     FILE_SYSTEM = 1
     KBYTES_USED = 2
@@ -165,32 +195,94 @@ def lustre_total_size(file_system, input_file=None):
 
     return total_size
 
-def create_group_info_list(file_system, input_file=None):
+def _kill_process_group(proc):
+    """
+    Kills the process group of proc started with start_new_session,
+    SIGKILL follows SIGTERM after KILL_GRACE seconds.
+    """
 
-    input_data = None
-    group_info_item_list = list()
+    try:
 
-    if input_file:
+        os.killpg(proc.pid, signal.SIGTERM)
 
-        if not os.path.isfile(input_file):
-            raise IOError("The input file does not exist or is not a file: %s" % input_file)
+        try:
+            proc.wait(KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            pass
 
-        with open(input_file, "r") as input_file:
-            input_data = input_file.read()
+        # lfs ignoring SIGTERM survives the exit of sudo.
+        os.killpg(proc.pid, signal.SIGKILL)
 
-    else:
+    except ProcessLookupError:
+        pass
 
-        check_path_exists(file_system)
+    except PermissionError:
+        logging.error("Not permitted to kill process group of: %s" % ' '.join(proc.args))
 
-        output_list = list()
+    proc.wait()
 
-        for group_name in get_user_groups():
-            output_list.append(subprocess.check_output(['sudo', LFS_BIN, 'quota', '-g', group_name, file_system]).decode())
+def run_lfs_quota(group_name, file_system, recorder=None, timeout=None):
+    """
+    Runs 'lfs quota' for a group.
+    :param recorder: FlightRecorder of the call latency (optional),
+                     calls without exit status like timeouts are recorded with -1.
+    :param timeout: Timeout in seconds, raises subprocess.TimeoutExpired (optional).
+                    lfs runs as root, so 'timeout' inside sudo kills it, the process
+                    group is killed KILL_GRACE seconds later if that fails.
+    :return: The output of lfs.
+    """
 
-        input_data = ''.join(output_list)
+    args = [LFS_BIN, 'quota', '-g', group_name, file_system]
 
-    if not isinstance(input_data, str):
-        raise RuntimeError("Expected input data to be string, got: %s" % type(input_data))
+    if timeout:
+        args = [TIMEOUT_BIN, '-s', 'KILL', str(timeout)] + args
+
+    args = ['sudo'] + args
+
+    exit_status = -1
+    output = b''
+
+    start_time = time.perf_counter()
+
+    try:
+
+        with subprocess.Popen(args, stdout=subprocess.PIPE, start_new_session=True) as proc:
+
+            try:
+                output = proc.communicate(timeout=timeout + KILL_GRACE if timeout else None)[0]
+            except subprocess.TimeoutExpired:
+                _kill_process_group(proc)
+                raise
+
+        if timeout and proc.returncode in TIMEOUT_KILL_STATUS:
+            raise subprocess.TimeoutExpired(args, timeout, output)
+
+        if proc.returncode:
+            exit_status = proc.returncode
+            raise subprocess.CalledProcessError(proc.returncode, args, output)
+
+        exit_status = 0
+
+    finally:
+
+        if recorder:
+            recorder.record(file_system, group_name,
+                            time.perf_counter() - start_time,
+                            exit_status, len(output))
+
+    return output.decode()
+
+def parse_group_info_list(input_data, gid_names=None):
+    """
+    Parses the concatenated output of 'lfs quota -g'.
+    :param gid_names: Dict of gid to group name, names the groups queried by gid (optional).
+    :return: A list of GroupInfoItem.
+    """
+
+    if gid_names is None:
+        gid_names = dict()
+
+    group_info_item_list = list()
 
     blocks = REGEX_QUOTA_PATTERN_BLOCK.findall(input_data)
 
@@ -204,7 +296,9 @@ def create_group_info_list(file_system, input_file=None):
         if not REGEX_QUOTA_PATTERN_INFO.match(lines[1]):
             raise RuntimeError("Missing info line in block: %s" % block)
 
-        group_name = REGEX_QUOTA_PATTERN_HEADER.match(lines[0]).group(1)
+        header_result = REGEX_QUOTA_PATTERN_HEADER.match(lines[0])
+
+        group_name = gid_names.get(int(header_result.group(2)), header_result.group(1))
 
         data_result = REGEX_QUOTA_PATTERN_DATA.match(lines[2])
         kbytes_used_raw = data_result.group(GroupQuotaCapturing.KBYTES_USED)
@@ -222,24 +316,73 @@ def create_group_info_list(file_system, input_file=None):
 
         group_info_item_list.append(GroupInfoItem(group_name, bytes_used, bytes_quota, files))
 
-    logging.debug(group_info_item_list)
     return group_info_item_list
 
-def create_storage_info(file_system, input_file=None):
-    """Generates data structure and calculates storage information of given file systems.
+def collect_group_info_items(file_system, item_callback, group_entries=None, recorder=None,
+                             collector=None, journal=None):
+    """
+    Runs 'lfs quota' for the groups and passes the GroupInfoItems of each
+    group to item_callback as soon as they are parsed, so the outputs are
+    not kept in memory.
+
+    :param item_callback: Called with a list of GroupInfoItem, by the worker
+                          threads of the collector if given.
+    :param group_entries: List of (gid, group name) to query by name,
+                          default are the user groups.
+    :param journal: CollectJournal checkpointing each collected group, groups
+                    journaled by an interrupted run are passed first and not
+                    queried again (optional).
+    :return: The number of groups.
+    """
 
-    Args:
-        input_data (str): Output of `lfs df` command.
+    check_path_exists(file_system)
 
-    Returns:
-        dict: A Dictionary containing OST and MDT space usage information in bytes stored in a StorageInfo object.
+    if group_entries is None:
+        group_entries = get_user_group_entries()
 
-    Raises:
-        RuntimeError: If input_data is not a string and if it is corrupt e.g. header found before tail or tail found before header.
-    """
-    storage_dict = {}
+    query_entries = group_entries
 
-    input_data = None
+    if journal:
+
+        journal_dict = journal.load()
+
+        if journal_dict:
+            item_callback(list(journal_dict.values()))
+
+        query_entries = [(gid, group_name) for gid, group_name in group_entries
+                         if group_name not in journal_dict]
+
+    def handle_output(output):
+
+        with stage('parse_lfs_quota') as span:
+            group_info_item_list = parse_group_info_list(output)
+            span.items = len(group_info_item_list)
+
+        if journal:
+            journal.append(group_info_item_list)
+
+        item_callback(group_info_item_list)
+
+    with stage('lfs_quota') as span:
+
+        if collector:
+            collector.collect(query_entries, file_system, handle_output)
+        else:
+            for _, group_name in query_entries:
+                handle_output(run_lfs_quota(group_name, file_system, recorder))
+
+        span.items = len(query_entries)
+
+    return len(group_entries)
+
+def create_group_info_list(file_system, input_file=None, group_entries=None, recorder=None,
+                           collector=None, journal=None):
+    """
+    :param group_entries: List of (gid, group name) to query by name,
+                          default are the user groups.
+    :param journal: CollectJournal, see collect_group_info_items() (optional).
+    :return: A list of GroupInfoItem, in the order of group_entries if given.
+    """
 
     if input_file:
 
@@ -249,15 +392,172 @@ def create_storage_info(file_system, input_file=None):
         with open(input_file, "r") as input_file:
             input_data = input_file.read()
 
+        with stage('parse_lfs_quota') as span:
+            group_info_item_list = parse_group_info_list(input_data)
+            span.items = len(group_info_item_list)
+
     else:
 
-        check_path_exists(file_system)
+        if group_entries is None:
+            group_entries = get_user_group_entries()
+
+        group_info_item_list = list()
+
+        collect_group_info_items(file_system, group_info_item_list.extend, group_entries,
+                                 recorder, collector, journal)
+
+        # The collector and the journal pass the groups out of order.
+        group_order = {group_name: index for index, (_, group_name) in enumerate(group_entries)}
 
-        input_data = subprocess.check_output([LFS_BIN, "df", file_system]).decode()
+        group_info_item_list.sort(key=lambda item: group_order.get(item.name, len(group_order)))
+
+    logging.debug(group_info_item_list)
+    return group_info_item_list
+
+def run_lctl_get_param(param):
+    return subprocess.check_output(['sudo', LCTL_BIN, 'get_param', param]).decode()
+
+def _split_lctl_params(input_data):
+    """
+    Splits the output of 'lctl get_param' into the values of the parameters.
+    :return: A list of (parameter name, value) tuples.
+    """
+
+    fields = REGEX_LCTL_PATTERN_PARAM.split(input_data)
+
+    # fields: text before the first parameter, name, value, name, value, ...
+    return list(zip(fields[1::2], fields[2::2]))
+
+def parse_quota_acct_group(fs_name, input_data):
+    """
+    Sums the group quota accounting of the MDTs and OSTs of a file system
+    over all targets in the output of 'lctl get_param osd-*.*.quota_slave.acct_group'.
+    Output of several servers can be concatenated.
+
+    The inodes are counted on the MDTs only like by 'lfs quota',
+    the OST objects of a file are no separate files.
+
+    :return: A dict of gid to (kbytes, inodes).
+    """
+
+    usage_dict = dict()
+
+    for param, value in _split_lctl_params(input_data):
+
+        header_result = REGEX_LCTL_PATTERN_ACCT_HEADER.match(param)
+
+        if not header_result:
+            raise RuntimeError("Invalid accounting parameter: %s" % param)
+
+        if header_result.group(1) != fs_name:
+            continue
+
+        is_mdt = header_result.group(2) == 'MDT'
+
+        for gid, inodes, kbytes in REGEX_LCTL_PATTERN_ACCT_ENTRY.findall(value):
+
+            gid = int(gid)
+
+            total_kbytes, total_inodes = usage_dict.get(gid, (0, 0))
+
+            total_kbytes += int(kbytes)
+
+            if is_mdt:
+                total_inodes += int(inodes)
+
+            usage_dict[gid] = (total_kbytes, total_inodes)
+
+    return usage_dict
+
+def parse_quota_glb_group(fs_name, input_data):
+    """
+    Reads the block quota of the groups from the output of
+    'lctl get_param qmt.*.*.glb-grp' on the quota master.
+    Only the default block pool is used, like the quota shown by 'lfs quota'.
+
+    :return: A dict of gid to soft limit in kbytes.
+    """
+
+    quota_dict = dict()
+
+    for param, value in _split_lctl_params(input_data):
+
+        header_result = REGEX_LCTL_PATTERN_GLB_HEADER.match(param)
+
+        if not header_result:
+            raise RuntimeError("Invalid global quota parameter: %s" % param)
+
+        fs, pool_type, pool = header_result.groups()
+
+        if fs != fs_name or pool_type != 'dt' or pool != LCTL_DEFAULT_POOL:
+            continue
+
+        for gid, hard, soft in REGEX_LCTL_PATTERN_GLB_ENTRY.findall(value):
+            quota_dict[int(gid)] = int(soft)
+
+    return quota_dict
+
+def create_group_info_list_from_acct(fs_name, group_entries=None,
+                                     acct_data=None, glb_data=None):
+    """
+    Creates the GroupInfoItem list of a file system with two lctl calls
+    on the servers instead of one 'lfs quota' call per group.
+
+    :param fs_name: Lustre file system name, e.g. 'lustre' of lustre-MDT0000.
+    :param group_entries: List of (gid, group name), default are the user groups.
+    :param acct_data: Output of the accounting parameters, collected from all
+                      MDS and OSS, default is a local lctl call.
+    :param glb_data: Output of the global quota parameters of the quota master,
+                     default is a local lctl call.
+    :return: A list of GroupInfoItem in the order of group_entries,
+             groups without accounting have no usage.
+    """
+
+    if group_entries is None:
+        group_entries = get_user_group_entries()
+
+    with stage('lctl_get_param'):
+
+        if acct_data is None:
+            acct_data = run_lctl_get_param(LCTL_PARAM_ACCT_GROUP % fs_name)
+
+        if glb_data is None:
+            glb_data = run_lctl_get_param(LCTL_PARAM_GLB_GROUP % fs_name)
+
+    with stage('parse_lctl_quota') as span:
+
+        usage_dict = parse_quota_acct_group(fs_name, acct_data)
+        quota_dict = parse_quota_glb_group(fs_name, glb_data)
+
+        if not usage_dict:
+            raise RuntimeError("No quota accounting found for file system: %s" % fs_name)
+
+        group_info_item_list = list()
+
+        for gid, group_name in group_entries:
+
+            kbytes_used, files = usage_dict.get(gid, (0, 0))
+            kbytes_quota = quota_dict.get(gid, 0)
+
+            group_info_item_list.append(
+                GroupInfoItem(group_name, kbytes_used * 1024, kbytes_quota * 1024, files))
+
+        span.items = len(group_info_item_list)
+
+    logging.debug(group_info_item_list)
+    return group_info_item_list
+
+def parse_storage_info(input_data):
+    """
+    Parses the output of 'lfs df'.
+    :return: A dict of mount point to StorageInfo.
+    """
 
     if not isinstance(input_data, str):
         raise RuntimeError("Expected input data to be string, got: %s" % type(input_data))
 
+    storage_dict = {}
+
     blocks = REGEX_STORAGE_PATTERN_BLOCK.findall(input_data)
 
     for block in blocks:
@@ -293,6 +593,41 @@ def create_storage_info(file_system, input_file=None):
                 else:
                     raise RuntimeError("Target is neither MDT or OST: %s" % line)
 
+    return storage_dict
+
+def create_storage_info(file_system, input_file=None):
+    """Generates data structure and calculates storage information of given file systems.
+
+    Args:
+        input_data (str): Output of `lfs df` command.
+
+    Returns:
+        dict: A Dictionary containing OST and MDT space usage information in bytes stored in a StorageInfo object.
+
+    Raises:
+        RuntimeError: If input_data is not a string and if it is corrupt e.g. header found before tail or tail found before header.
+    """
+    input_data = None
+
+    if input_file:
+
+        if not os.path.isfile(input_file):
+            raise IOError("The input file does not exist or is not a file: %s" % input_file)
+
+        with open(input_file, "r") as input_file:
+            input_data = input_file.read()
+
+    else:
+
+        check_path_exists(file_system)
+
+        with stage('lfs_df'):
+            input_data = subprocess.check_output([LFS_BIN, "df", file_system]).decode()
+
+    with stage('parse_lfs_df') as span:
+        storage_dict = parse_storage_info(input_data)
+        span.items = len(storage_dict)
+
     if logging.getLogger().isEnabledFor(logging.DEBUG):
 
         for key in storage_dict:
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import concurrent.futures
+import subprocess
+import logging
+import time
+
+from utils.adaptive_limiter import AdaptiveLimiter
+
+import dataset.lfs_dataset_handler as ldh
+
+
+class LfsQuotaCollector:
+    """
+    Runs 'lfs quota' for many groups in parallel. The number of concurrent
+    calls is adapted by an AdaptiveLimiter to the latency of the MDS,
+    timed out calls are retried.
+    """
+
+    def __init__(self, limiter, timeout=None, retries=2, recorder=None):
+        """
+        :param limiter: AdaptiveLimiter of the lfs calls.
+        :param timeout: Timeout of a single call in seconds (optional).
+        :param retries: Retries of a timed out call.
+        :param recorder: FlightRecorder of the call latencies (optional).
+        """
+
+        self.limiter = limiter
+        self.timeout = timeout
+        self.retries = retries
+        self.recorder = recorder
+
+    @classmethod
+    def from_config(cls, config, recorder=None):
+        """Returns a collector configured in the [collector] section."""
+
+        timeout = config.getfloat('collector', 'timeout', fallback=0)
+
+        return cls(AdaptiveLimiter.from_config(config),
+                   timeout or None,
+                   config.getint('collector', 'retries', fallback=2),
+                   recorder)
+
+    def collect(self, group_entries, file_system, callback=None):
+        """
+        :param group_entries: List of (gid, group name), queried by name.
+        :param callback: Called with each lfs output as soon as it is collected,
+                         by the worker threads (optional).
+        :return: A list of the lfs outputs in the order of group_entries,
+                 None for each group handed to the callback.
+        """
+
+        start_time = time.time()
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.limiter.max_concurrency) as executor:
+
+            output_list = list(executor.map(
+                lambda group_entry: self._run(group_entry[1], file_system, callback),
+                group_entries))
+
+        logging.debug("Collected %d groups in %.1fs - Max. concurrency: %d - Decreases: %d"
+            % (len(group_entries), time.time() - start_time,
+               int(self.limiter.max_limit_reached), self.limiter.num_decreases))
+
+        return output_list
+
+    def _run(self, group_name, file_system, callback):
+
+        output = self._run_lfs_quota(group_name, file_system)
+
+        # The output is handed over and not kept until all groups are collected.
+        # The limiter slot is already released, so a slow callback like a blocking
+        # database writer is not taken as lfs latency.
+        if callback:
+            callback(output)
+            return None
+
+        return output
+
+    def _run_lfs_quota(self, group_name, file_system):
+
+        for attempt in range(self.retries + 1):
+
+            self.limiter.acquire()
+
+            start_time = time.perf_counter()
+            overloaded = True
+
+            try:
+
+                output = ldh.run_lfs_quota(
+                    group_name, file_system, self.recorder, self.timeout)
+
+                overloaded = False
+
+                return output
+
+            except subprocess.TimeoutExpired:
+
+                if attempt == self.retries:
+                    raise
+
+                logging.warning("Timeout of lfs quota for group %s, retry %d of %d"
+                                % (group_name, attempt + 1, self.retries))
+
+            finally:
+                self.limiter.release(time.perf_counter() - start_time, overloaded)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import concurrent.futures
+import logging
+
+from utils.getent_group import get_user_group_entries
+
+import dataset.lfs_dataset_handler as ldh
+
+class LfsSnapshot:
+    """
+    Collects the user groups, the group quota list and the total size
+    of a file system at most once, so all reports of a run share them.
+    """
+
+    def __init__(self, input_file=None):
+        """
+        :param input_file: Output of 'lfs df' used for the total size (optional).
+        """
+
+        self.input_file = input_file
+
+        self._group_entries = None
+        self._group_info_lists = dict()
+        self._total_sizes = dict()
+
+    def group_entries(self):
+        """Returns the list of (gid, group name) of the user groups."""
+
+        if self._group_entries is None:
+            self._group_entries = get_user_group_entries()
+
+        return list(self._group_entries)
+
+    def group_names(self):
+        return [group_name for _, group_name in self.group_entries()]
+
+    def group_info_list(self, file_system):
+        """Returns a copy of the GroupInfoItem list, charts sort their dataset."""
+
+        if file_system not in self._group_info_lists:
+
+            self._group_info_lists[file_system] = ldh.create_group_info_list(
+                file_system, group_entries=self.group_entries())
+
+        else:
+            logging.debug("Reusing group info list of: %s" % file_system)
+
+        return list(self._group_info_lists[file_system])
+
+    def group_info_lists(self, file_systems):
+        """
+        Collects the file systems not collected yet concurrently,
+        each one is queried by a separate MDS.
+        :return: A dict of file system to a copy of its GroupInfoItem list.
+        """
+
+        group_entries = self.group_entries()
+
+        missing = [file_system for file_system in file_systems
+                   if file_system not in self._group_info_lists]
+
+        if len(missing) > 1:
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(missing)) as executor:
+
+                futures = {file_system: executor.submit(
+                               ldh.create_group_info_list, file_system,
+                               group_entries=group_entries)
+                           for file_system in missing}
+
+                for file_system, future in futures.items():
+                    self._group_info_lists[file_system] = future.result()
+
+        return {file_system: self.group_info_list(file_system)
+                for file_system in file_systems}
+
+    def total_size(self, file_system):
+
+        if file_system not in self._total_sizes:
+
+            self._total_sizes[file_system] = \
+                ldh.lustre_total_size(file_system, self.input_file)
+
+        else:
+            logging.debug("Reusing total size of: %s" % file_system)
+
+        return self._total_sizes[file_system]
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import MySQLdb
+import logging
+
+from contextlib import closing
+
+from utils.instrumentation import stage
+
+class DiskSpaceUsageTable:
+
+    def __init__(self, host, user, passwd, db, table):
+
+        self._host = host
+        self._user = user
+        self._passwd = passwd
+        self._db = db
+        self._table = table
+
+    def get_latest_total_size(self, mounted_on):
+        """
+        Queries the OST total size of the most recent snapshot of a file system.
+        :param mounted_on: Mount point of the file system.
+        :return: A tuple of the snapshot date and the total size in bytes.
+        """
+
+        with closing(MySQLdb.connect(host=self._host,
+                                     user=self._user,
+                                     passwd=self._passwd,
+                                     db=self._db)) \
+                                        as conn:
+
+            with closing(conn.cursor()) as cur:
+
+                sql = "SELECT date, total "\
+                      "FROM %s "\
+                      "WHERE mounted_on = '%s' "\
+                      "ORDER BY date DESC LIMIT 1"\
+                      % (self._table, mounted_on)
+
+                logging.debug(sql)
+
+                with stage('sql_query'):
+                    cur.execute(sql)
+
+                item = cur.fetchone()
+
+                if not item:
+                    raise RuntimeError("Found no disk space usage for: %s"
+                                       % mounted_on)
+
+        return item[0], int(item[1])
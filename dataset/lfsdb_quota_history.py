@@ -8,21 +8,118 @@
 # the terms of the GNU General Public Licence version 3 (GPL Version 3),
 # copied verbatim in the file "LICENCE".
 
+import datetime
 import MySQLdb
 import logging
 
 from contextlib import closing
-from dataset.item_handler import GroupDateValueItem
+
+from utils.instrumentation import stage
+from dataset.item_handler import GroupDateValueItem, GroupInfoItem
+
+# TiB Divisor = '1099511627776'
+SQL_USED_TIB = "ROUND(used/1099511627776)"
+SQL_QUOTA_RATIO = "IF(quota=0, 0, ROUND((used / quota) * 100, 0))"
+
+def _to_date(value):
+    """
+    :param value: A date, datetime or string starting with 'YYYY-MM-DD'.
+    """
+
+    if isinstance(value, datetime.datetime):
+        return value.date()
+
+    if isinstance(value, datetime.date):
+        return value
+
+    return datetime.datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+def expand_runs(runs, start_date, end_date):
+    """
+    Forward-fills runs of the compact storage into daily values.
+    :param runs: Iterable of (gid, start_date, end_date, value...).
+    :return: A list of (gid, date, value...) within start_date and end_date,
+             sorted by gid and date.
+    """
+
+    start_date = _to_date(start_date)
+    end_date = _to_date(end_date)
+
+    results = list()
+
+    for run in sorted(runs, key=lambda run: (run[0], run[1])):
+
+        date = max(run[1], start_date)
+        run_end_date = min(run[2], end_date)
+
+        while date <= run_end_date:
+            results.append((run[0], date) + tuple(run[3:]))
+            date += datetime.timedelta(days=1)
+
+    return results
 
 class QuotaHistoryTable:
 
-    def __init__(self, host, user, passwd, db, table):
+    def __init__(self, host, user, passwd, db, table, compact=False):
+        """
+        :param compact: The table holds runs of unchanged values,
+                        see database.group_quota_runs.
+        """
 
         self._host = host
         self._user = user
         self._passwd = passwd
         self._db = db
         self._table = table
+        self._compact = compact
+
+    def _fetch_all(self, sql):
+
+        with closing(MySQLdb.connect(host=self._host,
+                                     user=self._user,
+                                     passwd=self._passwd,
+                                     db=self._db)) \
+                                        as conn:
+
+            with closing(conn.cursor()) as cur:
+
+                logging.debug(sql)
+
+                with stage('sql_query'):
+                    cur.execute(sql)
+
+                return cur.fetchall()
+
+    def _fetch_runs(self, columns, start_date, end_date, groups=None):
+        """
+        :return: The runs of the compact table overlapping the time interval
+                 as (gid, start_date, end_date, columns...).
+        """
+
+        sql = "SELECT gid, start_date, end_date, %s "\
+              "FROM %s "\
+              "WHERE start_date <= '%s' AND end_date >= '%s' "\
+              % (columns, self._table, end_date, start_date)
+
+        if groups:
+            sql += "AND gid IN (%s) " % str(groups).strip('[]')
+
+        return [(item[0].decode(),) + tuple(item[1:]) for item in self._fetch_all(sql)]
+
+    def _get_time_series_compact(self, value_sql, start_date, end_date, groups=None):
+
+        results = list()
+
+        for name, date, value in expand_runs(
+                self._fetch_runs(value_sql, start_date, end_date, groups),
+                start_date, end_date):
+
+            results.append(GroupDateValueItem(name, date, int(value) if value else None))
+
+        if not results:
+            raise RuntimeError("Found empty result list!")
+
+        return results
 
     def filter_groups_at_threshold(self,
                                    start_date,
@@ -40,6 +137,22 @@ class QuotaHistoryTable:
 
         results = list()
 
+        if self._compact:
+
+            sql = "SELECT gid "\
+                  "FROM %s "\
+                  "WHERE start_date <= '%s' AND end_date >= '%s' "\
+                  % (self._table, end_date, start_date)
+
+            if groups:
+                sql += "AND gid IN (%s) " % str(groups).strip('[]')
+
+            sql += "AND used >= %s "\
+                   "GROUP BY gid"\
+                   % threshold
+
+            return [item[0].decode() for item in self._fetch_all(sql)]
+
         with closing(MySQLdb.connect(host=self._host,
                                      user=self._user,
                                      passwd=self._passwd,
@@ -61,7 +174,9 @@ class QuotaHistoryTable:
                        % threshold
 
                 logging.debug(sql)
-                cur.execute(sql)
+
+                with stage('sql_query'):
+                    cur.execute(sql)
 
                 for item in cur.fetchall():
                     results.append(item[0].decode())
@@ -79,6 +194,9 @@ class QuotaHistoryTable:
         :return: A list of GroupDateValueItem.
         """
 
+        if self._compact:
+            return self._get_time_series_compact(SQL_USED_TIB, start_date, end_date, groups)
+
         results = list()
 
         with closing(MySQLdb.connect(host=self._host,
@@ -89,12 +207,11 @@ class QuotaHistoryTable:
 
             with closing(conn.cursor()) as cur:
 
-                # TiB Divisor = '1099511627776'
                 sql = "SELECT gid, "\
                       "       date, "\
-                      "       ROUND(used/1099511627776) as used "\
+                      "       %s as used "\
                       "FROM %s WHERE date between '%s' AND '%s' "\
-                      % (self._table, start_date, end_date)
+                      % (SQL_USED_TIB, self._table, start_date, end_date)
 
                 if groups:
                     sql += "AND gid IN (%s) " % str(groups).strip('[]')
@@ -102,7 +219,9 @@ class QuotaHistoryTable:
                 sql += 'GROUP BY gid, date'
 
                 logging.debug(sql)
-                cur.execute(sql)
+
+                with stage('sql_query'):
+                    cur.execute(sql)
 
                 for item in cur.fetchall():
 
@@ -133,6 +252,9 @@ class QuotaHistoryTable:
         :return: A list of GroupDateValueItem.
         """
 
+        if self._compact:
+            return self._get_time_series_compact(SQL_QUOTA_RATIO, start_date, end_date, groups)
+
         results = list()
 
         with closing(MySQLdb.connect(host=self._host,
@@ -145,11 +267,10 @@ class QuotaHistoryTable:
 
                 sql = "SELECT gid, "\
                       "       date, "\
-                      "       IF(quota=0, 0, ROUND((used / quota) * 100, 0)) "\
-                      "         as ratio " \
+                      "       %s as ratio " \
                       "FROM %s " \
                       "WHERE date between '%s' AND '%s' " \
-                      % (self._table, start_date, end_date)
+                      % (SQL_QUOTA_RATIO, self._table, start_date, end_date)
 
                 if groups:
                     sql += "AND gid IN (%s) " % str(groups).strip('[]')
@@ -157,7 +278,9 @@ class QuotaHistoryTable:
                 sql += 'GROUP BY gid, date'
 
                 logging.debug(sql)
-                cur.execute(sql)
+
+                with stage('sql_query'):
+                    cur.execute(sql)
 
                 for item in cur.fetchall():
 
@@ -174,3 +297,107 @@ class QuotaHistoryTable:
                     raise RuntimeError("Found empty result list!")
 
         return results
+
+    def get_latest_group_info_list(self, groups=None):
+        """
+        Queries the group quotas of the most recent snapshot date.
+        The date index makes looking up the latest date a single index read.
+        :param groups: List of group names (optional).
+        :return: A tuple of the snapshot date and a list of GroupInfoItem.
+        """
+
+        date = None
+        results = list()
+
+        with closing(MySQLdb.connect(host=self._host,
+                                     user=self._user,
+                                     passwd=self._passwd,
+                                     db=self._db)) \
+                                        as conn:
+
+            with closing(conn.cursor()) as cur:
+
+                if self._compact:
+                    sql = "SELECT gid, end_date, used, quota, files "\
+                          "FROM %s "\
+                          "WHERE end_date = (SELECT MAX(end_date) FROM %s) "\
+                          % (self._table, self._table)
+                else:
+                    sql = "SELECT gid, date, used, quota, files "\
+                          "FROM %s "\
+                          "WHERE date = (SELECT MAX(date) FROM %s) "\
+                          % (self._table, self._table)
+
+                if groups:
+                    sql += "AND gid IN (%s) " % str(groups).strip('[]')
+
+                logging.debug(sql)
+
+                with stage('sql_query'):
+                    cur.execute(sql)
+
+                for item in cur.fetchall():
+
+                    name = item[0].decode()
+                    date = item[1]
+
+                    results.append(GroupInfoItem(name,
+                                                 item[2] or 0,
+                                                 item[3] or 0,
+                                                 item[4] or 0))
+
+                if not results:
+                    raise RuntimeError("Found empty result list!")
+
+        return date, results
+
+    def get_group_info_history(self, start_date, end_date):
+        """
+        Queries the group quotas within a time interval including the carried
+        flag of values not collected at the date, see collect_scheduler.
+        :return: A dict of group name to a list of (date, GroupInfoItem, carried)
+                 sorted by date.
+        """
+
+        results = dict()
+
+        if self._compact:
+
+            for name, date, used, quota, files, carried in expand_runs(
+                    self._fetch_runs('used, quota, files, carried', start_date, end_date),
+                    start_date, end_date):
+
+                results.setdefault(name, list()).append(
+                    (date, GroupInfoItem(name, used or 0, quota or 0, files or 0), bool(carried)))
+
+            return results
+
+        with closing(MySQLdb.connect(host=self._host,
+                                     user=self._user,
+                                     passwd=self._passwd,
+                                     db=self._db)) \
+                                        as conn:
+
+            with closing(conn.cursor()) as cur:
+
+                sql = "SELECT gid, date, used, quota, files, carried "\
+                      "FROM %s "\
+                      "WHERE date BETWEEN '%s' AND '%s' "\
+                      "ORDER BY gid, date"\
+                      % (self._table, start_date, end_date)
+
+                logging.debug(sql)
+
+                with stage('sql_query'):
+                    cur.execute(sql)
+
+                for item in cur.fetchall():
+
+                    name = item[0].decode()
+
+                    results.setdefault(name, list()).append(
+                        (item[1],
+                         GroupInfoItem(name, item[2] or 0, item[3] or 0, item[4] or 0),
+                         bool(item[5])))
+
+        return results
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import datetime
+import logging
+
+from dataset.lfsdb_quota_history import QuotaHistoryTable
+from dataset.lfsdb_disk_space_usage import DiskSpaceUsageTable
+
+class DatabaseSnapshot:
+    """
+    Provides the same data as LfsSnapshot from the latest snapshot stored
+    by the collect scripts, so creating reports puts no load on the MDS.
+    """
+
+    def __init__(self, quota_history_table, disk_space_usage_table, max_age=0):
+        """
+        :param max_age: Maximum age of the snapshot in days, 0 disables the check.
+        """
+
+        self.input_file = None
+
+        self.quota_history_table = quota_history_table
+        self.disk_space_usage_table = disk_space_usage_table
+        self.max_age = max_age
+
+        self._group_info_list = None
+        self._total_sizes = dict()
+
+    @classmethod
+    def from_config(cls, config):
+
+        host = config.get('mysqld', 'host')
+        user = config.get('mysqld', 'user')
+        passwd = config.get('mysqld', 'passwd')
+        db = config.get('mysqld', 'db')
+
+        return cls(QuotaHistoryTable(host, user, passwd, db,
+                                     config.get('snapshot', 'quota_table'),
+                                     config.getboolean('snapshot', 'quota_table_compact',
+                                                       fallback=False)),
+                   DiskSpaceUsageTable(host, user, passwd, db,
+                                       config.get('snapshot', 'disk_usage_table')),
+                   config.getint('snapshot', 'max_age', fallback=0))
+
+    def group_names(self):
+        return [item.name for item in self._latest_group_info_list()]
+
+    def group_info_list(self, file_system):
+        """
+        The group quota history table holds a single file system,
+        so file_system is not part of the query.
+        """
+        return list(self._latest_group_info_list())
+
+    def group_info_lists(self, file_systems):
+        return {file_system: self.group_info_list(file_system)
+                for file_system in file_systems}
+
+    def total_size(self, file_system):
+
+        if file_system not in self._total_sizes:
+
+            date, total_size = \
+                self.disk_space_usage_table.get_latest_total_size(file_system)
+
+            self._check_age(date)
+
+            self._total_sizes[file_system] = total_size
+
+        return self._total_sizes[file_system]
+
+    def _latest_group_info_list(self):
+
+        if self._group_info_list is None:
+
+            date, self._group_info_list = \
+                self.quota_history_table.get_latest_group_info_list()
+
+            self._check_age(date)
+
+            logging.debug("Using group quota snapshot of: %s" % date)
+
+        return self._group_info_list
+
+    def _check_age(self, date):
+
+        if not self.max_age:
+            return
+
+        age = (datetime.date.today() - date).days
+
+        if age > self.max_age:
+            raise RuntimeError("Latest snapshot from %s is %d days old, "
+                               "maximum age is %d days!" % (date, age, self.max_age))
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Seeded generators of synthetic lfs output and quota history at any scale.
+
+The same seed always creates the same data, so benchmark runs on different
+commits are comparable. Group sizes follow a log-normal distribution like on
+production file systems: few large groups and a long tail of small ones.
+"""
+
+import datetime
+
+import numpy as np
+
+from dataset.item_handler import GroupInfoItem, GroupDateValueItem
+
+# First gid of user groups, see get_user_groups().
+FIRST_GID = 1000
+
+KIB = 1024
+TIB_KBYTES = 1024 ** 3
+
+# Kilobytes of a single OST and MDT.
+OST_KBYTES = 71145671680
+MDT_KBYTES = 1382632816
+
+
+def create_groups(num_groups):
+    """
+    :return: A list of (group name, gid) tuples.
+    """
+    return [("group%d" % i, FIRST_GID + i) for i in range(1, num_groups + 1)]
+
+def _create_group_quotas(num_groups, rng):
+    """
+    :return: Arrays of used kbytes, quota kbytes and file counts per group.
+    """
+
+    # Median group uses 2 TiB, the largest ones several PiB.
+    kbytes_used = rng.lognormal(np.log(2 * TIB_KBYTES), 2.0, num_groups)
+    kbytes_used = np.minimum(kbytes_used, 1 << 52).astype(np.int64)
+
+    # Most groups have a quota above their usage, some exceed it.
+    kbytes_quota = \
+        (kbytes_used * rng.uniform(0.8, 3.0, num_groups)).astype(np.int64)
+
+    # Groups without quota.
+    kbytes_quota[rng.random(num_groups) < 0.1] = 0
+
+    # Mean file size between 64 KiB and 64 MiB.
+    files = kbytes_used // (2 ** rng.uniform(6, 16, num_groups)).astype(np.int64)
+
+    return kbytes_used, kbytes_quota, files
+
+def create_lfs_quota_output(file_system, num_groups, seed=0):
+    """
+    Creates the concatenated output of 'lfs quota -g <group> <file_system>'
+    for all groups, like create_group_info_list() reads it.
+    """
+    return '\n'.join(create_lfs_quota_outputs(file_system, num_groups, seed))
+
+def create_lfs_quota_outputs(file_system, num_groups, seed=0):
+    """
+    :return: A list of the outputs of 'lfs quota -g <group> <file_system>'
+             in the order of create_groups().
+    """
+
+    rng = np.random.default_rng(seed)
+
+    kbytes_used, kbytes_quota, files = _create_group_quotas(num_groups, rng)
+
+    output_list = list()
+
+    for index, (name, gid) in enumerate(create_groups(num_groups)):
+
+        used = str(kbytes_used[index])
+        quota = kbytes_quota[index]
+
+        # lfs marks exceeded quotas with '*'.
+        if quota and kbytes_used[index] > quota:
+            used += '*'
+
+        output_list.append(
+            "Disk quotas for grp %s (gid %d):\n"
+            "     Filesystem  kbytes   quota   limit   grace   files   quota   limit   grace\n"
+            "        %s %s  %d %d       - %d       0       0       -\n"
+            % (name, gid, file_system, used, quota, quota * 3 // 2, files[index]))
+
+    return output_list
+
+def create_getent_group_output(num_groups):
+    """
+    Creates the output of 'getent group' with some system groups
+    and the user groups of create_groups().
+    """
+
+    lines = ['root:x:0:', 'daemon:x:1:', 'users:x:100:']
+
+    for name, gid in create_groups(num_groups):
+        lines.append("%s:x:%d:" % (name, gid))
+
+    return '\n'.join(lines) + '\n'
+
+def create_lfs_df_output(file_system, num_osts, num_mdts=1, seed=0, fs_name='lustre'):
+    """
+    Creates the output of 'lfs df <file_system>', like create_storage_info() reads it.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    lines = ["UUID                   1K-blocks        Used   Available Use% Mounted on"]
+
+    for target, num_targets, kbytes in (('MDT', num_mdts, MDT_KBYTES),
+                                        ('OST', num_osts, OST_KBYTES)):
+
+        used_list = (rng.uniform(0.05, 0.95, num_targets) * kbytes).astype(np.int64)
+
+        for index, used in enumerate(used_list):
+
+            lines.append("%s-%s%04x_UUID %14d %14d %14d %3d%% %s[%s:%d]"
+                % (fs_name, target, index, kbytes, used, kbytes - used,
+                   used * 100 // kbytes, file_system, target, index))
+
+        if target == 'OST':
+
+            total = kbytes * num_targets
+            used = int(used_list.sum())
+
+            lines.append('')
+            lines.append("filesystem_summary:  %d %d %d %3d%% %s"
+                % (total, used, total - used, used * 100 // total, file_system))
+
+    lines.append('')
+
+    return '\n'.join(lines)
+
+def create_group_info_list(num_groups, seed=0):
+    """
+    :return: A list of GroupInfoItem with sizes in bytes.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    kbytes_used, kbytes_quota, files = _create_group_quotas(num_groups, rng)
+
+    return [GroupInfoItem(name,
+                          int(kbytes_used[index]) * KIB,
+                          int(kbytes_quota[index]) * KIB,
+                          int(files[index]))
+            for index, (name, _) in enumerate(create_groups(num_groups))]
+
+def create_group_quota_history(num_groups, num_days, end_date=None, seed=0):
+    """
+    Generates the daily group quota snapshots of a time period, in which the
+    usage of each group follows a random walk. Only one day is held in memory.
+    :param end_date: Date of the last snapshot, default is 2023-01-01.
+    :return: An iterator of (date, list of GroupInfoItem) per day.
+    """
+
+    if end_date is None:
+        end_date = datetime.date(2023, 1, 1)
+
+    rng = np.random.default_rng(seed)
+
+    kbytes_used, kbytes_quota, files = _create_group_quotas(num_groups, rng)
+
+    names = [name for name, _ in create_groups(num_groups)]
+
+    for day in range(num_days - 1, -1, -1):
+
+        date = end_date - datetime.timedelta(days=day)
+
+        yield date, [GroupInfoItem(names[index],
+                                   int(kbytes_used[index]) * KIB,
+                                   int(kbytes_quota[index]) * KIB,
+                                   int(files[index]))
+                     for index in range(num_groups)]
+
+        # Daily change of up to +-2% per group.
+        growth = rng.normal(1.001, 0.01, num_groups)
+
+        kbytes_used = (kbytes_used * growth).astype(np.int64)
+        files = (files * growth).astype(np.int64)
+
+def create_group_date_values(num_groups, num_days, end_date=None, seed=0):
+    """
+    Creates the quota usage per group and day in percent, like
+    QuotaHistoryTable.get_time_series_group_quota_usage() returns it.
+    :return: A list of GroupDateValueItem.
+    """
+
+    item_list = list()
+
+    for date, group_info_list in \
+            create_group_quota_history(num_groups, num_days, end_date, seed):
+
+        for item in group_info_list:
+
+            ratio = 0
+
+            if item.quota:
+                ratio = int(round(item.size / item.quota * 100))
+
+            item_list.append(GroupDateValueItem(item.name, date, ratio))
+
+    return item_list
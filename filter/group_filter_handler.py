@@ -9,6 +9,11 @@
 # copied verbatim in the file "LICENCE".
 
 import logging
+import numpy as np
+
+from dataset.item_handler import AggregatedGroupInfoItem
+
+OTHERS_GROUP_NAME = 'others'
 
 # TODO: Check list if contains instances of GorupInfoItem class.
 def filter_group_info_items(group_info_list, size=0, quota=0):
@@ -29,3 +34,48 @@ def filter_group_info_items(group_info_list, size=0, quota=0):
             new_group_info_list.append(group_info_item)
 
     return new_group_info_list
+
+def top_group_info_items(group_info_list, num_top_groups, key):
+    """
+    Selects the top groups by the given key and aggregates the remaining
+    groups into a single 'others' item.
+    :param group_info_list: List of GroupInfoItem.
+    :param num_top_groups: Number of top groups to keep, 0 keeps all groups.
+    :param key: Function returning the ranking value of a GroupInfoItem.
+    :return: List of the top GroupInfoItem and an AggregatedGroupInfoItem.
+    """
+
+    num_groups = len(group_info_list)
+
+    if not num_top_groups or num_groups <= num_top_groups:
+        return list(group_info_list)
+
+    values = np.fromiter((float(key(item)) for item in group_info_list),
+                         dtype=np.float64, count=num_groups)
+
+    # Selection in linear time, the order of the top groups is up to the chart.
+    top_indices = np.argpartition(-values, num_top_groups - 1)[:num_top_groups]
+
+    is_other = np.ones(num_groups, dtype=bool)
+    is_other[top_indices] = False
+
+    top_items = [group_info_list[i] for i in np.sort(top_indices)]
+    other_items = [group_info_list[i] for i in np.flatnonzero(is_other)]
+
+    others = AggregatedGroupInfoItem(OTHERS_GROUP_NAME,
+                                     sum(item.size for item in other_items),
+                                     sum(item.quota for item in other_items),
+                                     sum(item.files for item in other_items),
+                                     len(other_items))
+
+    logging.debug("Aggregated %d groups into '%s' item"
+                  % (len(other_items), OTHERS_GROUP_NAME))
+
+    return top_items + [others]
+
+def quota_used_ratio(group_info_item):
+
+    if group_info_item.quota and group_info_item.size:
+        return group_info_item.size / group_info_item.quota
+
+    return 0
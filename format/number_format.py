@@ -8,9 +8,11 @@
 # the terms of the GNU General Public Licence version 3 (GPL Version 3),
 # copied verbatim in the file "LICENCE".
 
-from numbers import Number
+from numbers import Number, Integral
 from decimal import Decimal
 
+import numpy as np
+
 PIB_DIVISIOR = Decimal(1125899906842624.0)
 TIB_DIVISIOR = Decimal(1099511627776.0)
 GIB_DIVISIOR = Decimal(1073741824.0)
@@ -18,6 +20,12 @@ MIB_DIVISIOR = Decimal(1048576.0)
 KIB_DIVISIOR = Decimal(1024.0)
 B_DIVISIOR = Decimal(1.0)
 
+BASE_2_UNITS = ['B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB']
+
+# Lower bounds of the units above as integers for exact unit selection.
+BASE_2_UNIT_BOUNDS = np.array([1 << (10 * i) for i in range(len(BASE_2_UNITS))],
+                              dtype=np.int64)
+
 def number_to_base_2(number):
 
     if not isinstance(number, Number):
@@ -60,3 +68,136 @@ def number_to_base_2(number):
                 number))
 
     return result
+
+def _integral_value(number):
+    """
+    Returns the number as int if it is integral and formatted
+    the same way as number_to_base_2 does, otherwise None.
+    """
+
+    if type(number) is int:
+        return number
+
+    if isinstance(number, Decimal):
+
+        if not number.is_finite():
+            return None
+
+        value = int(number)
+
+        if value != number:
+            return None
+
+        # Bytes are printed with the exponent of the Decimal, e.g. '1E+2B'.
+        if value < 1024 and number.as_tuple().exponent != 0:
+            return None
+
+        return value
+
+    if isinstance(number, Integral) and not isinstance(number, bool):
+        return int(number)
+
+    return None
+
+def _format_base_2(value):
+
+    if value < 1:
+        raise ValueError(
+            "Failed to format number to a supported byte unit: %s" % str(value))
+
+    unit = (value.bit_length() - 1) // 10
+
+    if unit > 5:
+        unit = 5
+
+    if not unit:
+        return "%dB" % value
+
+    divisor = 1 << (10 * unit)
+
+    # value / divisor in hundredths rounded half to even like Decimal does.
+    hundredths, remainder = divmod(value * 100, divisor)
+
+    remainder <<= 1
+
+    if remainder > divisor or (remainder == divisor and hundredths & 1):
+        hundredths += 1
+
+    integer, fraction = divmod(hundredths, 100)
+
+    return "%d.%02d%s" % (integer, fraction, BASE_2_UNITS[unit])
+
+def number_to_base_2_fast(number):
+    """
+    Same output as number_to_base_2, but integral numbers are formatted by
+    integer arithmetic with the unit selected by the bit length.
+    Other numbers fall back to number_to_base_2.
+    """
+
+    if type(number) is int:
+        return _format_base_2(number)
+
+    if not isinstance(number, Number):
+        raise TypeError("Provided value is not a number: %s" % str(number))
+
+    value = _integral_value(number)
+
+    if value is None:
+        return number_to_base_2(number)
+
+    return _format_base_2(value)
+
+def numbers_to_base_2(numbers):
+    """
+    Formats a sequence of byte counts to strings with the same output
+    as number_to_base_2. Units and rounding are computed in one
+    vectorized pass on integer arrays.
+    :param numbers: Sequence or numpy array of numbers.
+    :return: A list of formatted strings.
+    """
+
+    if isinstance(numbers, np.ndarray) and numbers.dtype.kind == 'i':
+        values = numbers.astype(np.int64)
+    else:
+
+        if isinstance(numbers, np.ndarray):
+            numbers = numbers.tolist()
+
+        integral_values = [_integral_value(number) for number in numbers]
+
+        # Not integral or out of int64 range: Format each number on its own.
+        if None in integral_values or \
+                any(value >= (1 << 63) for value in integral_values):
+            return [number_to_base_2_fast(number) for number in numbers]
+
+        values = np.array(integral_values, dtype=np.int64)
+
+    if not len(values):
+        return list()
+
+    if np.any(values < 1):
+        raise ValueError(
+            "Failed to format number to a supported byte unit: %s"
+                % str(values[values < 1][0]))
+
+    units = np.searchsorted(BASE_2_UNIT_BOUNDS, values, side='right') - 1
+
+    divisors = BASE_2_UNIT_BOUNDS[units]
+
+    # Split the division to avoid an overflow of value * 100 in int64.
+    quotients, remainders = np.divmod(values, divisors)
+    fractions, fraction_remainders = np.divmod(remainders * 100, divisors)
+
+    hundredths = quotients * 100 + fractions
+
+    round_up = (2 * fraction_remainders > divisors) | \
+        ((2 * fraction_remainders == divisors) & (hundredths % 2 == 1))
+
+    hundredths += round_up
+
+    # Bytes are printed without decimal places.
+    hundredths[units == 0] = values[units == 0] * 100
+
+    return ["%d%s" % (h // 100, BASE_2_UNITS[u]) if not u else
+            "%d.%02d%s" % (h // 100, h % 100, BASE_2_UNITS[u])
+            for h, u in zip(hundredths.tolist(), units.tolist())]
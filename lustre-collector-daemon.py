@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import functools
+import logging
+import argparse
+import asyncio
+import signal
+import json
+import time
+import sys
+import os
+
+from database.connection_pool import ConnectionPool
+from dataset.lfs_quota_collector import LfsQuotaCollector
+from utils.collector_daemon import CollectorDaemon, CollectorJob, GroupCache, \
+    lock_pid_file, read_status_file
+from utils.flight_recorder import FlightRecorder
+
+import database.disk_space_usage_collect as dsuc
+import database.group_quota_collect as gqc
+import dataset.lfs_dataset_handler as ldh
+
+GROUP_QUOTA_JOB = 'group_quota'
+DISK_SPACE_USAGE_JOB = 'disk_space_usage'
+
+def collect_group_quota(config, pool, group_cache):
+
+    fs = config.get('lustre', 'file_system')
+
+    if config.get('lustre', 'source', fallback='lfs') != 'lfs':
+        raise RuntimeError("Only source lfs is supported by the daemon")
+
+    date_today = time.strftime('%Y-%m-%d')
+
+    recorder = FlightRecorder.from_config(config)
+
+    collector = None
+
+    if config.has_section('collector'):
+        collector = LfsQuotaCollector.from_config(config, recorder)
+
+    try:
+        group_info_list = ldh.create_group_info_list(
+            fs, group_entries=group_cache.entries(), recorder=recorder, collector=collector)
+    finally:
+        if recorder:
+            recorder.close()
+
+    # Several runs a day update the rows of the day.
+    with pool.connection() as conn:
+        gqc.store_group_quota(config, date_today, group_info_list, upsert=True, conn=conn)
+
+    return len(group_info_list)
+
+def collect_disk_space_usage(config, pool):
+
+    fs = config.get('lustre', 'file_system')
+
+    date_today = time.strftime('%Y-%m-%d')
+
+    storage_info_list = list(ldh.create_storage_info(fs).values())
+
+    with pool.connection() as conn:
+        dsuc.store_disk_space_usage(config, date_today, storage_info_list, upsert=True, conn=conn)
+
+    return len(storage_info_list)
+
+def read_job_config(config, name):
+
+    path = config.get(name, 'config')
+
+    if not os.path.isfile(path):
+        raise IOError("The config file of job %s does not exist or is not a file: %s"
+            % (name, path))
+
+    job_config = configparser.ConfigParser()
+    job_config.read(path)
+
+    return job_config
+
+def create_jobs(config):
+    """
+    :return: A list of CollectorJobs and a list of the ConnectionPools to close.
+    """
+
+    jobs = list()
+    pools = list()
+
+    group_cache = GroupCache(config.getint('daemon', 'group_cache_ttl', fallback=3600))
+
+    for name in (GROUP_QUOTA_JOB, DISK_SPACE_USAGE_JOB):
+
+        if not config.has_section(name):
+            continue
+
+        job_config = read_job_config(config, name)
+
+        pool = ConnectionPool.from_config(job_config, size=1)
+        pools.append(pool)
+
+        if name == GROUP_QUOTA_JOB:
+            func = functools.partial(collect_group_quota, job_config, pool, group_cache)
+        else:
+            func = functools.partial(collect_disk_space_usage, job_config, pool)
+
+        jobs.append(CollectorJob(name, func,
+                                 config.getfloat(name, 'interval'),
+                                 config.getfloat(name, 'jitter', fallback=0)))
+
+    return jobs, pools
+
+async def run_daemon(daemon):
+
+    loop = asyncio.get_event_loop()
+
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signal_number, daemon.stop)
+
+    await daemon.run()
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Runs the collectors on intervals.')
+
+    parser.add_argument('-f', '--config-file', dest='config_file', type=str,
+        required=True, help='Path of the config file.')
+
+    parser.add_argument('-s', '--status', dest='status',
+        required=False, action='store_true',
+        help='Prints the status file of a running daemon.')
+
+    parser.add_argument('-D', '--enable-debug', dest='enable_debug',
+        required=False, action='store_true',
+        help='Enables logging of debug messages.')
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.config_file):
+        raise IOError("The config file does not exist or is not a file: %s"
+            % args.config_file)
+
+    logging_level = logging.INFO
+
+    if args.enable_debug:
+        logging_level = logging.DEBUG
+
+    logging.basicConfig(level=logging_level,
+                        format='%(asctime)s - %(levelname)s: %(message)s')
+
+    config = configparser.ConfigParser()
+    config.read(args.config_file)
+
+    status_file = config.get('daemon', 'status_file', fallback=None)
+
+    if args.status:
+
+        if not status_file:
+            raise RuntimeError("No [daemon] status_file configured!")
+
+        status = read_status_file(status_file)
+
+        print(json.dumps(status, indent=2))
+
+        return 0 if status['healthy'] else 1
+
+    pid_file = None
+    pools = list()
+
+    try:
+        logging.info('START')
+
+        pid_path = config.get('daemon', 'pid_file', fallback=None)
+
+        if pid_path:
+            pid_file = lock_pid_file(pid_path)
+
+        jobs, pools = create_jobs(config)
+
+        # asyncio.run() requires Python 3.7.
+        loop = asyncio.new_event_loop()
+
+        try:
+            loop.run_until_complete(run_daemon(CollectorDaemon(jobs, status_file)))
+        finally:
+            loop.close()
+
+        logging.info('END')
+        return 0
+
+    except Exception:
+        logging.exception('Caught exception in main')
+        return 1
+
+    finally:
+
+        for pool in pools:
+            pool.close()
+
+        if pid_file:
+            os.remove(pid_path)
+            pid_file.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,6 +15,8 @@ import time
 import sys
 import os
 
+from utils.instrumentation import export_stages
+
 import database.disk_space_usage_collect as dsuc
 import dataset.lfs_dataset_handler as ldh
 
@@ -65,6 +67,8 @@ def main():
 
     input_data = None
 
+    config = None
+
     try:
         logging.info('START')
 
@@ -103,11 +107,14 @@ def main():
         if args.run_mode == 'collect':
             dsuc.store_disk_space_usage(config, date_today, storage_info_list)
 
+        export_stages(config, 'disk_space_usage_collect', True)
+
         logging.info('END')
         sys.exit(0)
 
     except Exception:
         logging.exception('Caught exception in main')
+        export_stages(config, 'disk_space_usage_collect', False)
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -9,15 +9,57 @@
 # copied verbatim in the file "LICENCE".
 
 import configparser
+import datetime
 import logging
 import argparse
 import time
 import sys
 import os
 
+from dataset.collect_journal import CollectJournal
+from dataset.collect_shard import parse_shard, select_shard_entries, \
+    write_shard_file, merge_shard_files
+from dataset.collect_scheduler import CollectScheduler, merge_group_info_lists
+from dataset.item_handler import CarriedGroupInfoItem
+from dataset.lfs_quota_collector import LfsQuotaCollector
+from dataset.lfsdb_quota_history import QuotaHistoryTable
+from utils.flight_recorder import FlightRecorder, read_records, summarize_records
+from utils.getent_group import get_user_group_entries
+from utils.instrumentation import export_stages
+
 import database.group_quota_collect as gqc
+import database.group_quota_runs as gqr
 import dataset.lfs_dataset_handler as ldh
 
+LFS_SOURCE = 'lfs'
+LCTL_SOURCE = 'lctl'
+
+def read_files(path_list):
+    """
+    :return: The concatenated content of the files or None if path_list is empty.
+    """
+
+    if not path_list:
+        return None
+
+    content_list = list()
+
+    for path in path_list:
+
+        with open(path, 'r') as f:
+            content_list.append(f.read())
+
+    return ''.join(content_list)
+
+def create_quota_history_table(config):
+
+    return QuotaHistoryTable(config.get('mysqld', 'host'),
+                             config.get('mysqld', 'user'),
+                             config.get('mysqld', 'password'),
+                             config.get('history', 'database'),
+                             config.get('history', 'table'),
+                             config.getboolean('history', 'compact', fallback=False))
+
 def main():
 
     # Default run-mode: collect
@@ -33,8 +75,24 @@ def main():
 
     parser.add_argument('-m', '--run-mode', dest='run_mode', type=str,
         default=RUN_MODE, required=False,
-        help="Specifies the run mode: 'print' or 'collect' - Default: %s" %
-            RUN_MODE)
+        help="Specifies the run mode: 'print', 'collect', 'merge' of the shard "
+             "files or 'summary' of the lfs quota latencies - Default: %s" % RUN_MODE)
+
+    parser.add_argument('--summary-runs', dest='summary_runs', type=int,
+        default=10, required=False,
+        help='Number of recent runs in the latency summary - Default: 10')
+
+    parser.add_argument('--summary-top', dest='summary_top', type=int,
+        default=20, required=False,
+        help='Number of slowest groups in the latency summary - Default: 20')
+
+    parser.add_argument('--full-sweep', dest='full_sweep',
+        required=False, action='store_true',
+        help='Queries all groups regardless of the [scheduler] section.')
+
+    parser.add_argument('--shard', dest='shard', type=str, required=False,
+        help="Collects the groups of shard index/count, e.g. 0/4, into a shard "
+             "file in [shard] dir instead of the database.")
 
     parser.add_argument('-D', '--enable-debug', dest='enable_debug',
         required=False, action='store_true',
@@ -44,6 +102,10 @@ def main():
         required=False, action='store_true',
         help='Creates the group quota history table.')
 
+    parser.add_argument('--convert-from', dest='convert_from', type=str,
+        required=False,
+        help='Fills the compact history table with the runs of a daily history table.')
+
     args = parser.parse_args()
 
     if not os.path.isfile(args.config_file):
@@ -58,9 +120,11 @@ def main():
     logging.basicConfig(level=logging_level,
                         format='%(asctime)s - %(levelname)s: %(message)s')
 
-    if not (args.run_mode == 'print' or args.run_mode == 'collect'):
+    if args.run_mode not in ('print', 'collect', 'merge', 'summary'):
         raise RuntimeError("Invalid run mode: %s" % args.run_mode)
 
+    config = None
+
     try:
         logging.info('START')
 
@@ -75,33 +139,182 @@ def main():
             logging.info('END')
             sys.exit(0)
 
+        if args.convert_from:
+
+            if not config.getboolean('history', 'compact', fallback=False):
+                raise RuntimeError("Converting requires [history] compact = on")
+
+            gqr.convert_group_quota_history(config, args.convert_from)
+            logging.info('END')
+            sys.exit(0)
+
+        if args.run_mode == 'summary':
+
+            records = read_records(config.get('flight_recorder', 'path'))
+
+            for line in summarize_records(records, args.summary_runs, args.summary_top):
+                print(line)
+
+            logging.info('END')
+            sys.exit(0)
+
         fs = config.get('lustre', 'file_system')
 
+        if args.run_mode == 'merge':
+
+            group_info_list, shard_paths = merge_shard_files(
+                config.get('shard', 'dir'), date_today, fs, get_user_group_entries())
+
+            gqc.store_group_quota(config, date_today, group_info_list,
+                                  config.has_section('scheduler'))
+
+            for path in shard_paths:
+                os.remove(path)
+
+            export_stages(config, 'group_quota_collect', True)
+
+            logging.info('END')
+            sys.exit(0)
+
+        shard = parse_shard(args.shard) if args.shard else None
+
         group_info_list = None
+        journal = None
+        writer = None
+
+        source = config.get('lustre', 'source', fallback=LFS_SOURCE)
+
+        if source not in (LFS_SOURCE, LCTL_SOURCE):
+            raise RuntimeError("Invalid source: %s" % source)
+
+        if shard and (args.input_file or source != LFS_SOURCE):
+            raise RuntimeError("Sharding requires source lfs without an input file")
 
         if args.input_file:
             group_info_list = ldh.create_group_info_list(fs, args.input_file)
+
+        elif source == LCTL_SOURCE:
+
+            acct_data = read_files(config.get('lustre', 'acct_files', fallback='').split())
+            glb_data = read_files(config.get('lustre', 'glb_files', fallback='').split())
+
+            group_info_list = ldh.create_group_info_list_from_acct(
+                config.get('lustre', 'fs_name'),
+                acct_data=acct_data, glb_data=glb_data)
+
         else:
-            group_info_list = ldh.create_group_info_list(fs)
+
+            recorder = FlightRecorder.from_config(config)
+
+            collector = None
+
+            if config.has_section('collector'):
+                collector = LfsQuotaCollector.from_config(config, recorder)
+
+            group_entries = get_user_group_entries()
+
+            if shard:
+                group_entries = select_shard_entries(group_entries, *shard)
+
+            schedule = None
+
+            if config.has_section('scheduler'):
+
+                scheduler = CollectScheduler.from_config(config)
+
+                date = datetime.date.today()
+
+                history = create_quota_history_table(config).get_group_info_history(
+                    scheduler.history_start_date(date), date - datetime.timedelta(days=1))
+
+                schedule = scheduler.create_schedule(
+                    group_entries, history, date, args.full_sweep)
+
+            query_entries = schedule.query_entries if schedule else group_entries
+
+            journal = CollectJournal.from_config(config, date_today, fs)
+
+            # Shards collected on the same node keep separate journals.
+            if journal and shard:
+                journal.path += ".%d-of-%d" % shard
+
+            # Streams the groups to the database while collecting,
+            # compact storage needs all groups of the date at once.
+            if args.run_mode == 'collect' and not shard and \
+                    config.getboolean('history', 'stream', fallback=False) and \
+                    not config.getboolean('history', 'compact', fallback=False):
+
+                writer = gqc.GroupQuotaWriter.from_config(
+                    config, date_today, config.has_section('scheduler'))
+                writer.start()
+
+            try:
+
+                if writer:
+
+                    if schedule:
+                        writer.put_all(schedule.carried_items)
+
+                    ldh.collect_group_info_items(fs, writer.put_all, query_entries,
+                                                 recorder, collector, journal)
+
+                else:
+                    group_info_list = ldh.create_group_info_list(
+                        fs, group_entries=query_entries,
+                        recorder=recorder, collector=collector, journal=journal)
+
+            except Exception:
+
+                if writer:
+                    writer.close(commit=False)
+
+                raise
+
+            finally:
+                if recorder:
+                    recorder.close()
+                if journal:
+                    journal.close()
+
+            if writer:
+                writer.close()
+
+            elif schedule:
+                group_info_list = merge_group_info_lists(
+                    group_entries, group_info_list, schedule.carried_items)
 
         if args.run_mode == 'print':
 
             for group_info in group_info_list:
 
-                logging.info("Group: %s - Used: %s - Quota: %s - Files: %s" \
+                logging.info("Group: %s - Used: %s - Quota: %s - Files: %s%s" \
                     % (group_info.name,
                        group_info.size,
                        group_info.quota,
-                       group_info.files))
+                       group_info.files,
+                       " - Carried from: %s" % group_info.collected_date
+                           if isinstance(group_info, CarriedGroupInfoItem) else ''))
+
+        if args.run_mode == 'collect' and shard:
+            write_shard_file(config.get('shard', 'dir'), date_today, fs, *shard,
+                             group_entries, group_info_list)
+
+        elif args.run_mode == 'collect' and not writer:
+            gqc.store_group_quota(config, date_today, group_info_list,
+                                  config.has_section('scheduler'))
+
+        # The journal is kept until the collected groups are stored.
+        if journal:
+            journal.remove()
 
-        if args.run_mode == 'collect':
-            gqc.store_group_quota(config, date_today, group_info_list)
+        export_stages(config, 'group_quota_collect', True)
 
         logging.info('END')
         sys.exit(0)
 
     except Exception:
         logging.exception('Caught exception in main')
+        export_stages(config, 'group_quota_collect', False)
         sys.exit(1)
 
 if __name__ == '__main__':
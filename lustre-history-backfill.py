@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import logging
+import argparse
+import sys
+import os
+
+from utils.getent_group import get_user_group_entries
+from utils.instrumentation import export_stages
+
+import database.history_backfill as hb
+
+def main():
+
+    RUN_MODE = 'import'
+
+    parser = argparse.ArgumentParser(
+        description='Imports archived lfs quota or lfs df outputs into the history table.')
+
+    parser.add_argument('-f', '--config-file', dest='config_file', type=str,
+        required=True,
+        help='Path of the config file of the collect script of the dump kind.')
+
+    parser.add_argument('-k', '--kind', dest='kind', type=str, required=True,
+        choices=(hb.QUOTA_KIND, hb.DF_KIND),
+        help="Kind of the dumps: 'quota' for lfs quota or 'df' for lfs df outputs.")
+
+    parser.add_argument('-m', '--run-mode', dest='run_mode', type=str,
+        default=RUN_MODE, required=False,
+        help="Specifies the run mode: 'import' or 'check' to parse the dumps "
+             "only - Default: %s" % RUN_MODE)
+
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, required=False,
+        help='Number of parsing processes - Default: number of CPUs')
+
+    parser.add_argument('--chunk-size', dest='chunk_size', type=int,
+        default=1000, required=False,
+        help='Rows per INSERT - Default: 1000')
+
+    parser.add_argument('--date-regex', dest='date_regex', type=str,
+        default=hb.DATE_REGEX, required=False,
+        help="Regex of year, month and day in the file names - Default: %s"
+            % hb.DATE_REGEX.replace('%', '%%'))
+
+    parser.add_argument('--map-gids', dest='map_gids',
+        required=False, action='store_true',
+        help='Maps the gids of dumps queried by gid to the current group names of getent.')
+
+    parser.add_argument('--report-file', dest='report_file', type=str, required=False,
+        help='Writes the result of each file as JSON lines.')
+
+    parser.add_argument('-D', '--enable-debug', dest='enable_debug',
+        required=False, action='store_true',
+        help='Enables logging of debug messages.')
+
+    parser.add_argument('paths', nargs='+',
+        help='Dump files, directories or glob patterns, the file names contain the date.')
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.config_file):
+        raise IOError("The config file does not exist or is not a file: %s"
+            % args.config_file)
+
+    logging_level = logging.INFO
+
+    if args.enable_debug:
+        logging_level = logging.DEBUG
+
+    logging.basicConfig(level=logging_level,
+                        format='%(asctime)s - %(levelname)s: %(message)s')
+
+    if args.run_mode not in ('import', 'check'):
+        raise RuntimeError("Invalid run mode: %s" % args.run_mode)
+
+    config = None
+
+    try:
+        logging.info('START')
+
+        config = configparser.ConfigParser()
+        config.read(args.config_file)
+
+        dump_files = hb.find_dump_files(args.paths)
+
+        gid_names = dict(get_user_group_entries()) if args.map_gids else None
+
+        stats = hb.backfill(config, args.kind, dump_files,
+                            store=args.run_mode == 'import',
+                            jobs=args.jobs,
+                            chunk_size=args.chunk_size,
+                            date_regex=args.date_regex,
+                            gid_names=gid_names,
+                            report_file=args.report_file)
+
+        export_stages(config, 'history_backfill', not stats.failed_files)
+
+        logging.info('END')
+
+        if stats.failed_files:
+            return 1
+
+        return 0
+
+    except Exception:
+        logging.exception('Caught exception in main')
+        export_stages(config, 'history_backfill', False)
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,100 +14,9 @@ import argparse
 import logging
 import os
 
-import dateutil.relativedelta
-
-from chart.trend_chart import TrendChart
-from dataset.lfsdb_quota_history import QuotaHistoryTable
+from report.monthly_report import run_monthly_reports
 from utils.matplotlib_ import check_matplotlib_version
-from utils.rsync_ import transfer_report
-from utils.pandas_ import create_data_frame_weekly
-from utils.getent_group import get_user_groups
-
-import dataset.item_handler as ih
-
-def create_usage_trend_chart(local_mode,
-                             fs_long_name,
-                             chart_dir,
-                             start_date,
-                             end_date,
-                             threshold,
-                             usage_trend_chart,
-                             quota_history_table):
-
-    if local_mode:
-        item_list = ih.create_dummy_group_date_values(8, 1000)
-
-    else:
-
-        groups = get_user_groups()
-
-        filtered_groups = \
-            quota_history_table.filter_groups_at_threshold(start_date,
-                                                           end_date,
-                                                           threshold,
-                                                           groups)
-
-        item_list = \
-            quota_history_table.get_time_series_group_sizes(
-                start_date,
-                end_date,
-                filtered_groups)
-
-    group_item_dict = ih.create_group_date_value_item_dict(item_list)
-
-    data_frame = create_data_frame_weekly(group_item_dict)
-
-    title = "Top Groups Usage Trend on %s" % fs_long_name
-
-    chart_path = chart_dir + os.path.sep + usage_trend_chart
-
-    chart = TrendChart(title,
-                       data_frame,
-                       chart_path,
-                       'Time (Weeks)',
-                       'Disk Space Used (TiB)')
-
-    chart.create()
-
-    return chart_path
-
-def create_quota_trend_chart(local_mode,
-                             fs_long_name,
-                             chart_dir,
-                             start_date,
-                             end_date,
-                             quota_trend_chart,
-                             quota_history_table):
-
-    if local_mode:
-        item_list = ih.create_dummy_group_date_values(50, 200)
-
-    else:
-
-        groups = get_user_groups()
-
-        item_list = \
-            quota_history_table.get_time_series_group_quota_usage(start_date,
-                                                                  end_date,
-                                                                  groups)
-
-    group_item_dict = ih.create_group_date_value_item_dict(item_list)
-
-    data_frame = create_data_frame_weekly(group_item_dict)
-
-    title = "Group Quota Trend on %s" % fs_long_name
-
-    chart_path = chart_dir + os.path.sep + quota_trend_chart
-
-    chart = TrendChart(title,
-                       data_frame,
-                       chart_path,
-                       'Time (Weeks)',
-                       'Quota Used (%)')
-
-    chart.create()
-
-    return chart_path
+from utils.instrumentation import export_stages
 
 def main():
 
@@ -139,6 +48,8 @@ def main():
     logging.basicConfig(
         level=logging_level, format='%(asctime)s - %(levelname)s: %(message)s')
 
+    config = None
+
     try:
 
         logging.info('START')
@@ -154,67 +65,9 @@ def main():
         config = configparser.ConfigParser(interpolation=None)
         config.read(args.config_file)
 
-        transfer_mode = config.get('transfer', 'mode')
-
-        chart_dir = config.get('base_chart', 'report_dir')
-        fs_long_name = config.get('storage', 'fs_long_name')
-
-        date_format = config.get("time_series_chart", "date_format")
-        prev_months = config.getint("time_series_chart", "prev_months")
-
-        usage_trend_chart = config.get('usage_trend_chart', 'filename')
-        threshold = config.get('usage_trend_chart', 'threshold')
-
-        quota_trend_chart = config.get('quota_trend_chart', 'filename')
-
-        quota_history_table = \
-            QuotaHistoryTable(config.get('mysqld', 'host'),
-                              config.get('mysqld', 'user'),
-                              config.get('mysqld', 'passwd'),
-                              config.get('mysqld', 'db'),
-                              config.get('report', 'history_table'))
-
-        if prev_months <= 0:
-            raise RuntimeError( \
-                "Config parameter 'prev_months' must be greater than 0!")
-
-        prev_date = date_now - \
-            dateutil.relativedelta.relativedelta(months = prev_months)
-
-        start_date = prev_date.strftime(date_format)
-        end_date = date_now.strftime(date_format)
-
-        logging.debug("Time series start date: %s" % start_date)
-
-        chart_path_list = list()
-
-        chart_path = create_usage_trend_chart(local_mode,
-                                              fs_long_name,
-                                              chart_dir,
-                                              start_date,
-                                              end_date,
-                                              threshold,
-                                              usage_trend_chart,
-                                              quota_history_table)
-
-        logging.debug("Created chart: %s" % chart_path)
-        chart_path_list.append(chart_path)
-
-        chart_path = create_quota_trend_chart(local_mode,
-                                              fs_long_name,
-                                              chart_dir,
-                                              start_date,
-                                              end_date,
-                                              quota_trend_chart,
-                                              quota_history_table)
-
-        logging.debug("Created chart: %s" % chart_path)
-        chart_path_list.append(chart_path)
-
-        if transfer_mode == 'on':
+        run_monthly_reports(config, local_mode, date_now)
 
-            for chart_path in chart_path_list:
-                transfer_report('monthly', date_now, chart_path, config)
+        export_stages(config, 'monthly_reports', True)
 
         logging.info('END')
 
@@ -222,6 +75,7 @@ def main():
 
     except Exception:
         logging.exception('Caught exception in main')
+        export_stages(config, 'monthly_reports', False)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import datetime
+import argparse
+import logging
+import sys
+import os
+
+from report.report_runner import REPORT_NAMES, due_reports, run_reports
+from utils.instrumentation import export_stages
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Lustre Report Generator.')
+
+    parser.add_argument('-f', '--config-file', dest='config_file',
+        type=str, required=True,
+        help='Path of the config file referencing the report config files.')
+
+    parser.add_argument('-D', '--enable-debug', dest='enable_debug',
+        required=False, action='store_true',
+        help='Enables logging of debug messages.')
+
+    parser.add_argument('-L', '--enable-local_mode', dest='enable_local_mode',
+        required=False, action='store_true',
+        help='Enables local_mode program execution.')
+
+    parser.add_argument('-i', '--input-file', dest='input_file',
+        type=str, required=False,
+        help='Path of the lfs df input file for the weekly report.')
+
+    parser.add_argument('--force', dest='force',
+        required=False, action='store_true',
+        help="Runs all configured reports in mode 'all', not only the due ones.")
+
+    parser.add_argument('report', choices=REPORT_NAMES + ['all'],
+        help="Report to create, 'all' creates all reports due today.")
+
+    args = parser.parse_args()
+
+    if not args.enable_local_mode and args.input_file:
+        raise RuntimeError("Local mode must be enabled to provide an input file.")
+
+    if args.input_file and not os.path.isfile(args.input_file):
+        raise IOError("The input file does not exist or is not a file: %s" % args.input_file)
+
+    if not os.path.isfile(args.config_file):
+        raise IOError("The config file does not exist or is not a file: %s" % args.config_file)
+
+    logging_level = logging.INFO
+
+    if args.enable_debug:
+        logging_level = logging.DEBUG
+
+    logging.basicConfig(
+        level=logging_level, format='%(asctime)s - %(levelname)s: %(message)s')
+
+    config = None
+
+    try:
+
+        logging.info('START')
+
+        date_now = datetime.datetime.now()
+
+        logging.debug("Local mode enabled: %s" % args.enable_local_mode)
+
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(args.config_file)
+
+        if args.report != 'all':
+            names = [args.report]
+        elif args.force:
+            names = [name for name in REPORT_NAMES if config.has_section(name)]
+        else:
+            names = due_reports(config, date_now)
+
+        logging.info("Reports to run: %s" % ', '.join(names))
+
+        failed_list = run_reports(config, names, args.enable_local_mode,
+                                  date_now, args.input_file)
+
+        export_stages(config, 'reports', not failed_list)
+
+        logging.info('END')
+
+        if failed_list:
+            return 1
+
+        return 0
+
+    except Exception:
+        logging.exception('Caught exception in main')
+        export_stages(config, 'reports', False)
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
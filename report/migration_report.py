@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+from decimal import Decimal
+
+import logging
+import os
+
+from chart.chart_backend import get_chart_class, get_backend, \
+    configure_svg_output, MATPLOTLIB_BACKEND
+from dataset.lfs_snapshot import LfsSnapshot
+from utils.instrumentation import stage
+from utils.rsync_ import transfer_reports
+
+import dataset.item_handler as ih
+import filter.group_filter_handler as gf
+
+def read_file_systems(config):
+    """
+    Reads the file systems of [storage] file_system_1, file_system_2, ...
+    :return: A list of (file_system, file_system_name) tuples.
+    """
+
+    file_systems = list()
+
+    index = 1
+
+    while config.has_option('storage', "file_system_%d" % index):
+
+        file_systems.append(
+            (config.get('storage', "file_system_%d" % index),
+             config.get('storage', "file_system_name_%d" % index)))
+
+        index += 1
+
+    if len(file_systems) < 2:
+        raise RuntimeError("At least two file systems must be set in section storage!")
+
+    return file_systems
+
+def create_group_files_migration_info_list(group_names, group_info_lists, files_threshold):
+    """
+    Joins the file counts of the groups on each file system by exact group name.
+    :param group_info_lists: A GroupInfoItem list per file system.
+    :return: GroupFilesMigrationInfoItems of the groups exceeding files_threshold
+             on any file system.
+    """
+
+    files_dicts = list()
+
+    for group_info_list in group_info_lists:
+
+        files_dicts.append({group_info_item.name: group_info_item.files
+                            for group_info_item in gf.filter_group_info_items(group_info_list)})
+
+    migration_info_list = list()
+
+    for group_name in group_names:
+
+        file_counts = [files_dict.get(group_name, Decimal(0)) for files_dict in files_dicts]
+
+        if max(file_counts) > files_threshold:
+
+            logging.debug("Append GroupFilesMigrationInfoItem(%s, %s)"
+                          % (group_name, ', '.join(str(count) for count in file_counts)))
+
+            migration_info_list.append(
+                ih.GroupFilesMigrationInfoItem(group_name, *file_counts))
+
+    return migration_info_list
+
+# TODO: Remove config parameter...
+def create_report(local_mode, chart_dir, file_systems, fs_names, config,
+                  chart_backend=MATPLOTLIB_BACKEND, snapshot=None):
+    """
+    :param file_systems: Paths of the file systems to compare.
+    :param fs_names: Display names in the order of file_systems.
+    """
+
+    reports_path_list = list()
+    group_info_list = list()
+
+    if local_mode:
+
+        group_info_list = ih.create_dummy_group_files_migration_info_list()
+
+        # The dummy dataset holds two file systems.
+        fs_names = fs_names[:2]
+
+    else:
+
+        if snapshot is None:
+            snapshot = LfsSnapshot()
+
+        files_threshold = int(config.get(
+            'group_files_migration_bar_chart', 'files_threshold'))
+
+        group_info_lists = snapshot.group_info_lists(file_systems)
+
+        group_info_list = create_group_files_migration_info_list(
+            snapshot.group_names(),
+            [group_info_lists[file_system] for file_system in file_systems],
+            files_threshold)
+
+    # GROUP-FILES-MIGRATION-BAR-CHART
+    title = "Group Files Migration Lustre Nyx and Hebe"
+
+    chart_path = chart_dir + os.path.sep + config.get( \
+        'group_files_migration_bar_chart', 'filename')
+
+    GroupFilesMigrationBarChart = \
+        get_chart_class(chart_backend, 'GroupFilesMigrationBarChart')
+
+    chart = GroupFilesMigrationBarChart(title, group_info_list, chart_path, *fs_names)
+
+    with stage('render_group_files_migration_bar_chart') as span:
+        chart.create()
+        span.items = len(group_info_list)
+
+    logging.debug("Created chart: %s" % chart_path)
+    reports_path_list.append(chart_path)
+
+    return reports_path_list
+
+def run_migration_report(config, local_mode, date_now, snapshot=None):
+    """
+    Creates and transfers the migration report configured in config.
+    :param snapshot: LfsSnapshot shared with other reports (optional).
+    """
+
+    chart_backend = get_backend(config)
+
+    if chart_backend == MATPLOTLIB_BACKEND:
+        configure_svg_output(config)
+
+    transfer_mode = config.get('execution', 'transfer')
+
+    chart_dir = config.get('base_chart', 'report_dir')
+
+    file_systems = read_file_systems(config)
+
+    chart_path_list = create_report(local_mode, chart_dir,
+                                    [file_system for file_system, _ in file_systems],
+                                    [fs_name for _, fs_name in file_systems],
+                                    config, chart_backend, snapshot)
+
+    if transfer_mode == 'on':
+        transfer_reports('weekly', date_now, chart_path_list, config)
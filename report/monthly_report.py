@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import logging
+import os
+
+import dateutil.relativedelta
+
+from chart.trend_chart import TrendChart
+from chart.trend_chart_batch import TrendChartBatch
+from chart.chart_backend import configure_svg_output
+from dataset.lfsdb_quota_history import QuotaHistoryTable
+from dataset.lfs_snapshot import LfsSnapshot
+from utils.instrumentation import stage
+from utils.rsync_ import TransferPipeline
+from utils.pandas_ import create_data_frame_weekly
+
+import dataset.item_handler as ih
+
+def create_usage_trend_chart(local_mode,
+                             fs_long_name,
+                             chart_dir,
+                             start_date,
+                             end_date,
+                             threshold,
+                             usage_trend_chart,
+                             quota_history_table,
+                             max_points=0,
+                             snapshot=None):
+
+    if local_mode:
+        item_list = ih.create_dummy_group_date_values(8, 1000)
+
+    else:
+
+        if snapshot is None:
+            snapshot = LfsSnapshot()
+
+        groups = snapshot.group_names()
+
+        filtered_groups = \
+            quota_history_table.filter_groups_at_threshold(start_date,
+                                                           end_date,
+                                                           threshold,
+                                                           groups)
+
+        item_list = \
+            quota_history_table.get_time_series_group_sizes(
+                start_date,
+                end_date,
+                filtered_groups)
+
+    group_item_dict = ih.create_group_date_value_item_dict(item_list)
+
+    data_frame = create_data_frame_weekly(group_item_dict)
+
+    title = "Top Groups Usage Trend on %s" % fs_long_name
+
+    chart_path = chart_dir + os.path.sep + usage_trend_chart
+
+    chart = TrendChart(title,
+                       data_frame,
+                       chart_path,
+                       'Time (Weeks)',
+                       'Disk Space Used (TiB)',
+                       max_points)
+
+    with stage('render_usage_trend_chart') as span:
+        chart.create()
+        span.items = data_frame.size
+
+    return chart_path
+
+def create_quota_trend_chart(local_mode,
+                             fs_long_name,
+                             chart_dir,
+                             start_date,
+                             end_date,
+                             quota_trend_chart,
+                             quota_history_table,
+                             max_points=0,
+                             snapshot=None):
+
+    if local_mode:
+        item_list = ih.create_dummy_group_date_values(50, 200)
+
+    else:
+
+        if snapshot is None:
+            snapshot = LfsSnapshot()
+
+        groups = snapshot.group_names()
+
+        item_list = \
+            quota_history_table.get_time_series_group_quota_usage(start_date,
+                                                                  end_date,
+                                                                  groups)
+
+    group_item_dict = ih.create_group_date_value_item_dict(item_list)
+
+    data_frame = create_data_frame_weekly(group_item_dict)
+
+    title = "Group Quota Trend on %s" % fs_long_name
+
+    chart_path = chart_dir + os.path.sep + quota_trend_chart
+
+    chart = TrendChart(title,
+                       data_frame,
+                       chart_path,
+                       'Time (Weeks)',
+                       'Quota Used (%)',
+                       max_points)
+
+    with stage('render_quota_trend_chart') as span:
+        chart.create()
+        span.items = data_frame.size
+
+    return chart_path
+
+def create_group_quota_trend_charts(local_mode,
+                                    fs_long_name,
+                                    chart_dir,
+                                    start_date,
+                                    end_date,
+                                    filename,
+                                    processes,
+                                    quota_history_table,
+                                    max_points=0,
+                                    transfer_pipeline=None,
+                                    snapshot=None):
+
+    if local_mode:
+        item_list = ih.create_dummy_group_date_values(50, 200)
+
+    else:
+
+        if snapshot is None:
+            snapshot = LfsSnapshot()
+
+        groups = snapshot.group_names()
+
+        item_list = \
+            quota_history_table.get_time_series_group_quota_usage(start_date,
+                                                                  end_date,
+                                                                  groups)
+
+    group_item_dict = ih.create_group_date_value_item_dict(item_list)
+
+    data_frame = create_data_frame_weekly(group_item_dict)
+
+    title = "Quota Trend of Group %s" + " on %s" % fs_long_name
+
+    batch = TrendChartBatch(title,
+                            data_frame,
+                            chart_dir,
+                            filename,
+                            'Time (Weeks)',
+                            'Quota Used (%)',
+                            max_points,
+                            processes)
+
+    chart_callback = None
+
+    if transfer_pipeline:
+        chart_callback = transfer_pipeline.put_all
+
+    with stage('render_group_quota_trend_charts') as span:
+        chart_path_list = batch.create(chart_callback)
+        span.items = len(chart_path_list)
+
+    return chart_path_list
+
+def run_monthly_reports(config, local_mode, date_now, snapshot=None):
+    """
+    Creates and transfers the monthly reports configured in config.
+    :param snapshot: LfsSnapshot shared with other reports (optional).
+    """
+
+    if snapshot is None:
+        snapshot = LfsSnapshot()
+
+    configure_svg_output(config)
+
+    transfer_mode = config.get('transfer', 'mode')
+
+    chart_dir = config.get('base_chart', 'report_dir')
+    fs_long_name = config.get('storage', 'fs_long_name')
+
+    date_format = config.get("time_series_chart", "date_format")
+    prev_months = config.getint("time_series_chart", "prev_months")
+    max_points = \
+        config.getint("time_series_chart", "max_points", fallback=0)
+
+    usage_trend_chart = config.get('usage_trend_chart', 'filename')
+    threshold = config.get('usage_trend_chart', 'threshold')
+
+    quota_trend_chart = config.get('quota_trend_chart', 'filename')
+
+    quota_history_table = \
+        QuotaHistoryTable(config.get('mysqld', 'host'),
+                          config.get('mysqld', 'user'),
+                          config.get('mysqld', 'passwd'),
+                          config.get('mysqld', 'db'),
+                          config.get('report', 'history_table'),
+                          config.getboolean('report', 'history_compact', fallback=False))
+
+    if prev_months <= 0:
+        raise RuntimeError( \
+            "Config parameter 'prev_months' must be greater than 0!")
+
+    prev_date = date_now - \
+        dateutil.relativedelta.relativedelta(months = prev_months)
+
+    start_date = prev_date.strftime(date_format)
+    end_date = date_now.strftime(date_format)
+
+    logging.debug("Time series start date: %s" % start_date)
+
+    transfer_pipeline = None
+
+    if transfer_mode == 'on':
+
+        transfer_pipeline = TransferPipeline(
+            'monthly', date_now, config,
+            config.getint('transfer', 'retries', fallback=3),
+            config.getfloat('transfer', 'retry_delay', fallback=5.0))
+
+        transfer_pipeline.start()
+
+    try:
+
+        chart_path = create_usage_trend_chart(local_mode,
+                                              fs_long_name,
+                                              chart_dir,
+                                              start_date,
+                                              end_date,
+                                              threshold,
+                                              usage_trend_chart,
+                                              quota_history_table,
+                                              max_points,
+                                              snapshot)
+
+        logging.debug("Created chart: %s" % chart_path)
+
+        if transfer_pipeline:
+            transfer_pipeline.put(chart_path)
+
+        chart_path = create_quota_trend_chart(local_mode,
+                                              fs_long_name,
+                                              chart_dir,
+                                              start_date,
+                                              end_date,
+                                              quota_trend_chart,
+                                              quota_history_table,
+                                              max_points,
+                                              snapshot)
+
+        logging.debug("Created chart: %s" % chart_path)
+
+        if transfer_pipeline:
+            transfer_pipeline.put(chart_path)
+
+        if config.get('group_trend_chart', 'mode', fallback='off') == 'on':
+
+            group_chart_path_list = create_group_quota_trend_charts(
+                local_mode,
+                fs_long_name,
+                config.get('group_trend_chart', 'report_dir'),
+                start_date,
+                end_date,
+                config.get('group_trend_chart', 'filename'),
+                config.getint('group_trend_chart', 'processes', fallback=1),
+                quota_history_table,
+                max_points,
+                transfer_pipeline,
+                snapshot)
+
+            logging.debug("Created group charts: %d" % len(group_chart_path_list))
+
+    finally:
+        if transfer_pipeline:
+            transfer_pipeline.close()
+
+    if transfer_pipeline:
+        transfer_pipeline.check()
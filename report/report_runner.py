@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import logging
+import os
+
+from chart.chart_backend import get_backend, MATPLOTLIB_BACKEND
+from dataset.lfs_snapshot import LfsSnapshot
+from report.weekly_report import run_weekly_reports
+from report.monthly_report import run_monthly_reports
+from report.migration_report import run_migration_report
+from utils.matplotlib_ import check_matplotlib_version
+
+WEEKLY_REPORT = 'weekly'
+MONTHLY_REPORT = 'monthly'
+MIGRATION_REPORT = 'migration'
+
+REPORT_NAMES = [WEEKLY_REPORT, MONTHLY_REPORT, MIGRATION_REPORT]
+
+
+def read_report_config(runner_config, name):
+    """
+    Reads the config file of a report referenced in the runner config.
+    The monthly config holds '%s' placeholders, so it is read without interpolation.
+    """
+
+    config_file = runner_config.get(name, 'config')
+
+    if not os.path.isfile(config_file):
+        raise IOError("The config file does not exist or is not a file: %s"
+                      % config_file)
+
+    if name == MONTHLY_REPORT:
+        config = configparser.ConfigParser(interpolation=None)
+    else:
+        config = configparser.ConfigParser()
+
+    config.read(config_file)
+
+    return config
+
+def is_due(runner_config, name, date):
+    """
+    Checks if a report is due at date: weekly and migration reports on the
+    configured weekday (0 = Monday), monthly reports on the configured day.
+    """
+
+    if not runner_config.has_section(name):
+        return False
+
+    if name == MONTHLY_REPORT:
+        return date.day == runner_config.getint(name, 'day', fallback=1)
+
+    return date.weekday() == runner_config.getint(name, 'weekday', fallback=0)
+
+def due_reports(runner_config, date):
+    return [name for name in REPORT_NAMES if is_due(runner_config, name, date)]
+
+def run_reports(runner_config, names, local_mode, date_now, input_file=None):
+    """
+    Runs the given reports in order in this process. All reports share one
+    LfsSnapshot, so the user groups, group quotas and total size of a file
+    system are collected only once.
+    :return: A list of the names of failed reports.
+    """
+
+    snapshot = LfsSnapshot(input_file)
+
+    config_dict = dict()
+
+    for name in names:
+        config_dict[name] = read_report_config(runner_config, name)
+
+    if any(name == MONTHLY_REPORT
+           or get_backend(config_dict[name]) == MATPLOTLIB_BACKEND
+           for name in names):
+        check_matplotlib_version()
+
+    failed_list = list()
+
+    for name in names:
+
+        logging.info("Running %s report" % name)
+
+        try:
+
+            if name == WEEKLY_REPORT:
+                run_weekly_reports(
+                    config_dict[name], local_mode, date_now, input_file, snapshot)
+
+            elif name == MONTHLY_REPORT:
+                run_monthly_reports(
+                    config_dict[name], local_mode, date_now, snapshot)
+
+            elif name == MIGRATION_REPORT:
+                run_migration_report(
+                    config_dict[name], local_mode, date_now, snapshot)
+
+            else:
+                raise RuntimeError("Unknown report: %s" % name)
+
+        except Exception:
+            logging.exception("Failed %s report" % name)
+            failed_list.append(name)
+
+    return failed_list
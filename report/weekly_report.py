@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+from decimal import Decimal
+
+import logging
+import os
+
+from chart.chart_backend import get_chart_class, get_backend, \
+    configure_svg_output, MATPLOTLIB_BACKEND
+from chart.chart_pages import create_chart_pages
+from dataset.lfs_snapshot import LfsSnapshot
+from utils.instrumentation import stage
+from utils.rsync_ import TransferPipeline
+
+import dataset.item_handler as ih
+import filter.group_filter_handler as gf
+
+LFS_SNAPSHOT_SOURCE = 'lfs'
+DATABASE_SNAPSHOT_SOURCE = 'database'
+
+def create_weekly_reports(local_mode,
+                          chart_dir,
+                          file_system,
+                          fs_long_name,
+                          quota_pct_bar_chart,
+                          usage_quota_bar_chart,
+                          usage_pie_chart,
+                          num_top_groups,
+                          storage_multiplier,
+                          input_file=None,
+                          chart_backend=MATPLOTLIB_BACKEND,
+                          quota_pct_top_groups=0,
+                          quota_pct_bars_per_page=0,
+                          usage_quota_top_groups=0,
+                          usage_quota_bars_per_page=0,
+                          transfer_pipeline=None,
+                          snapshot=None):
+
+    reports_path_list = list()
+
+    group_info_list = None
+    storage_total_size = 0
+
+    if snapshot is None:
+        snapshot = LfsSnapshot(input_file)
+
+    if local_mode:
+
+        group_info_list = ih.create_dummy_group_info_list()
+
+        if snapshot.input_file:
+            storage_total_size = snapshot.total_size(file_system) * Decimal(storage_multiplier)
+        else:
+            storage_total_size = 18458963071860736 * Decimal(storage_multiplier)
+
+    else:
+
+        group_info_list = gf.filter_group_info_items(snapshot.group_info_list(file_system))
+
+        storage_total_size = snapshot.total_size(file_system) * Decimal(storage_multiplier)
+
+    QuotaPctBarChart = get_chart_class(chart_backend, 'QuotaPctBarChart')
+    UsageQuotaBarChart = get_chart_class(chart_backend, 'UsageQuotaBarChart')
+    UsagePieChart = get_chart_class(chart_backend, 'UsagePieChart')
+
+    # QUOTA-PCT-BAR-CHART
+    title = "Group Quota Usage on %s" % fs_long_name
+    chart_path = chart_dir + os.path.sep + quota_pct_bar_chart
+
+    dataset = gf.top_group_info_items(
+        group_info_list, quota_pct_top_groups, gf.quota_used_ratio)
+
+    with stage('render_quota_pct_bar_chart') as span:
+
+        chart_path_list = create_chart_pages(
+            QuotaPctBarChart, title, dataset, chart_path, quota_pct_bars_per_page,
+            sort_key=lambda group_info: group_info.name)
+
+        span.items = len(dataset)
+
+    logging.debug("Created charts: %s" % chart_path_list)
+    reports_path_list.extend(chart_path_list)
+
+    if transfer_pipeline:
+        transfer_pipeline.put_all(chart_path_list)
+
+    # USAGE-QUOTA-BAR-CHART
+    title = "Quota and Disk Space Usage on %s" % fs_long_name
+    chart_path = chart_dir + os.path.sep + usage_quota_bar_chart
+
+    dataset = gf.top_group_info_items(
+        group_info_list, usage_quota_top_groups,
+        lambda group_info: group_info.quota)
+
+    with stage('render_usage_quota_bar_chart') as span:
+
+        chart_path_list = create_chart_pages(
+            UsageQuotaBarChart, title, dataset, chart_path, usage_quota_bars_per_page,
+            sort_key=lambda group_info: group_info.quota, reverse=True)
+
+        span.items = len(dataset)
+
+    logging.debug("Created charts: %s" % chart_path_list)
+    reports_path_list.extend(chart_path_list)
+
+    if transfer_pipeline:
+        transfer_pipeline.put_all(chart_path_list)
+
+    # USAGE-PIE-CHART
+    title = "Storage Usage on %s" % fs_long_name
+    chart_path = chart_dir + os.path.sep + usage_pie_chart
+    chart = UsagePieChart(title,
+                          group_info_list,
+                          chart_path,
+                          storage_total_size,
+                          num_top_groups)
+
+    with stage('render_usage_pie_chart') as span:
+        chart.create()
+        span.items = len(group_info_list)
+
+    logging.debug("Created chart: %s" % chart_path)
+    reports_path_list.append(chart_path)
+
+    if transfer_pipeline:
+        transfer_pipeline.put(chart_path)
+
+    return reports_path_list
+
+def run_weekly_reports(config, local_mode, date_now, input_file=None, snapshot=None):
+    """
+    Creates and transfers the weekly reports configured in config.
+    :param snapshot: LfsSnapshot shared with other reports (optional),
+                     not used if the database snapshot source is configured.
+    """
+
+    chart_backend = get_backend(config)
+
+    if chart_backend == MATPLOTLIB_BACKEND:
+        configure_svg_output(config)
+
+    transfer_mode = config.get('transfer', 'mode')
+
+    chart_dir = config.get('base_chart', 'report_dir')
+
+    file_system = config.get('storage', 'file_system')
+    fs_long_name = config.get('storage', 'fs_long_name')
+
+    quota_pct_bar_chart = config.get('quota_pct_bar_chart', 'filename')
+    usage_quota_bar_chart = config.get('usage_quota_bar_chart', 'filename')
+    usage_pie_chart = config.get('usage_pie_chart', 'filename')
+
+    num_top_groups = config.getint('usage_pie_chart', 'num_top_groups')
+
+    quota_pct_top_groups = config.getint(
+        'quota_pct_bar_chart', 'num_top_groups', fallback=0)
+    quota_pct_bars_per_page = config.getint(
+        'quota_pct_bar_chart', 'bars_per_page', fallback=0)
+
+    usage_quota_top_groups = config.getint(
+        'usage_quota_bar_chart', 'num_top_groups', fallback=0)
+    usage_quota_bars_per_page = config.getint(
+        'usage_quota_bar_chart', 'bars_per_page', fallback=0)
+    mul = config.getfloat('usage_pie_chart', 'storage_multiplier')
+
+    snapshot_source = \
+        config.get('snapshot', 'source', fallback=LFS_SNAPSHOT_SOURCE)
+
+    if snapshot_source not in (LFS_SNAPSHOT_SOURCE, DATABASE_SNAPSHOT_SOURCE):
+        raise RuntimeError("Unknown snapshot source: %s" % snapshot_source)
+
+    if snapshot_source == DATABASE_SNAPSHOT_SOURCE and not local_mode:
+
+        # Imported on demand, only this source requires MySQLdb.
+        from dataset.lfsdb_snapshot import DatabaseSnapshot
+
+        snapshot = DatabaseSnapshot.from_config(config)
+
+    transfer_pipeline = None
+
+    if transfer_mode == 'on':
+
+        transfer_pipeline = TransferPipeline(
+            'weekly', date_now, config,
+            config.getint('transfer', 'retries', fallback=3),
+            config.getfloat('transfer', 'retry_delay', fallback=5.0))
+
+        transfer_pipeline.start()
+
+    try:
+
+        create_weekly_reports(local_mode,
+                              chart_dir,
+                              file_system,
+                              fs_long_name,
+                              quota_pct_bar_chart,
+                              usage_quota_bar_chart,
+                              usage_pie_chart,
+                              num_top_groups,
+                              mul,
+                              input_file,
+                              chart_backend,
+                              quota_pct_top_groups,
+                              quota_pct_bars_per_page,
+                              usage_quota_top_groups,
+                              usage_quota_bars_per_page,
+                              transfer_pipeline,
+                              snapshot)
+
+    finally:
+        if transfer_pipeline:
+            transfer_pipeline.close()
+
+    if transfer_pipeline:
+        transfer_pipeline.check()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import subprocess
+import threading
+import unittest
+import time
+
+from unittest import mock
+
+from dataset.lfs_quota_collector import LfsQuotaCollector
+from utils.adaptive_limiter import AdaptiveLimiter
+
+class TestAdaptiveLimiter(unittest.TestCase):
+
+    def test_additive_increase(self):
+
+        limiter = AdaptiveLimiter(1, 4, target_latency=1.0)
+
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(0.1)
+
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(4, limiter.max_limit_reached)
+
+    def test_multiplicative_decrease_once_per_window(self):
+
+        limiter = AdaptiveLimiter(1, 16, target_latency=10.0, initial_concurrency=16)
+
+        # A burst of slow calls within the target latency cuts the limit once.
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(20.0)
+
+        self.assertEqual(8, limiter.limit)
+        self.assertEqual(1, limiter.num_decreases)
+
+    def test_min_concurrency(self):
+
+        limiter = AdaptiveLimiter(2, 8, target_latency=0.0)
+
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(1.0, overloaded=True)
+
+        self.assertEqual(2, limiter.limit)
+
+    def test_invalid_range(self):
+
+        with self.assertRaises(RuntimeError):
+            AdaptiveLimiter(4, 2)
+
+        with self.assertRaises(RuntimeError):
+            AdaptiveLimiter(1, 2, decrease_factor=1.0)
+
+    def test_from_config_defaults(self):
+
+        config = configparser.ConfigParser()
+        config.read_dict({'collector': {}})
+
+        self.assertEqual(AdaptiveLimiter().max_concurrency,
+                         AdaptiveLimiter.from_config(config).max_concurrency)
+
+    def test_rate_cap(self):
+
+        limiter = AdaptiveLimiter(4, 4, max_rate=50)
+
+        start_time = time.monotonic()
+
+        for _ in range(11):
+            limiter.acquire()
+            limiter.release(0.0)
+
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.19)
+
+    def test_concurrency_bound(self):
+
+        limiter = AdaptiveLimiter(3, 3)
+
+        lock = threading.Lock()
+        in_flight = [0]
+        max_in_flight = [0]
+
+        def call():
+
+            limiter.acquire()
+
+            with lock:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+
+            time.sleep(0.01)
+
+            with lock:
+                in_flight[0] -= 1
+
+            limiter.release(0.01)
+
+        threads = [threading.Thread(target=call) for _ in range(20)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(3, max_in_flight[0])
+
+
+class TestLfsQuotaCollector(unittest.TestCase):
+
+    def test_collect_in_order_with_retry(self):
+
+        timeouts = {'group3': 1}
+
+        def run_lfs_quota(group_name, file_system, recorder=None, timeout=None):
+
+            if timeouts.get(group_name):
+                timeouts[group_name] -= 1
+                raise subprocess.TimeoutExpired('lfs', timeout)
+
+            return "%s:%s" % (file_system, group_name)
+
+        group_entries = [(1000 + i, "group%d" % i) for i in range(10)]
+
+        collector = LfsQuotaCollector(AdaptiveLimiter(1, 4), timeout=1.0, retries=1)
+
+        with mock.patch('dataset.lfs_dataset_handler.run_lfs_quota', run_lfs_quota):
+            output_list = collector.collect(group_entries, '/lustre')
+
+        self.assertEqual(["/lustre:%s" % name for _, name in group_entries],
+                         output_list)
+        self.assertEqual(1, collector.limiter.num_decreases)
+        self.assertEqual(0, collector.limiter.in_flight)
+
+    def test_callback_outside_limiter(self):
+
+        def run_lfs_quota(group_name, file_system, recorder=None, timeout=None):
+            return group_name
+
+        collector = LfsQuotaCollector(AdaptiveLimiter(1, 4, target_latency=0.01))
+
+        in_flight = list()
+
+        def callback(output):
+            in_flight.append(collector.limiter.in_flight)
+            time.sleep(0.05)
+
+        with mock.patch('dataset.lfs_dataset_handler.run_lfs_quota', run_lfs_quota):
+            collector.collect([(1001, 'group1')], '/lustre', callback)
+
+        # The time of the callback is not measured as lfs latency.
+        self.assertEqual([0], in_flight)
+        self.assertEqual(0, collector.limiter.num_decreases)
+
+    def test_collect_timeout_exhausted(self):
+
+        def run_lfs_quota(group_name, file_system, recorder=None, timeout=None):
+            raise subprocess.TimeoutExpired('lfs', timeout)
+
+        collector = LfsQuotaCollector(AdaptiveLimiter(1, 2), timeout=1.0, retries=2)
+
+        with mock.patch('dataset.lfs_dataset_handler.run_lfs_quota', run_lfs_quota):
+            with self.assertRaises(subprocess.TimeoutExpired):
+                collector.collect([(1001, 'group1')], '/lustre')
+
+if __name__ == '__main__':
+    unittest.main()
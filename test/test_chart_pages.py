@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+
+from chart.chart_pages import create_chart_pages, page_file_path
+from dataset.item_handler import GroupInfoItem, AggregatedGroupInfoItem
+
+class RecordingChart:
+    """Records the charts instead of creating them."""
+
+    charts = list()
+
+    def __init__(self, title, dataset, file_path):
+        self.chart = (title, dataset, file_path)
+
+    def create(self):
+        RecordingChart.charts.append(self.chart)
+
+class TestChartPages(unittest.TestCase):
+
+    def setUp(self):
+
+        RecordingChart.charts = list()
+
+        # The others aggregate has the largest quota, but is put on the last page.
+        self.dataset = [AggregatedGroupInfoItem('others', 0, 100, 0, 3)] + \
+            [GroupInfoItem("group%d" % index, 0, index) for index in range(7)]
+
+    def create(self, items_per_page):
+
+        return create_chart_pages(RecordingChart, 'Quota', self.dataset, '/tmp/chart.svg',
+                                  items_per_page, sort_key=lambda item: item.quota,
+                                  reverse=True)
+
+    def test_page_file_path(self):
+        self.assertEqual('/tmp/chart_2.svg', page_file_path('/tmp/chart.svg', 2))
+
+    def test_pages(self):
+
+        chart_path_list = self.create(items_per_page=3)
+
+        self.assertEqual(['/tmp/chart_1.svg', '/tmp/chart_2.svg', '/tmp/chart_3.svg'],
+                         chart_path_list)
+
+        self.assertEqual(['Quota (1/3)', 'Quota (2/3)', 'Quota (3/3)'],
+                         [title for title, _, _ in RecordingChart.charts])
+
+        pages = [[item.name for item in dataset] for _, dataset, _ in RecordingChart.charts]
+
+        # The pages continue the sort order, the last page is partial.
+        self.assertEqual([['group6', 'group5', 'group4'],
+                          ['group3', 'group2', 'group1'],
+                          ['group0', 'others']], pages)
+
+        self.assertTrue(all(not isinstance(item, AggregatedGroupInfoItem)
+                            for _, dataset, _ in RecordingChart.charts[:-1] for item in dataset))
+
+    def test_single_page(self):
+
+        for items_per_page in (0, len(self.dataset)):
+
+            RecordingChart.charts = list()
+
+            self.assertEqual(['/tmp/chart.svg'], self.create(items_per_page))
+            self.assertEqual([('Quota', self.dataset, '/tmp/chart.svg')], RecordingChart.charts)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import subprocess
+import unittest
+import tempfile
+import os
+
+from unittest import mock
+
+from dataset.collect_journal import CollectJournal
+from dataset.item_handler import GroupInfoItem
+
+import dataset.lfs_dataset_handler as ldh
+
+def lfs_quota_output(group_name, gid):
+
+    return ("Disk quotas for grp %s (gid %d):\n"
+            "     Filesystem  kbytes   quota   limit   grace   files   quota   limit   grace\n"
+            "        /lustre %d  0 0       - 1       0       0       -\n" % (group_name, gid, gid))
+
+class TestCollectJournal(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'collect.journal')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_resume(self):
+
+        journal = CollectJournal(self.path, '2023-05-10', '/lustre')
+
+        self.assertEqual({}, journal.load())
+
+        journal.append([GroupInfoItem('a', 1, 2, 3), GroupInfoItem('b', 4, 5, 6)])
+        journal.close()
+
+        # Line cut off by a crash.
+        with open(self.path, 'a') as f:
+            f.write('{"name": "c", "si')
+
+        journal = CollectJournal(self.path, '2023-05-10', '/lustre')
+
+        group_info_dict = journal.load()
+
+        self.assertEqual(['a', 'b'], sorted(group_info_dict))
+        self.assertEqual(6, group_info_dict['b'].files)
+
+        journal.append([GroupInfoItem('c', 7, 8, 9)])
+        journal.close()
+
+        self.assertEqual(['a', 'b', 'c'],
+            sorted(CollectJournal(self.path, '2023-05-10', '/lustre').load()))
+
+        # Another date starts a new journal.
+        journal = CollectJournal(self.path, '2023-05-11', '/lustre')
+
+        self.assertEqual({}, journal.load())
+
+        journal.remove()
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_create_group_info_list_resumes(self):
+
+        group_entries = [(1000 + index, "group%d" % index) for index in range(10)]
+
+        calls = list()
+        failing = ['group5']
+
+        gids = {group_name: gid for gid, group_name in group_entries}
+
+        def run_lfs_quota(group_name, file_system, recorder=None, timeout=None):
+
+            if group_name in failing:
+                raise subprocess.CalledProcessError(1, 'lfs')
+
+            calls.append(group_name)
+
+            return lfs_quota_output(group_name, gids[group_name])
+
+        with mock.patch.object(ldh, 'check_path_exists'), \
+             mock.patch.object(ldh, 'run_lfs_quota', side_effect=run_lfs_quota):
+
+            journal = CollectJournal(self.path, '2023-05-10', '/lustre')
+
+            with self.assertRaises(subprocess.CalledProcessError):
+                ldh.create_group_info_list('/lustre', group_entries=group_entries, journal=journal)
+
+            journal.close()
+
+            failing.clear()
+            calls.clear()
+
+            journal = CollectJournal(self.path, '2023-05-10', '/lustre')
+
+            group_info_list = ldh.create_group_info_list(
+                '/lustre', group_entries=group_entries, journal=journal)
+
+            journal.close()
+
+        self.assertEqual(["group%d" % index for index in range(5, 10)], calls)
+
+        self.assertEqual([name for _, name in group_entries],
+                         [item.name for item in group_info_list])
+        self.assertEqual([gid * 1024 for gid, _ in group_entries],
+                         [item.size for item in group_info_list])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import datetime
+import unittest
+
+from dataset.collect_scheduler import CollectScheduler, merge_group_info_lists
+from dataset.item_handler import GroupInfoItem, CarriedGroupInfoItem
+
+# Not a full sweep day for a full_sweep_interval of 28.
+DATE = datetime.date(2023, 5, 10)
+
+def create_history(name, values, carried=()):
+    """
+    :param values: (size, quota, files) of the days before DATE, oldest first.
+    """
+
+    num_days = len(values)
+
+    return [(DATE - datetime.timedelta(days=num_days - index),
+             GroupInfoItem(name, *value),
+             index in carried)
+            for index, value in enumerate(values)]
+
+class TestCollectScheduler(unittest.TestCase):
+
+    def setUp(self):
+
+        self.scheduler = CollectScheduler(interval=7, full_sweep_interval=28)
+
+        self.assertFalse(self.scheduler.is_full_sweep(DATE))
+
+    def _cold_name(self):
+        """Returns a group name not due at DATE."""
+
+        for index in range(100):
+
+            name = "group%d" % index
+
+            if not self.scheduler.is_due(name, DATE):
+                return name
+
+    def test_classification(self):
+
+        cold = self._cold_name()
+
+        history = {
+            cold: create_history(cold, [(1000, 0, 10)] * 3),
+            'changed': create_history('changed', [(1000, 0, 10), (1100, 0, 10)]),
+            'files': create_history('files', [(1000, 0, 10), (1000, 0, 20)]),
+            'pressure': create_history('pressure', [(950, 1000, 10)] * 3),
+            'stale': create_history('stale', [(1000, 0, 10)] * 3 + [(1000, 0, 10)] * 7,
+                                    carried=range(3, 10)),
+        }
+
+        group_entries = [(1000 + index, name) for index, name in
+                         enumerate([cold, 'changed', 'files', 'pressure', 'stale', 'new'])]
+
+        schedule = self.scheduler.create_schedule(group_entries, history, DATE)
+
+        self.assertEqual(['changed', 'files', 'pressure', 'stale', 'new'],
+                         [name for _, name in schedule.query_entries])
+
+        self.assertEqual([cold], [item.name for item in schedule.carried_items])
+        self.assertEqual(DATE - datetime.timedelta(days=1),
+                         schedule.carried_items[0].collected_date)
+
+    def test_full_sweep(self):
+
+        cold = self._cold_name()
+
+        history = {cold: create_history(cold, [(1000, 0, 10)] * 3)}
+
+        schedule = self.scheduler.create_schedule([(1001, cold)], history, DATE, True)
+
+        self.assertEqual([(1001, cold)], schedule.query_entries)
+        self.assertTrue(schedule.full_sweep)
+
+    def test_stable_groups_are_spread(self):
+        """Stable groups are due once per interval, spread over the days."""
+
+        names = ["group%d" % index for index in range(1000)]
+
+        counts = [sum(1 for name in names
+                      if self.scheduler.is_due(name, DATE + datetime.timedelta(days=day)))
+                  for day in range(7)]
+
+        self.assertEqual(1000, sum(counts))
+        self.assertLess(max(counts), 1000 / 7 * 1.5)
+
+        history = {name: create_history(name, [(1000, 0, 10)] * 3) for name in names}
+
+        schedule = self.scheduler.create_schedule(list(enumerate(names)), history, DATE)
+
+        self.assertEqual(counts[0], len(schedule.query_entries))
+
+    def test_merge_group_info_lists(self):
+
+        merged = merge_group_info_lists(
+            [(1, 'a'), (2, 'b'), (3, 'c')],
+            [GroupInfoItem('c'), GroupInfoItem('a')],
+            [CarriedGroupInfoItem('b')])
+
+        self.assertEqual(['a', 'b', 'c'], [item.name for item in merged])
+        self.assertIsInstance(merged[1], CarriedGroupInfoItem)
+
+if __name__ == '__main__':
+    unittest.main()
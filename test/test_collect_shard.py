@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import datetime
+import unittest
+import tempfile
+import os
+
+from dataset.collect_shard import parse_shard, select_shard_entries, \
+    write_shard_file, merge_shard_files, shard_file_path
+from dataset.item_handler import GroupInfoItem, CarriedGroupInfoItem
+
+DATE = '2023-05-02'
+FILE_SYSTEM = '/lustre'
+
+GROUP_ENTRIES = [(1000 + index, "group%d" % index) for index in range(50)]
+
+def collect(group_entries):
+    return [GroupInfoItem(name, gid * 1024, 0, gid) for gid, name in group_entries]
+
+class TestCollectShard(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.shard_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_shards(self, count, skip_index=None):
+
+        for index in range(count):
+
+            if index == skip_index:
+                continue
+
+            entries = select_shard_entries(GROUP_ENTRIES, index, count)
+
+            write_shard_file(self.shard_dir, DATE, FILE_SYSTEM, index, count,
+                             entries, collect(entries))
+
+    def test_parse_shard(self):
+
+        self.assertEqual((1, 4), parse_shard('1/4'))
+
+        for shard in ('4/4', '-1/4', '1', 'a/b', '0/0'):
+            with self.assertRaises(RuntimeError):
+                parse_shard(shard)
+
+    def test_partition(self):
+
+        count = 4
+
+        shards = [select_shard_entries(GROUP_ENTRIES, index, count) for index in range(count)]
+
+        self.assertEqual(sorted(GROUP_ENTRIES), sorted(sum(shards, [])))
+        self.assertTrue(all(shards))
+
+        # Deterministic, another node selects the same groups.
+        self.assertEqual(shards[1], select_shard_entries(GROUP_ENTRIES, 1, count))
+
+    def test_merge(self):
+
+        self.write_shards(3)
+
+        group_info_list, paths = merge_shard_files(
+            self.shard_dir, DATE, FILE_SYSTEM, GROUP_ENTRIES)
+
+        self.assertEqual(3, len(paths))
+        self.assertEqual([name for _, name in GROUP_ENTRIES],
+                         [item.name for item in group_info_list])
+        self.assertEqual(1049, group_info_list[-1].files)
+
+    def test_merge_carried_items(self):
+
+        entries = select_shard_entries(GROUP_ENTRIES, 0, 1)
+
+        items = collect(entries)
+        items[0] = CarriedGroupInfoItem(items[0].name, 1, 2, 3, datetime.date(2023, 4, 20))
+
+        write_shard_file(self.shard_dir, DATE, FILE_SYSTEM, 0, 1, entries, items)
+
+        group_info_list, _ = merge_shard_files(self.shard_dir, DATE, FILE_SYSTEM)
+
+        self.assertIsInstance(group_info_list[0], CarriedGroupInfoItem)
+        self.assertEqual(datetime.date(2023, 4, 20), group_info_list[0].collected_date)
+
+    def test_missing_shard(self):
+
+        self.write_shards(3, skip_index=1)
+
+        with self.assertRaisesRegex(RuntimeError, r'Missing shards \[1\]'):
+            merge_shard_files(self.shard_dir, DATE, FILE_SYSTEM)
+
+    def test_incomplete_shard(self):
+
+        entries = select_shard_entries(GROUP_ENTRIES, 0, 1)
+
+        write_shard_file(self.shard_dir, DATE, FILE_SYSTEM, 0, 1, entries, collect(entries[1:]))
+
+        with self.assertRaisesRegex(RuntimeError, 'group0 not collected'):
+            merge_shard_files(self.shard_dir, DATE, FILE_SYSTEM)
+
+    def test_different_counts(self):
+
+        self.write_shards(2)
+        self.write_shards(3)
+
+        with self.assertRaisesRegex(RuntimeError, 'different shard counts'):
+            merge_shard_files(self.shard_dir, DATE, FILE_SYSTEM)
+
+    def test_no_shard_files(self):
+
+        self.write_shards(2)
+
+        self.assertTrue(os.path.isfile(shard_file_path(self.shard_dir, DATE, 1, 2)))
+
+        with self.assertRaises(RuntimeError):
+            merge_shard_files(self.shard_dir, '2023-05-03', FILE_SYSTEM)
+
+if __name__ == '__main__':
+    unittest.main()
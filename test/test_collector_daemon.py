@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+import tempfile
+import asyncio
+import time
+import os
+
+from unittest import mock
+
+from utils.collector_daemon import CollectorDaemon, CollectorJob, GroupCache, \
+    lock_pid_file, read_status_file
+
+def run_loop(coro):
+
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+async def run_for(daemon, seconds):
+
+    task = asyncio.ensure_future(daemon.run())
+
+    await asyncio.sleep(seconds)
+
+    daemon.stop()
+
+    await task
+
+class TestCollectorDaemon(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.status_file = os.path.join(self.temp_dir.name, 'status.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_interval_runs(self):
+
+        job = CollectorJob('fast', lambda: 3, interval=0.1)
+
+        daemon = CollectorDaemon([job], self.status_file)
+
+        run_loop(run_for(daemon, 0.45))
+
+        self.assertIn(job.runs, (4, 5, 6))
+        self.assertEqual(0, job.skipped)
+
+        status = read_status_file(self.status_file)
+
+        self.assertTrue(status['healthy'])
+        self.assertEqual(job.runs, status['jobs']['fast']['runs'])
+        self.assertEqual(3, status['jobs']['fast']['last_items'])
+
+    def test_overlapping_runs_skipped(self):
+
+        running = list()
+        overlaps = list()
+
+        def slow():
+
+            overlaps.append(bool(running))
+            running.append(True)
+            time.sleep(0.25)
+            running.pop()
+
+        job = CollectorJob('slow', slow, interval=0.1)
+
+        run_loop(run_for(CollectorDaemon([job]), 0.55))
+
+        self.assertFalse(any(overlaps))
+        self.assertGreater(job.skipped, 0)
+        self.assertEqual(job.runs, len(overlaps))
+
+    def test_failed_run(self):
+
+        def fail():
+            raise RuntimeError("lfs quota failed")
+
+        job = CollectorJob('failing', fail, interval=0.1)
+        other = CollectorJob('other', lambda: 1, interval=0.1)
+
+        daemon = CollectorDaemon([job, other], self.status_file)
+
+        run_loop(run_for(daemon, 0.05))
+
+        status = read_status_file(self.status_file)
+
+        self.assertFalse(status['healthy'])
+        self.assertEqual(1, status['jobs']['failing']['failures'])
+        self.assertEqual("RuntimeError: lfs quota failed", status['jobs']['failing']['last_error'])
+        self.assertTrue(status['jobs']['other']['last_success'])
+
+    def test_jitter_delay(self):
+
+        job = CollectorJob('jittered', lambda: 0, interval=10, jitter=5)
+
+        with mock.patch('random.uniform', return_value=0.2):
+            run_loop(run_for(CollectorDaemon([job]), 0.1))
+
+        self.assertEqual(0, job.runs)
+
+        with mock.patch('random.uniform', return_value=0.05):
+            run_loop(run_for(CollectorDaemon([job]), 0.15))
+
+        self.assertEqual(1, job.runs)
+
+    def test_invalid_jitter(self):
+
+        with self.assertRaises(RuntimeError):
+            CollectorJob('job', lambda: 0, interval=60, jitter=60)
+
+    def test_pid_file_lock(self):
+
+        path = os.path.join(self.temp_dir.name, 'daemon.pid')
+
+        pid_file = lock_pid_file(path)
+
+        with self.assertRaises(RuntimeError):
+            lock_pid_file(path)
+
+        pid_file.close()
+
+        lock_pid_file(path).close()
+
+    def test_group_cache(self):
+
+        cache = GroupCache(ttl=3600)
+
+        with mock.patch('utils.collector_daemon.get_user_group_entries',
+                        return_value=[(1000, 'group1')]) as getent:
+
+            cache.entries()
+            cache.entries()
+
+            self.assertEqual(1, getent.call_count)
+
+            cache.ttl = 0
+            cache.entries()
+
+            self.assertEqual(2, getent.call_count)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+import tempfile
+import os
+
+from utils.flight_recorder import FlightRecorder, read_records, summarize_records
+
+class TestFlightRecorder(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'latency.log')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _record_run(self, run_id, max_bytes=1048576, backup_count=5):
+
+        recorder = FlightRecorder(self.path, max_bytes, backup_count, run_id)
+
+        for i in range(1, 101):
+            recorder.record('/lustre', "group%d" % i, i / 100.0, int(i == 50), i * 10)
+
+        recorder.close()
+
+    def test_record_and_read(self):
+
+        self._record_run('run1')
+        self._record_run('run2')
+
+        records = read_records(self.path)
+
+        self.assertEqual(200, len(records))
+        self.assertEqual(['run1', 'run2'], sorted(set(record.run_id for record in records)))
+
+        record = records[0]
+
+        self.assertEqual(('/lustre', 'group1', 0.01, 0, 10),
+            (record.file_system, record.group, record.latency,
+             record.exit_status, record.output_size))
+
+        lines = summarize_records(records, num_runs=1, num_top=3)
+
+        self.assertTrue(lines[1].startswith('run2 '))
+        self.assertIn(' 100 ', lines[1])
+
+        self.assertTrue(lines[-3].startswith('group100 '))
+        self.assertTrue(lines[-1].startswith('group98 '))
+
+    def test_rotation(self):
+
+        for run in range(5):
+            self._record_run("run%d" % run, max_bytes=4096, backup_count=2)
+
+        self.assertTrue(os.path.isfile(self.path + '.2'))
+        self.assertFalse(os.path.isfile(self.path + '.3'))
+
+        records = read_records(self.path)
+
+        # Oldest records are rotated out, the order is kept.
+        self.assertLess(len(records), 500)
+        self.assertEqual('run4', records[-1].run_id)
+        self.assertEqual(sorted(records, key=lambda record: record.time), records)
+
+    def test_malformed_lines(self):
+
+        with open(self.path, 'w') as f:
+            f.write("1.0\trun\t/lustre\tgroup1\t0.5\t0\t100\n")
+            f.write("1.0\trun\t/lustre\tgroup2\t0.5\n")
+
+        self.assertEqual(['group1'], [record.group for record in read_records(self.path)])
+
+        self.assertEqual(['No records found.'], summarize_records([]))
+
+if __name__ == '__main__':
+    unittest.main()
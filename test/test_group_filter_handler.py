@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+
+from dataset.item_handler import AggregatedGroupInfoItem
+
+import dataset.item_handler as ih
+import filter.group_filter_handler as gf
+
+class TestTopGroupInfoItems(unittest.TestCase):
+
+    def test_top_groups_with_others(self):
+
+        group_info_list = ih.create_dummy_group_info_list()
+
+        items = gf.top_group_info_items(
+            group_info_list, 5, lambda group_info: group_info.quota)
+
+        self.assertEqual(len(items), 6)
+
+        self.assertEqual(sorted(item.name for item in items[:5]),
+                         ['group1', 'group2', 'group3', 'group4', 'group6'])
+
+        others = items[-1]
+
+        self.assertIsInstance(others, AggregatedGroupInfoItem)
+        self.assertEqual(others.name, gf.OTHERS_GROUP_NAME)
+        self.assertEqual(others.num_groups, 15)
+
+        self.assertEqual(sum(item.size for item in items),
+                         sum(item.size for item in group_info_list))
+        self.assertEqual(sum(item.quota for item in items),
+                         sum(item.quota for item in group_info_list))
+
+    def test_all_groups_kept(self):
+
+        group_info_list = ih.create_dummy_group_info_list()
+
+        for num_top_groups in (0, 20, 30):
+
+            items = gf.top_group_info_items(
+                group_info_list, num_top_groups, gf.quota_used_ratio)
+
+            self.assertEqual(items, group_info_list)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,7 +12,13 @@ import unittest
 import configparser
 import MySQLdb
 
-from database.group_quota_collect import create_group_quota_history_table
+from unittest import mock
+
+from database.group_quota_collect import create_group_quota_history_table, \
+    create_insert_sql, store_group_quota, GroupQuotaWriter
+from dataset.item_handler import GroupInfoItem, CarriedGroupInfoItem
+
+import database.group_quota_collect as gqc
 
 class TestDatabaseMethods(unittest.TestCase):
 
@@ -22,5 +28,84 @@ class TestDatabaseMethods(unittest.TestCase):
         with self.assertRaises(MySQLdb.OperationalError) as cm:
             create_group_quota_history_table(config)
 
+    def test_create_insert_sql(self):
+
+        sql = create_insert_sql('T', '2023-05-10',
+                                [GroupInfoItem('a', 1, 2, 3), CarriedGroupInfoItem('b', 4, 5, 6)],
+                                carried_column=True, upsert=True)
+
+        self.assertEqual("INSERT INTO T (date, gid, used, quota, files, carried) VALUES"
+                         "('2023-05-10', 'a', 1, 2, 3, 0), ('2023-05-10', 'b', 4, 5, 6, 1)"
+                         " ON DUPLICATE KEY UPDATE used=VALUES(used), quota=VALUES(quota),"
+                         " files=VALUES(files), carried=VALUES(carried)", sql)
+
+    def test_store_unchanged_upsert(self):
+
+        config = configparser.ConfigParser()
+        config.read('Configuration/lustre-group-quota-collect.conf.example')
+
+        conn = mock.MagicMock()
+
+        # A repeated run with unchanged values stores no rows.
+        conn.cursor.return_value.rowcount = 0
+
+        group_info_list = [GroupInfoItem('a', 1, 2, 3)]
+
+        store_group_quota(config, '2023-05-10', group_info_list, upsert=True, conn=conn)
+
+        with self.assertRaises(RuntimeError):
+            store_group_quota(config, '2023-05-10', group_info_list, conn=conn)
+
+    def _create_writer(self, chunk_size):
+
+        config = configparser.ConfigParser()
+        config.read('Configuration/lustre-group-quota-collect.conf.example')
+
+        return GroupQuotaWriter(config, '2023-05-10', chunk_size, queue_size=2)
+
+    def test_group_quota_writer(self):
+
+        conn = mock.MagicMock()
+        cur = conn.cursor.return_value
+
+        with mock.patch.object(gqc.MySQLdb, 'connect', return_value=conn, create=True):
+
+            writer = self._create_writer(chunk_size=4)
+            writer.start()
+
+            for index in range(10):
+                writer.put_all([GroupInfoItem("group%d" % index, index)])
+
+            writer.close()
+
+        # Chunks of 4, 4 and 2 rows committed at once.
+        self.assertEqual(3, cur.execute.call_count)
+        self.assertEqual(10, writer.num_rows)
+
+        conn.autocommit.assert_called_once_with(False)
+        conn.commit.assert_called_once_with()
+        conn.rollback.assert_not_called()
+
+    def test_group_quota_writer_error(self):
+
+        conn = mock.MagicMock()
+        conn.cursor.return_value.execute.side_effect = MySQLdb.OperationalError('gone away')
+
+        with mock.patch.object(gqc.MySQLdb, 'connect', return_value=conn, create=True):
+
+            writer = self._create_writer(chunk_size=1)
+            writer.start()
+
+            # The full queue must not block after the error.
+            with self.assertRaises(RuntimeError):
+                for index in range(10):
+                    writer.put_all([GroupInfoItem("group%d" % index, index)])
+
+            with self.assertRaises(RuntimeError):
+                writer.close()
+
+        conn.commit.assert_not_called()
+        conn.rollback.assert_called_once_with()
+
 if __name__ == '__main__':
     unittest.main()
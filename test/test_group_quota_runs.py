@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import datetime
+import unittest
+import sqlite3
+
+from unittest import mock
+
+from database.group_quota_runs import create_group_quota_runs, store_group_quota_runs
+from dataset.item_handler import GroupInfoItem, CarriedGroupInfoItem
+from dataset.lfsdb_quota_history import QuotaHistoryTable, expand_runs
+
+def day(number):
+    return datetime.date(2023, 5, number)
+
+class SqliteCursor:
+    """Returns the gid column as bytes like MySQLdb."""
+
+    def __init__(self, cur):
+        self._cur = cur
+
+    def execute(self, sql):
+        self._sql = sql
+        self._cur.execute(sql)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+
+        rows = self._cur.fetchall()
+
+        if self._sql.startswith('SELECT gid'):
+            rows = [(row[0].encode(),) + tuple(row[1:]) for row in rows]
+
+        return rows
+
+    def close(self):
+        self._cur.close()
+
+class SqliteConnection:
+
+    def __init__(self):
+
+        self._conn = sqlite3.connect(':memory:')
+        self._conn.execute("CREATE TABLE RUNS (gid TEXT, start_date TEXT, end_date TEXT, "
+                           "used INTEGER, quota INTEGER, files INTEGER, carried INTEGER, "
+                           "PRIMARY KEY (gid, start_date))")
+
+    def cursor(self):
+        return SqliteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def runs(self):
+        return self._conn.execute(
+            "SELECT gid, start_date, end_date, used, files, carried FROM RUNS "
+            "ORDER BY gid, start_date").fetchall()
+
+class TestGroupQuotaRuns(unittest.TestCase):
+
+    def setUp(self):
+
+        self.config = configparser.ConfigParser()
+        self.config.read_dict({'history': {'table': 'RUNS', 'compact': 'on'}})
+
+        self.conn = SqliteConnection()
+
+    def store(self, date, items, carried_column=False):
+        store_group_quota_runs(self.config, date, items, carried_column, self.conn)
+
+    def test_create_group_quota_runs(self):
+
+        rows = [('a', day(1), 10, 0, 1, 0), ('b', day(1), 20, 0, 2, 0),
+                ('a', day(2), 10, 0, 1, 0), ('b', day(2), 21, 0, 2, 0),
+                ('a', day(3), 10, 0, 1, 0),
+                ('a', day(4), 10, 0, 1, 0), ('b', day(4), 21, 0, 2, 0)]
+
+        runs = create_group_quota_runs(rows)
+
+        # b is not collected on day 3, its run ends on day 2.
+        self.assertEqual([('a', day(1), day(4), 10, 0, 1, 0),
+                          ('b', day(1), day(1), 20, 0, 2, 0),
+                          ('b', day(2), day(2), 21, 0, 2, 0),
+                          ('b', day(4), day(4), 21, 0, 2, 0)], runs)
+
+        self.assertEqual(sorted(rows), sorted(expand_runs(runs, day(1), day(4))))
+
+    def test_store_runs(self):
+
+        self.store('2023-05-01', [GroupInfoItem('a', 10, 0, 1), GroupInfoItem('b', 20, 0, 2)])
+        self.store('2023-05-02', [GroupInfoItem('a', 10, 0, 1), GroupInfoItem('b', 21, 0, 2)])
+        self.store('2023-05-03', [GroupInfoItem('a', 10, 0, 1), GroupInfoItem('b', 21, 0, 2)])
+
+        self.assertEqual([('a', '2023-05-01', '2023-05-03', 10, 1, 0),
+                          ('b', '2023-05-01', '2023-05-01', 20, 2, 0),
+                          ('b', '2023-05-02', '2023-05-03', 21, 2, 0)], self.conn.runs())
+
+        # A repeated collection of the latest date replaces it.
+        self.store('2023-05-03', [GroupInfoItem('a', 11, 0, 1), GroupInfoItem('b', 21, 0, 2)])
+
+        self.assertEqual([('a', '2023-05-01', '2023-05-02', 10, 1, 0),
+                          ('a', '2023-05-03', '2023-05-03', 11, 1, 0),
+                          ('b', '2023-05-01', '2023-05-01', 20, 2, 0),
+                          ('b', '2023-05-02', '2023-05-03', 21, 2, 0)], self.conn.runs())
+
+        with self.assertRaises(RuntimeError):
+            self.store('2023-05-02', [GroupInfoItem('a', 10, 0, 1)])
+
+    def test_store_carried_runs(self):
+
+        self.store('2023-05-01', [GroupInfoItem('a', 10, 0, 1)], True)
+        self.store('2023-05-02', [CarriedGroupInfoItem('a', 10, 0, 1, day(1))], True)
+        self.store('2023-05-03', [CarriedGroupInfoItem('a', 10, 0, 1, day(1))], True)
+
+        self.assertEqual([('a', '2023-05-01', '2023-05-01', 10, 1, 0),
+                          ('a', '2023-05-02', '2023-05-03', 10, 1, 1)], self.conn.runs())
+
+    def test_compact_time_series(self):
+
+        table = QuotaHistoryTable('host', 'user', 'passwd', 'db', 'RUNS', compact=True)
+
+        runs = [(b'a', day(1), day(10), 2), (b'b', day(3), day(4), 0)]
+
+        with mock.patch.object(table, '_fetch_all', return_value=runs) as fetch_all:
+            items = table.get_time_series_group_sizes('2023-05-03', '2023-05-05')
+
+        self.assertIn("start_date <= '2023-05-05' AND end_date >= '2023-05-03'",
+                      fetch_all.call_args[0][0])
+
+        self.assertEqual([('a', day(3), 2), ('a', day(4), 2), ('a', day(5), 2),
+                          ('b', day(3), None), ('b', day(4), None)],
+                         [(item.name, item.date, item.value) for item in items])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import datetime
+import unittest
+import tempfile
+import shutil
+import json
+import re
+import os
+
+from unittest import mock
+
+import database.history_backfill as hb
+
+class TestHistoryBackfill(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dump_dir = self.temp_dir.name
+
+        for day in (1, 2, 3):
+            shutil.copy('Input/lfs_quota.out',
+                        os.path.join(self.dump_dir, "lfs_quota_2019-03-%02d.out" % day))
+
+        with open(os.path.join(self.dump_dir, 'lfs_quota_20190304.out'), 'w') as f:
+            f.write('lfs: no quota data\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_find_dump_files(self):
+
+        self.assertEqual(4, len(hb.find_dump_files([self.dump_dir])))
+
+        dump_files = hb.find_dump_files([os.path.join(self.dump_dir, '*-03-0[12].out'),
+                                         os.path.join(self.dump_dir, 'lfs_quota_2019-03-01.out')])
+
+        self.assertEqual(['lfs_quota_2019-03-01.out', 'lfs_quota_2019-03-02.out'],
+                         [os.path.basename(path) for path in dump_files])
+
+        with self.assertRaises(RuntimeError):
+            hb.find_dump_files([os.path.join(self.dump_dir, '*.missing')])
+
+    def test_parse_dump_date(self):
+
+        pattern = re.compile(hb.DATE_REGEX)
+
+        self.assertEqual(datetime.date(2019, 3, 4),
+                         hb.parse_dump_date('/archive/2020/lfs_quota_20190304.out', pattern))
+
+        with self.assertRaises(RuntimeError):
+            hb.parse_dump_date('lfs_quota.out', pattern)
+
+    def test_parse_dump_file(self):
+
+        result = hb.parse_dump_file(os.path.join(self.dump_dir, 'lfs_quota_2019-03-01.out'),
+                                    hb.QUOTA_KIND)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(datetime.date(2019, 3, 1), result.date)
+        self.assertTrue(result.items)
+
+        result = hb.parse_dump_file('Input/lfs_df.out', hb.DF_KIND, r'(\d{4})(\d{2})(\d{2})')
+
+        self.assertIn('No date', result.error)
+
+    def test_create_upsert_sql_list(self):
+
+        items = hb.parse_dump_file(os.path.join(self.dump_dir, 'lfs_quota_2019-03-01.out'),
+                                   hb.QUOTA_KIND).items
+
+        sql_list = hb.create_upsert_sql_list(hb.QUOTA_KIND, 'QUOTA', '2019-03-01', items, 3)
+
+        self.assertEqual((len(items) + 2) // 3, len(sql_list))
+        self.assertTrue(all('ON DUPLICATE KEY UPDATE' in sql for sql in sql_list))
+
+    def test_backfill(self):
+
+        config = configparser.ConfigParser()
+        config.read_dict({'history': {'table': 'GROUP_QUOTA_HISTORY'}})
+
+        report_file = os.path.join(self.dump_dir, 'report.jsonl')
+
+        conn = mock.MagicMock()
+
+        with mock.patch('database.history_backfill.open_connection') as open_connection:
+
+            open_connection.return_value.__enter__.return_value = conn
+
+            stats = hb.backfill(config, hb.QUOTA_KIND, hb.find_dump_files([self.dump_dir + '/lfs_*']),
+                                jobs=2, chunk_size=2, report_file=report_file)
+
+        self.assertEqual(4, stats.done_files)
+        self.assertEqual(1, stats.failed_files)
+        self.assertEqual(3, conn.commit.call_count)
+
+        with open(report_file, 'r') as f:
+            report = [json.loads(line) for line in f]
+
+        self.assertEqual(4, len(report))
+        self.assertEqual(stats.rows, sum(entry['rows'] for entry in report))
+        self.assertEqual(['No quota data found'],
+                         [entry['error'].split(': ', 1)[1] for entry in report if entry['error']])
+
+    def test_backfill_store_error(self):
+
+        config = configparser.ConfigParser()
+        config.read_dict({'history': {'table': 'GROUP_QUOTA_HISTORY'}})
+
+        report_file = os.path.join(self.dump_dir, 'report.jsonl')
+
+        def execute(sql):
+            if '2019-03-02' in sql:
+                raise RuntimeError('Lost connection')
+
+        conn = mock.MagicMock()
+        conn.cursor.return_value.execute.side_effect = execute
+
+        with mock.patch('database.history_backfill.open_connection') as open_connection:
+
+            open_connection.return_value.__enter__.return_value = conn
+
+            # The failed file is skipped, the others are imported.
+            stats = hb.backfill(config, hb.QUOTA_KIND, hb.find_dump_files([self.dump_dir + '/lfs_*']),
+                                jobs=2, chunk_size=2, report_file=report_file)
+
+        self.assertEqual(4, stats.done_files)
+        self.assertEqual(2, stats.failed_files)
+        self.assertEqual(2, conn.commit.call_count)
+        self.assertEqual(1, conn.rollback.call_count)
+
+        with open(report_file, 'r') as f:
+            report = {os.path.basename(entry['path']): entry for entry in map(json.loads, f)}
+
+        self.assertEqual('RuntimeError: Lost connection', report['lfs_quota_2019-03-02.out']['error'])
+        self.assertEqual(0, report['lfs_quota_2019-03-02.out']['rows'])
+        self.assertEqual(stats.rows, sum(entry['rows'] for entry in report.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import unittest
+import tempfile
+import time
+import os
+
+import utils.instrumentation as instrumentation
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.reset()
+
+    def test_stage(self):
+
+        for items in (3, 4):
+
+            with instrumentation.stage('sleep') as span:
+                time.sleep(0.01)
+                span.items = items
+
+        @instrumentation.timed('busy')
+        def busy():
+            return sum(range(100000))
+
+        self.assertEqual(sum(range(100000)), busy())
+
+        with self.assertRaises(ValueError):
+            with instrumentation.stage('failed'):
+                raise ValueError()
+
+        stages = {stats.name: stats for stats in instrumentation.get_stages()}
+
+        self.assertEqual(['sleep', 'busy', 'failed'], list(stages))
+
+        self.assertEqual(2, stages['sleep'].calls)
+        self.assertEqual(7, stages['sleep'].items)
+        self.assertGreaterEqual(stages['sleep'].wall_time, 0.02)
+        self.assertLess(stages['sleep'].cpu_time, stages['sleep'].wall_time)
+
+        self.assertEqual(1, stages['busy'].calls)
+        self.assertGreater(stages['busy'].peak_rss, 0)
+
+    def test_prometheus_textfile(self):
+
+        with instrumentation.stage('lfs_quota') as span:
+            span.items = 5
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+
+            path = os.path.join(temp_dir, 'weekly.prom')
+
+            config = configparser.ConfigParser()
+            config.read_dict({'instrumentation': {'textfile': path}})
+
+            instrumentation.export_stages(config, 'weekly', True)
+
+            with open(path, 'r') as f:
+                text = f.read()
+
+            self.assertEqual(['weekly.prom'], os.listdir(temp_dir))
+
+        self.assertIn('# TYPE lustre_reports_stage_wall_seconds gauge\n', text)
+        self.assertIn('lustre_reports_stage_items{job="weekly",stage="lfs_quota"} 5.0\n', text)
+        self.assertIn('lustre_reports_last_run_success{job="weekly"} 1\n', text)
+
+        for line in text.splitlines():
+            if not line.startswith('#'):
+                float(line.rsplit(' ', 1)[1])
+
+if __name__ == '__main__':
+    unittest.main()
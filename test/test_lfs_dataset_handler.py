@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import subprocess
+import unittest
+import tempfile
+import time
+import os
+
+from unittest import mock
+
+import dataset.lfs_dataset_handler as ldh
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Input')
+
+def read_input(file_name):
+
+    with open(os.path.join(INPUT_DIR, file_name), 'r') as f:
+        return f.read()
+
+class TestLfsQuota(unittest.TestCase):
+
+    def test_query_by_name(self):
+
+        gids = {'alpha': 1001, 'beta': 1002}
+
+        def popen(args, **kwargs):
+
+            group_name = args[4]
+            gid = gids[group_name]
+
+            proc = mock.MagicMock(returncode=0)
+            proc.__enter__.return_value = proc
+            proc.communicate.return_value = (
+                ("Disk quotas for grp %s (gid %s):\n"
+                 "     Filesystem  kbytes   quota   limit   grace   files   quota   limit   grace\n"
+                 "        /lustre %s  0 0       - 7       0       0       -\n" % (group_name, gid, gid)).encode(), None)
+
+            return proc
+
+        with mock.patch.object(ldh, 'check_path_exists'), \
+             mock.patch.object(ldh.subprocess, 'Popen', side_effect=popen) as mocked:
+
+            group_info_list = ldh.create_group_info_list(
+                '/lustre', group_entries=[(1001, 'alpha'), (1002, 'beta')])
+
+        self.assertEqual(['alpha', 'beta'], [call[0][0][4] for call in mocked.call_args_list])
+
+        self.assertEqual(['alpha', 'beta'], [item.name for item in group_info_list])
+        self.assertEqual([1001 * 1024, 1002 * 1024], [item.size for item in group_info_list])
+
+class TestLfsQuotaTimeout(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pid_file = os.path.join(self.temp_dir.name, 'lfs.pid')
+
+        # sudo runs the command, lfs ignores SIGTERM and never finishes.
+        self.write_stub('sudo', '"$@"')
+        self.write_stub('lfs', "trap '' TERM\necho $$ > %s\nwhile :; do sleep 0.1; done"
+                        % self.pid_file)
+
+        self.path = mock.patch.dict(os.environ, {
+            'PATH': self.temp_dir.name + os.pathsep + os.environ['PATH']})
+        self.path.start()
+
+    def tearDown(self):
+        self.path.stop()
+        self.temp_dir.cleanup()
+
+    def write_stub(self, name, script):
+
+        path = os.path.join(self.temp_dir.name, name)
+
+        with open(path, 'w') as f:
+            f.write("#!/bin/sh\n%s\n" % script)
+
+        os.chmod(path, 0o755)
+
+        return path
+
+    def assert_lfs_killed(self):
+
+        with open(self.pid_file, 'r') as f:
+            pid = int(f.read())
+
+        # The kill is delivered asynchronously, an orphaned lfs killed with its
+        # parent may stay a zombie until init reaps it.
+        deadline = time.monotonic() + 5
+
+        while True:
+
+            try:
+                with open('/proc/%d/stat' % pid, 'r') as f:
+                    state = f.read().rsplit(')', 1)[1].split()[0]
+            except FileNotFoundError:
+                return
+
+            if state == 'Z':
+                return
+
+            if time.monotonic() > deadline:
+                self.fail("lfs %d not killed, state: %s" % (pid, state))
+
+            time.sleep(0.05)
+
+    def test_timeout_kills_lfs(self):
+
+        with self.assertRaises(subprocess.TimeoutExpired):
+            ldh.run_lfs_quota('group1', '/lustre', timeout=0.5)
+
+        self.assert_lfs_killed()
+
+    def test_timeout_kills_process_group(self):
+
+        # A timeout command not killing lfs leaves it to the process group kill.
+        timeout_bin = self.write_stub('timeout', 'shift 3\nexec "$@"')
+
+        with mock.patch.object(ldh, 'TIMEOUT_BIN', timeout_bin), \
+             mock.patch.object(ldh, 'KILL_GRACE', 0.5):
+
+            with self.assertRaises(subprocess.TimeoutExpired):
+                ldh.run_lfs_quota('group1', '/lustre', timeout=0.5)
+
+        self.assert_lfs_killed()
+
+class TestLctlQuota(unittest.TestCase):
+
+    def setUp(self):
+
+        self.acct_data = read_input('lctl_acct_group.out')
+        self.glb_data = read_input('lctl_glb_grp.out')
+
+    def test_parse_quota_acct_group(self):
+
+        usage_dict = ldh.parse_quota_acct_group('lustre', self.acct_data)
+
+        # Inodes of the MDTs only, kbytes of all targets.
+        self.assertEqual((480136 + 20000 + 93745113088 + 91234567890, 120034 + 5000),
+                         usage_dict[1001])
+        self.assertEqual((68 + 1048576, 17), usage_dict[1002])
+        self.assertEqual((734003200, 0), usage_dict[1003])
+
+        self.assertEqual({1001: (9999999, 0)},
+                         ldh.parse_quota_acct_group('scratch', self.acct_data))
+
+    def test_parse_quota_glb_group(self):
+
+        quota_dict = ldh.parse_quota_glb_group('lustre', self.glb_data)
+
+        # Pool 'fast' and the inode limits are ignored.
+        self.assertEqual({0: 0, 1001: 214748364800, 1003: 536870912}, quota_dict)
+
+    def test_create_group_info_list_from_acct(self):
+
+        group_entries = [(1003, 'group3'), (1001, 'group1'), (1004, 'group4')]
+
+        group_info_list = ldh.create_group_info_list_from_acct(
+            'lustre', group_entries, self.acct_data, self.glb_data)
+
+        self.assertEqual(['group3', 'group1', 'group4'],
+                         [item.name for item in group_info_list])
+
+        group1 = group_info_list[1]
+
+        self.assertEqual(184980181114 * 1024, group1.size)
+        self.assertEqual(214748364800 * 1024, group1.quota)
+        self.assertEqual(125034, group1.files)
+
+        self.assertEqual((0, 0, 0), (group_info_list[2].size,
+                                     group_info_list[2].quota,
+                                     group_info_list[2].files))
+
+    def test_unknown_file_system(self):
+
+        with self.assertRaises(RuntimeError):
+            ldh.create_group_info_list_from_acct(
+                'other', [(1001, 'group1')], self.acct_data, self.glb_data)
+
+    def test_invalid_parameter(self):
+
+        with self.assertRaises(RuntimeError):
+            ldh.parse_quota_acct_group('lustre', "osd-ldiskfs.lustre-MDT0000.quota_slave.acct_user=\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import subprocess
+import unittest
+import tempfile
+import os
+
+import benchmark.lfs_replay as lr
+
+class TestLfsReplay(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.archive_path = os.path.join(self.temp_dir.name, 'archive')
+        self.stub_dir = os.path.join(self.temp_dir.name, 'stubs')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self, argv):
+
+        env = dict(os.environ)
+        env['PATH'] = self.stub_dir + os.pathsep + env['PATH']
+
+        return subprocess.run(argv, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def test_command_key(self):
+
+        self.assertEqual(lr.command_key(['lfs', 'quota', '-g', 'a', '/lustre']),
+                         lr.command_key(['sudo', '/usr/bin/lfs', 'quota', '-g', 'a', '/lustre']))
+
+        self.assertEqual(lr.command_key(['lfs', 'quota', '-g', 'a', '/lustre']),
+                         lr.command_key(['sudo', 'timeout', '-s', 'KILL', '60',
+                                         'lfs', 'quota', '-g', 'a', '/lustre']))
+
+        self.assertNotEqual(lr.command_key(['lfs', 'quota', '-g', 'a', '/lustre']),
+                            lr.command_key(['lfs', 'quota', '-g', 'ab', '/lustre']))
+
+    def test_record_and_serve(self):
+
+        # Fake real executable printing its arguments.
+        real_path = os.path.join(self.temp_dir.name, 'real_lfs')
+
+        with open(real_path, 'w') as f:
+            f.write("#!/bin/sh\necho \"lfs $*\"\nexit 3\n")
+
+        os.chmod(real_path, 0o755)
+
+        lr.CallArchive(self.archive_path).create('test')
+
+        lr.install_stubs(self.stub_dir, 'record', self.archive_path,
+                         lambda name: real_path if name == 'lfs' else None)
+
+        process = self._run(['lfs', 'quota', '-g', 'a', '/lustre'])
+
+        self.assertEqual(3, process.returncode)
+        self.assertEqual(b'lfs quota -g a /lustre\n', process.stdout)
+
+        lr.install_stubs(self.stub_dir, 'serve', self.archive_path, lambda name: 0)
+
+        process = self._run(['sudo', 'lfs', 'quota', '-g', 'a', '/lustre'])
+
+        self.assertEqual(3, process.returncode)
+        self.assertEqual(b'lfs quota -g a /lustre\n', process.stdout)
+
+        process = self._run(['lfs', 'quota', '-g', 'b', '/lustre'])
+
+        self.assertEqual(1, process.returncode)
+        self.assertIn(b'No recorded call', process.stderr)
+
+    def test_synthesize(self):
+
+        lr.synthesize(self.archive_path, ['/lustre'], 5, 0.01)
+
+        archive = lr.CallArchive(self.archive_path)
+
+        getent = archive.load(['getent', 'group'])
+        self.assertIn('group5:x:1005:', getent['stdout'])
+
+        quota = archive.load(['lfs', 'quota', '-g', 'group3', '/lustre'])
+        self.assertIn('Disk quotas for grp group3', quota['stdout'])
+        self.assertGreater(quota['latency'], 0)
+
+        self.assertEqual(7, len(list(archive.records())))
+
+if __name__ == '__main__':
+    unittest.main()
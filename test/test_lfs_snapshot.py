@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+
+from unittest import mock
+
+from dataset.item_handler import GroupInfoItem
+from dataset.lfs_snapshot import LfsSnapshot
+
+import dataset.lfs_snapshot as lfs_snapshot
+
+class TestLfsSnapshot(unittest.TestCase):
+
+    def test_collect_once(self):
+
+        group_info_list = [GroupInfoItem('a', 1, 2, 3), GroupInfoItem('b', 4, 5, 6)]
+
+        with mock.patch.object(lfs_snapshot, 'get_user_group_entries',
+                               return_value=[(1, 'a'), (2, 'b')]) as get_user_group_entries, \
+             mock.patch.object(lfs_snapshot.ldh, 'create_group_info_list',
+                               return_value=group_info_list) as create_group_info_list, \
+             mock.patch.object(lfs_snapshot.ldh, 'lustre_total_size',
+                               return_value=1024) as lustre_total_size:
+
+            snapshot = LfsSnapshot()
+
+            for _ in range(3):
+
+                result = snapshot.group_info_list('/lustre/a')
+                self.assertEqual(['a', 'b'], [item.name for item in result])
+
+                # Charts sort their dataset in place.
+                result.reverse()
+
+                self.assertEqual(1024, snapshot.total_size('/lustre/a'))
+
+            snapshot.group_info_list('/lustre/b')
+
+        get_user_group_entries.assert_called_once_with()
+        lustre_total_size.assert_called_once_with('/lustre/a', None)
+
+        self.assertEqual(
+            [mock.call('/lustre/a', group_entries=[(1, 'a'), (2, 'b')]),
+             mock.call('/lustre/b', group_entries=[(1, 'a'), (2, 'b')])],
+            create_group_info_list.call_args_list)
+
+    def test_group_info_lists(self):
+
+        def create_group_info_list(file_system, group_entries=None):
+            return [GroupInfoItem("%s%s" % (name, file_system), 1, 2, 3)
+                    for _, name in group_entries]
+
+        with mock.patch.object(lfs_snapshot, 'get_user_group_entries', return_value=[(1, 'a')]), \
+             mock.patch.object(lfs_snapshot.ldh, 'create_group_info_list',
+                               side_effect=create_group_info_list) as mocked:
+
+            snapshot = LfsSnapshot()
+            snapshot.group_info_list('/b')
+
+            result = snapshot.group_info_lists(['/a', '/b', '/c'])
+
+        self.assertEqual(['/a', '/b', '/c'], list(result))
+        self.assertEqual(['a/c'], [item.name for item in result['/c']])
+        self.assertEqual(3, mocked.call_count)
+
+if __name__ == '__main__':
+    unittest.main()
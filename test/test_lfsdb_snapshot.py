@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+import datetime
+
+from unittest import mock
+
+from dataset.item_handler import GroupInfoItem
+from dataset.lfsdb_snapshot import DatabaseSnapshot
+
+class TestDatabaseSnapshot(unittest.TestCase):
+
+    def _create_snapshot(self, date, max_age=0):
+
+        quota_history_table = mock.Mock()
+        quota_history_table.get_latest_group_info_list.return_value = \
+            (date, [GroupInfoItem('a', 1, 2, 3), GroupInfoItem('b', 4, 5, 6)])
+
+        disk_space_usage_table = mock.Mock()
+        disk_space_usage_table.get_latest_total_size.return_value = (date, 1024)
+
+        return DatabaseSnapshot(quota_history_table, disk_space_usage_table, max_age)
+
+    def test_latest_snapshot(self):
+
+        snapshot = self._create_snapshot(datetime.date.today(), 1)
+
+        for _ in range(2):
+
+            group_info_list = snapshot.group_info_list('/lustre')
+            self.assertEqual(['a', 'b'], [item.name for item in group_info_list])
+            group_info_list.reverse()
+
+            self.assertEqual(1024, snapshot.total_size('/lustre'))
+
+        self.assertEqual(['a', 'b'], snapshot.group_names())
+
+        snapshot.quota_history_table.get_latest_group_info_list.assert_called_once_with()
+        snapshot.disk_space_usage_table.get_latest_total_size.assert_called_once_with('/lustre')
+
+    def test_max_age(self):
+
+        date = datetime.date.today() - datetime.timedelta(days=3)
+
+        self.assertEqual(1024, self._create_snapshot(date).total_size('/lustre'))
+
+        with self.assertRaises(RuntimeError):
+            self._create_snapshot(date, 2).group_info_list('/lustre')
+
+        with self.assertRaises(RuntimeError):
+            self._create_snapshot(date, 2).total_size('/lustre')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import unittest
+
+from dataset.item_handler import GroupInfoItem
+
+import report.migration_report as mr
+
+class TestMigrationReport(unittest.TestCase):
+
+    def test_join_by_exact_group_name(self):
+
+        fs1_list = [GroupInfoItem('ab', 1, 2, 500), GroupInfoItem('abc', 1, 2, 3000)]
+        fs2_list = [GroupInfoItem('abc', 1, 2, 2000), GroupInfoItem('xyz', 1, 2, 10)]
+        fs3_list = [GroupInfoItem('ab', 1, 2, 4000)]
+
+        items = mr.create_group_files_migration_info_list(
+            ['ab', 'abc', 'xyz', 'none'], [fs1_list, fs2_list, fs3_list], 1000)
+
+        # A substring match would assign the file count of 'abc' to 'ab'.
+        self.assertEqual(['ab', 'abc'], [item.name for item in items])
+        self.assertEqual([500, 0, 4000], items[0].file_counts)
+        self.assertEqual([3000, 2000, 0], items[1].file_counts)
+
+    def test_read_file_systems(self):
+
+        config = configparser.ConfigParser()
+
+        config.read_dict({'storage': {'file_system_1': '/lustre/a',
+                                      'file_system_name_1': 'A',
+                                      'file_system_2': '/lustre/b',
+                                      'file_system_name_2': 'B',
+                                      'file_system_3': '/lustre/c',
+                                      'file_system_name_3': 'C'}})
+
+        self.assertEqual([('/lustre/a', 'A'), ('/lustre/b', 'B'), ('/lustre/c', 'C')],
+                         mr.read_file_systems(config))
+
+        config.remove_option('storage', 'file_system_2')
+
+        with self.assertRaises(RuntimeError):
+            mr.read_file_systems(config)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+import random
+
+from decimal import Decimal
+
+import numpy as np
+
+from format.number_format import number_to_base_2, number_to_base_2_fast, \
+    numbers_to_base_2
+
+class TestNumberFormat(unittest.TestCase):
+
+    def setUp(self):
+
+        rng = random.Random(42)
+
+        self.values = list()
+
+        # Unit boundaries
+        for shift in range(0, 60, 10):
+            for delta in (-1, 0, 1):
+                if (1 << shift) + delta >= 1:
+                    self.values.append((1 << shift) + delta)
+
+        # Exact halves of the second decimal place
+        for shift in range(10, 60, 10):
+            self.values.extend(
+                (2 * i + 1) * (1 << shift) // 200 for i in range(0, 2000, 25)
+                    if (2 * i + 1) * (1 << shift) % 200 == 0)
+
+        self.values.extend(
+            rng.randint(1, 1 << rng.randint(1, 62)) for _ in range(20000))
+
+    def test_vectorized_matches_number_to_base_2(self):
+
+        expected = [number_to_base_2(value) for value in self.values]
+
+        self.assertEqual(numbers_to_base_2(self.values), expected)
+
+        self.assertEqual(
+            numbers_to_base_2(np.array(self.values, dtype=np.int64)), expected)
+
+        decimals = [Decimal(value) for value in self.values]
+
+        self.assertEqual(numbers_to_base_2(decimals), expected)
+
+    def test_scalar_matches_number_to_base_2(self):
+
+        for value in self.values:
+            self.assertEqual(number_to_base_2_fast(value), number_to_base_2(value))
+
+    def test_not_integral_numbers(self):
+
+        numbers = [Decimal('1E+2'), Decimal('5.5'), 5.5, 1023.999,
+                   Decimal('2E+6'), 1 << 70]
+
+        expected = [number_to_base_2(number) for number in numbers]
+
+        self.assertEqual(numbers_to_base_2(numbers), expected)
+        self.assertEqual([number_to_base_2_fast(n) for n in numbers], expected)
+
+    def test_invalid_numbers(self):
+
+        with self.assertRaises(ValueError):
+            numbers_to_base_2([1024, 0])
+
+        with self.assertRaises(ValueError):
+            number_to_base_2_fast(0)
+
+        with self.assertRaises(TypeError):
+            number_to_base_2_fast('1024')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from utils.pandas_ import lttb_downsample
+
+
+def lttb_reference(x, y, threshold):
+    """Scalar reference implementation of LTTB for a single series."""
+
+    every = (len(x) - 2) / (threshold - 2)
+
+    a = 0
+    sampled = [0]
+
+    for i in range(threshold - 2):
+
+        avg_start = int(np.floor((i + 1) * every)) + 1
+        avg_end = min(int(np.floor((i + 2) * every)) + 1, len(x))
+
+        avg_x = np.mean(x[avg_start:avg_end])
+        avg_y = np.mean(y[avg_start:avg_end])
+
+        range_start = int(np.floor(i * every)) + 1
+        range_end = int(np.floor((i + 1) * every)) + 1
+
+        max_area = -1
+        next_a = range_start
+
+        for j in range(range_start, range_end):
+
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) -
+                       (x[a] - x[j]) * (avg_y - y[a]))
+
+            if area > max_area:
+                max_area = area
+                next_a = j
+
+        sampled.append(next_a)
+        a = next_a
+
+    sampled.append(len(x) - 1)
+
+    return sampled
+
+
+class TestLttbDownsample(unittest.TestCase):
+
+    def setUp(self):
+
+        rng = np.random.RandomState(42)
+
+        index = pd.date_range('2015-01-01', periods=1000, freq='D')
+
+        self.data_frame = pd.DataFrame(
+            rng.randn(1000, 5).cumsum(axis=0), index=index,
+            columns=['group%d' % i for i in range(5)])
+
+    def test_matches_reference(self):
+
+        series_dict = lttb_downsample(self.data_frame, 100)
+
+        x = self.data_frame.index.asi8.astype(np.float64)
+
+        for column in self.data_frame.columns:
+
+            series = series_dict[column]
+            expected = lttb_reference(x, self.data_frame[column].values, 100)
+
+            self.assertEqual(len(series), 100)
+            self.assertEqual(list(series.index),
+                             list(self.data_frame.index[expected]))
+
+    def test_keeps_small_data_frame(self):
+
+        series_dict = lttb_downsample(self.data_frame.head(50), 100)
+
+        for column in self.data_frame.columns:
+            self.assertEqual(len(series_dict[column]), 50)
+
+    def test_keeps_first_and_last_point(self):
+
+        series_dict = lttb_downsample(self.data_frame, 10)
+
+        for column in self.data_frame.columns:
+
+            series = series_dict[column]
+
+            self.assertEqual(series.iloc[0], self.data_frame[column].iloc[0])
+            self.assertEqual(series.iloc[-1], self.data_frame[column].iloc[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import configparser
+import subprocess
+import datetime
+import unittest
+import tempfile
+import os
+
+from unittest import mock
+
+import utils.rsync_ as rsync_
+
+class TestTransferReports(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.path_list = list()
+
+        for name in ('a', 'b'):
+
+            path = os.path.join(self.temp_dir.name, name, 'chart.svg')
+
+            os.mkdir(os.path.dirname(path))
+
+            with open(path, 'w') as f:
+                f.write('<svg/>')
+
+            self.path_list.append(path)
+
+        self.config = configparser.ConfigParser()
+        self.config.read_dict({'transfer': {'host': 'host', 'path': 'reports',
+                                            'service': 'lustre'}})
+
+        self.time_point = datetime.datetime(2023, 5, 10)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _transfer(self, path_list, returncode=0, stdout='', stderr=''):
+
+        calls = list()
+
+        def run(cmd, **kwargs):
+
+            # The files-from file is removed after the call.
+            files_from = [arg for arg in cmd if arg.startswith('--files-from=')][0]
+
+            with open(files_from.split('=', 1)[1], 'r') as f:
+                calls.append((cmd, f.read()))
+
+            return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+        with mock.patch.object(rsync_.subprocess, 'run', side_effect=run):
+            result = rsync_.transfer_reports('weekly', self.time_point, path_list, self.config)
+
+        return result, calls
+
+    def test_transfer_reports(self):
+
+        path_list = [self.path_list[0], os.path.join(self.temp_dir.name, 'b', 'table.html')]
+
+        with open(path_list[1], 'w') as f:
+            f.write('<html/>')
+
+        result, calls = self._transfer(path_list, stdout='chart.svg\n')
+
+        self.assertEqual(['chart.svg'], result)
+        self.assertEqual(1, len(calls))
+
+        cmd, files_from = calls[0]
+
+        self.assertIn('--no-relative', cmd)
+        self.assertEqual(['/', 'host::reports/2023/weekly/19/lustre/'], cmd[-2:])
+        self.assertEqual(''.join(os.path.abspath(path) + '\n' for path in path_list), files_from)
+
+    def test_duplicate_file_name(self):
+
+        with mock.patch.object(rsync_.subprocess, 'run') as run:
+
+            with self.assertRaisesRegex(RuntimeError, 'Duplicate file name'):
+                rsync_.transfer_reports('weekly', self.time_point, self.path_list, self.config)
+
+        run.assert_not_called()
+
+    def test_errors(self):
+
+        missing_path = os.path.join(self.temp_dir.name, 'missing.svg')
+
+        with self.assertRaises(RuntimeError) as cm:
+            rsync_.transfer_reports('weekly', self.time_point,
+                                    self.path_list + ['', missing_path], self.config)
+
+        # All invalid paths are reported at once.
+        message = str(cm.exception)
+
+        self.assertIn('Duplicate file name', message)
+        self.assertIn('Empty path', message)
+        self.assertIn('File was not found: %s' % missing_path, message)
+
+        with self.assertRaisesRegex(RuntimeError, 'exit code 10 to host::.*\n.*connection refused'):
+            self._transfer(self.path_list[:1], returncode=10, stderr='connection refused\n')
+
+class TestTransferPipeline(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.path_list = list()
+
+        for i in range(5):
+
+            path = os.path.join(self.temp_dir.name, "chart_%d.svg" % i)
+
+            with open(path, 'w') as f:
+                f.write('<svg/>')
+
+            self.path_list.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run_pipeline(self, transfer_reports, path_list, retries=2):
+
+        with mock.patch.object(rsync_, 'transfer_reports', transfer_reports):
+
+            pipeline = rsync_.TransferPipeline(
+                'weekly', None, None, retries=retries, retry_delay=0)
+
+            pipeline.start()
+            pipeline.put_all(path_list)
+            pipeline.close()
+
+        return pipeline
+
+    def test_transfer(self):
+
+        transferred = list()
+
+        def transfer_reports(run_mode, time_point, path_list, config):
+            transferred.extend(path_list)
+
+        pipeline = self._run_pipeline(transfer_reports, self.path_list)
+
+        self.assertEqual(sorted(self.path_list), sorted(transferred))
+        self.assertEqual(sorted(self.path_list),
+                         pipeline.path_list(rsync_.TRANSFER_STATUS_DONE))
+
+        pipeline.check()
+
+    def test_retry(self):
+
+        attempts = list()
+
+        def transfer_reports(run_mode, time_point, path_list, config):
+
+            attempts.append(path_list)
+
+            if len(attempts) < 3:
+                raise RuntimeError('Connection refused')
+
+        pipeline = self._run_pipeline(transfer_reports, self.path_list[:1])
+
+        self.assertEqual(3, len(attempts))
+        self.assertEqual(self.path_list[:1],
+                         pipeline.path_list(rsync_.TRANSFER_STATUS_DONE))
+
+    def test_failed(self):
+
+        def transfer_reports(run_mode, time_point, path_list, config):
+            raise RuntimeError('Connection refused')
+
+        missing_path = os.path.join(self.temp_dir.name, 'missing.svg')
+
+        pipeline = self._run_pipeline(
+            transfer_reports, [self.path_list[0], missing_path])
+
+        self.assertEqual(sorted([self.path_list[0], missing_path]),
+                         pipeline.path_list(rsync_.TRANSFER_STATUS_FAILED))
+        self.assertIn('Connection refused', pipeline.errors[self.path_list[0]])
+        self.assertIn('not found', pipeline.errors[missing_path])
+
+        with self.assertRaises(RuntimeError):
+            pipeline.check()
+
+if __name__ == '__main__':
+    unittest.main()
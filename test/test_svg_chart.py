@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+import tempfile
+import shutil
+import re
+import os
+
+import xml.etree.ElementTree as ET
+
+from decimal import Decimal
+
+from chart.svg_chart import SvgQuotaPctBarChart, SvgUsageQuotaBarChart, \
+    SvgUsagePieChart, SvgGroupFilesMigrationBarChart
+
+from chart.chart_backend import get_chart_class, CHART_CLASSES
+
+import dataset.item_handler as ih
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+REGEX_SAMPLE_COMMENT = re.compile(r"<!-- (.*?) -->")
+REGEX_SAMPLE_PATCH = re.compile(
+    r'<path clip-path="[^"]*" d="M [\d.]+ ([\d.]+) \nL [\d.]+ [\d.]+ \n'
+    r'L [\d.]+ ([\d.]+) \nL [\d.]+ [\d.]+ \nz\n" style="fill:(#[0-9a-f]{6});"/>')
+REGEX_SAMPLE_FILL = re.compile(r'style="fill:(#[0-9a-f]{6});"')
+
+
+def sample_labels(sample_file):
+
+    with open(sample_file, 'r') as f:
+        return REGEX_SAMPLE_COMMENT.findall(f.read())
+
+def sample_bar_heights(sample_file, color):
+
+    with open(sample_file, 'r') as f:
+        return [float(base) - float(top)
+                for base, top, fill in REGEX_SAMPLE_PATCH.findall(f.read())
+                if fill == color]
+
+def normalize(values):
+
+    max_value = max(values)
+
+    return [value / max_value for value in values]
+
+
+class TestSvgChart(unittest.TestCase):
+    """
+    Visual equivalence of the native SVG backend to the matplotlib samples
+    in Images/, which were created from the dummy group info list.
+    """
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def _render(self, chart):
+
+        chart.create()
+
+        root = ET.parse(chart.file_path).getroot()
+
+        self.assertEqual(root.tag, SVG_NS + 'svg')
+
+        return root
+
+    @staticmethod
+    def _texts(root):
+        return [elem.text for elem in root.iter(SVG_NS + 'text')]
+
+    @staticmethod
+    def _bar_heights(root, color):
+        return [float(elem.get('height'))
+                for elem in root.findall(SVG_NS + 'rect')
+                if elem.get('fill') == color]
+
+    def test_quota_pct_bar_chart(self):
+
+        sample_file = 'Images/soft_quota_pcnt.svg'
+        path = os.path.join(self.out_dir, 'soft_quota_pcnt.svg')
+
+        root = self._render(SvgQuotaPctBarChart(
+            'Group Quota Usage on Lustre', ih.create_dummy_group_info_list(), path))
+
+        texts = self._texts(root)
+        labels = sample_labels(sample_file)
+
+        group_labels = [label for label in labels if label.startswith('group')]
+
+        self.assertEqual(
+            [text for text in texts if text.startswith('group')], group_labels)
+
+        for label in ('Group', 'Quota Usage (%)', 'Quota Limit',
+                      'Group Quota Usage on Lustre'):
+            self.assertIn(label, texts)
+
+        sample_heights = normalize(sample_bar_heights(sample_file, '#0000ff'))
+        heights = normalize(self._bar_heights(root, '#0000ff'))
+
+        self.assertEqual(len(heights), len(sample_heights))
+
+        for height, sample_height in zip(heights, sample_heights):
+            self.assertAlmostEqual(height, sample_height, places=2)
+
+    def test_usage_quota_bar_chart(self):
+
+        sample_file = 'Images/usage+quota_bar.svg'
+        path = os.path.join(self.out_dir, 'usage+quota_bar.svg')
+
+        root = self._render(SvgUsageQuotaBarChart(
+            'Quota and Disk Space Usage on Lustre',
+            ih.create_dummy_group_info_list(), path))
+
+        texts = self._texts(root)
+        labels = sample_labels(sample_file)
+
+        self.assertEqual(
+            [text for text in texts if text.startswith('group')],
+            [label for label in labels if label.startswith('group')])
+
+        # Y tick labels
+        self.assertEqual([text for text in texts if text.isdigit()],
+                         [label for label in labels if label.isdigit()])
+
+        for color in ('#0000ff', '#ffa500'):
+
+            sample_heights = normalize(sample_bar_heights(sample_file, color))
+            heights = normalize(self._bar_heights(root, color))
+
+            self.assertEqual(len(heights), len(sample_heights))
+
+            for height, sample_height in zip(heights, sample_heights):
+                self.assertAlmostEqual(height, sample_height, places=2)
+
+    def test_usage_pie_chart(self):
+
+        sample_file = 'Images/usage_pie.svg'
+        path = os.path.join(self.out_dir, 'usage_pie.svg')
+
+        root = self._render(SvgUsagePieChart(
+            'Storage Usage on Lustre', ih.create_dummy_group_info_list(), path,
+            18458963071860736 * Decimal(1), 8))
+
+        texts = self._texts(root)
+
+        # Skip matplotlib header and creation time comments.
+        self.assertEqual(texts[:-1], sample_labels(sample_file)[1:-1])
+
+        with open(sample_file, 'r') as f:
+            sample_colors = [color for color in REGEX_SAMPLE_FILL.findall(f.read())
+                             if color != '#ffffff']
+
+        colors = [elem.get('fill') for elem in root.iter(SVG_NS + 'path')]
+
+        self.assertEqual(colors, sample_colors)
+
+    def test_group_files_migration_bar_chart(self):
+
+        path = os.path.join(self.out_dir, 'group_files_migration.svg')
+
+        dataset = ih.create_dummy_group_files_migration_info_list()
+
+        root = self._render(SvgGroupFilesMigrationBarChart(
+            'Group Files Migration', dataset, path, 'A', 'B'))
+
+        texts = self._texts(root)
+
+        self.assertEqual([text for text in texts if text.startswith('group')],
+                         ['group4', 'group6', 'group1', 'group3', 'group7',
+                          'group2', 'group5', 'group8'])
+
+        self.assertEqual(len(self._bar_heights(root, '#0000ff')), len(dataset))
+        self.assertEqual(len(self._bar_heights(root, '#ffa500')), len(dataset))
+
+    def test_chart_classes(self):
+
+        for backend in CHART_CLASSES:
+
+            for chart_name, (module_name, class_name) in CHART_CLASSES[backend].items():
+
+                chart_class = get_chart_class(backend, chart_name)
+
+                self.assertEqual((module_name, class_name),
+                                 (chart_class.__module__, chart_class.__name__))
+
+if __name__ == '__main__':
+    unittest.main()
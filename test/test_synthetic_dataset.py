@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+import tempfile
+import os
+
+import dataset.synthetic_dataset as sd
+import dataset.lfs_dataset_handler as ldh
+
+class TestSyntheticDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, data):
+
+        path = os.path.join(self.temp_dir.name, name)
+
+        with open(path, 'w') as f:
+            f.write(data)
+
+        return path
+
+    def test_lfs_quota_output(self):
+
+        output = sd.create_lfs_quota_output('/lustre', 500, seed=7)
+
+        self.assertEqual(output, sd.create_lfs_quota_output('/lustre', 500, seed=7))
+        self.assertNotEqual(output, sd.create_lfs_quota_output('/lustre', 500, seed=8))
+
+        # Exceeded quotas are marked by '*'.
+        self.assertIn('* ', output)
+
+        parsed_list = ldh.create_group_info_list(
+            '/lustre', self._write('lfs_quota.out', output))
+
+        expected_list = sd.create_group_info_list(500, seed=7)
+
+        self.assertEqual(
+            [(item.name, item.size, item.quota, item.files) for item in expected_list],
+            [(item.name, item.size, item.quota, item.files) for item in parsed_list])
+
+    def test_lfs_df_output(self):
+
+        output = sd.create_lfs_df_output('/lustre', 300, 2, seed=7)
+
+        storage_info = ldh.create_storage_info(
+            '/lustre', self._write('lfs_df.out', output))['/lustre']
+
+        self.assertEqual(300 * sd.OST_KBYTES * 1024, storage_info.ost.total)
+        self.assertEqual(2 * sd.MDT_KBYTES * 1024, storage_info.mdt.total)
+        self.assertLess(storage_info.ost.used, storage_info.ost.total)
+
+    def test_group_quota_history(self):
+
+        history = list(sd.create_group_quota_history(10, 30))
+
+        self.assertEqual(30, len(history))
+        self.assertEqual(29, (history[-1][0] - history[0][0]).days)
+        self.assertTrue(all(len(group_info_list) == 10 for _, group_info_list in history))
+
+        date_values = sd.create_group_date_values(10, 30)
+
+        self.assertEqual(300, len(date_values))
+
+if __name__ == '__main__':
+    unittest.main()
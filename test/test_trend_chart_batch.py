@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import unittest
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+
+from unittest import mock
+
+import chart.trend_chart_batch as tcb
+
+from chart.trend_chart_batch import TrendChartBatch
+
+NUM_DAYS = 60
+
+def create_dataset():
+
+    index = pd.date_range('2023-01-01', periods=NUM_DAYS, freq='D')
+
+    dataset = pd.DataFrame({"group%d" % number: np.arange(NUM_DAYS, dtype=float) * number
+                            for number in range(1, 6)}, index=index)
+
+    dataset['empty'] = np.nan
+
+    return dataset
+
+class TestTrendChartBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_batch(self, chart_dir, **kwargs):
+
+        return TrendChartBatch('Trend of %s', create_dataset(), chart_dir,
+                               'trend_%s.svg', 'Date', 'Size', chunk_size=2, **kwargs)
+
+    def create_charts(self, processes):
+
+        chart_dir = os.path.join(self.temp_dir.name, str(processes))
+        os.mkdir(chart_dir)
+
+        chart_path_list = self.create_batch(chart_dir, processes=processes).create()
+
+        self.assertEqual(sorted(chart_path_list),
+                         sorted(os.path.join(chart_dir, name) for name in os.listdir(chart_dir)))
+
+        return sorted(os.path.basename(path) for path in chart_path_list)
+
+    def test_processes(self):
+
+        # Groups holding only NaN values are skipped.
+        expected = ["trend_group%d.svg" % number for number in range(1, 6)]
+
+        self.assertEqual(expected, self.create_charts(processes=1))
+        self.assertEqual(expected, self.create_charts(processes=3))
+
+    def test_title_and_filename(self):
+
+        batch = self.create_batch(self.temp_dir.name)
+
+        saved = list()
+
+        def savefig(path, format):
+            saved.append((os.path.basename(path), batch._suptitle.get_text(), format))
+
+        with mock.patch('matplotlib.figure.Figure.savefig', side_effect=savefig):
+            batch.create()
+
+        self.assertEqual(('trend_group1.svg', 'Trend of group1', 'svg'), saved[0])
+        self.assertEqual(5, len(saved))
+
+    def test_sub_title_date_range(self):
+
+        batch = self.create_batch(self.temp_dir.name)
+
+        # group2 has a shorter history than the data frame.
+        index = batch.dataset.index
+
+        batch.dataset.loc[index[:10], 'group2'] = np.nan
+        batch.dataset.loc[index[-5:], 'group2'] = np.nan
+
+        sub_titles = dict()
+
+        def savefig(path, format):
+            sub_titles[os.path.basename(path)] = batch._sub_title.get_text()
+
+        with mock.patch('matplotlib.figure.Figure.savefig', side_effect=savefig):
+            batch.create()
+
+        self.assertEqual('Date from 2023-01-01 to 2023-03-01', sub_titles['trend_group1.svg'])
+        self.assertEqual('Date from 2023-01-11 to 2023-02-24', sub_titles['trend_group2.svg'])
+
+    def test_max_points(self):
+
+        batch = self.create_batch(self.temp_dir.name, max_points=10)
+
+        with mock.patch.object(tcb, 'lttb_downsample', wraps=tcb.lttb_downsample) as downsample:
+            batch.create()
+
+        self.assertEqual(10, downsample.call_args[0][1])
+        self.assertTrue(all(len(series.dropna()) <= 10 for series in batch._series_dict.values()))
+        self.assertEqual(NUM_DAYS, len(batch.dataset))
+
+if __name__ == '__main__':
+    unittest.main()
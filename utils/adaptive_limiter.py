@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+import threading
+import logging
+import time
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of concurrent calls with additive increase and
+    multiplicative decrease (AIMD), like TCP congestion control.
+
+    Each call finished within the target latency raises the limit by
+    1/limit, so the limit grows by one per round of calls. A slow or timed
+    out call multiplies the limit by the decrease factor, at most once per
+    target latency, so one overload burst only cuts the limit once.
+    Additionally the rate of started calls can be capped.
+    """
+
+    def __init__(self,
+                 min_concurrency=1,
+                 max_concurrency=8,
+                 target_latency=2.0,
+                 decrease_factor=0.5,
+                 max_rate=0,
+                 initial_concurrency=None):
+        """
+        :param target_latency: Latency in seconds above which the limit is decreased.
+        :param max_rate: Maximum calls started per second, 0 disables the cap.
+        :param initial_concurrency: Start limit, default is min_concurrency.
+        """
+
+        if min_concurrency < 1 or max_concurrency < min_concurrency:
+            raise RuntimeError("Invalid concurrency range: %s - %s"
+                               % (min_concurrency, max_concurrency))
+
+        if not 0 < decrease_factor < 1:
+            raise RuntimeError("Decrease factor must be between 0 and 1: %s"
+                               % decrease_factor)
+
+        if initial_concurrency is None:
+            initial_concurrency = min_concurrency
+
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.max_rate = max_rate
+
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+
+        self.in_flight = 0
+        self.num_decreases = 0
+        self.max_limit_reached = self.limit
+
+        self._condition = threading.Condition()
+        self._next_start_time = 0.0
+        self._last_decrease_time = 0.0
+
+    @classmethod
+    def from_config(cls, config, section='collector'):
+
+        return cls(config.getint(section, 'min_concurrency', fallback=1),
+                   config.getint(section, 'max_concurrency', fallback=8),
+                   config.getfloat(section, 'target_latency', fallback=2.0),
+                   config.getfloat(section, 'decrease_factor', fallback=0.5),
+                   config.getfloat(section, 'max_rate', fallback=0))
+
+    def acquire(self):
+        """Blocks until a call may start."""
+
+        with self._condition:
+
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+
+            self.in_flight += 1
+
+            delay = 0.0
+
+            if self.max_rate:
+
+                now = time.monotonic()
+
+                start_time = max(now, self._next_start_time)
+                self._next_start_time = start_time + 1.0 / self.max_rate
+
+                delay = start_time - now
+
+        # The slot is taken, so waiting for the rate cap does not block others.
+        if delay > 0:
+            time.sleep(delay)
+
+    def release(self, latency, overloaded=False):
+        """
+        :param latency: Latency of the finished call in seconds.
+        :param overloaded: Marks a timed out or failed call as overload signal.
+        """
+
+        with self._condition:
+
+            self.in_flight -= 1
+
+            now = time.monotonic()
+
+            if overloaded or latency > self.target_latency:
+
+                if now - self._last_decrease_time >= self.target_latency:
+
+                    self.limit = max(self.min_concurrency,
+                                     self.limit * self.decrease_factor)
+
+                    self._last_decrease_time = now
+                    self.num_decreases += 1
+
+                    logging.debug("Decreased concurrency limit to %d (latency: %.3fs)"
+                                  % (int(self.limit), latency))
+
+            else:
+
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+                self.max_limit_reached = max(self.max_limit_reached, self.limit)
+
+            self._condition.notify_all()
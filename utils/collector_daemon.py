@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Interval scheduling of collector jobs in a long running process.
+
+A job is due every interval seconds on a fixed grid from the start of the
+daemon and starts after a random delay of up to jitter seconds, so several
+daemons do not hit the file system and database at the same time. The job
+runs in a worker thread. A run still going at the next due time is not
+overlapped, that run is skipped and counted.
+
+The state of the jobs is written atomically to a JSON status file after
+every run, for monitoring and the --status option of the daemon.
+"""
+
+import concurrent.futures
+import threading
+import datetime
+import tempfile
+import logging
+import asyncio
+import random
+import fcntl
+import json
+import time
+import os
+
+from utils.getent_group import get_user_group_entries
+
+
+class GroupCache:
+    """Keeps the user group entries of getent for ttl seconds."""
+
+    def __init__(self, ttl=3600):
+
+        self.ttl = ttl
+
+        self._entries = None
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    def entries(self):
+
+        with self._lock:
+
+            if self._entries is None or time.monotonic() - self._loaded >= self.ttl:
+
+                self._entries = get_user_group_entries()
+                self._loaded = time.monotonic()
+
+                logging.debug("Loaded %d user groups" % len(self._entries))
+
+            return self._entries
+
+
+class CollectorJob:
+
+    def __init__(self, name, func, interval, jitter=0):
+        """
+        :param func: Called without arguments in a worker thread, returns the number of items.
+        :param interval: Seconds between the due times of the job.
+        :param jitter: Maximum random delay in seconds of a run after its due time.
+        """
+
+        if interval <= 0:
+            raise RuntimeError("Invalid interval of job %s: %s" % (name, interval))
+
+        if jitter < 0 or jitter >= interval:
+            raise RuntimeError("Invalid jitter of job %s: %s" % (name, jitter))
+
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_start = None
+        self.last_end = None
+        self.last_duration = None
+        self.last_items = None
+        self.last_success = None
+        self.last_error = None
+        self.next_run = None
+
+        self._future = None
+
+    def is_running(self):
+        return self._future is not None and not self._future.done()
+
+    def run(self):
+        """Runs the job once and records the outcome."""
+
+        self.last_start = time.time()
+
+        start_time = time.perf_counter()
+
+        try:
+            self.last_items = self.func()
+            self.last_success = True
+            self.last_error = None
+
+        except Exception as e:
+
+            logging.exception("Job %s failed" % self.name)
+
+            self.failures += 1
+            self.last_success = False
+            self.last_error = "%s: %s" % (type(e).__name__, e)
+
+        self.last_duration = time.perf_counter() - start_time
+        self.last_end = time.time()
+        self.runs += 1
+
+        logging.info("Job %s finished in %.1fs - Success: %s"
+                     % (self.name, self.last_duration, self.last_success))
+
+    def status(self):
+
+        return {'interval': self.interval,
+                'jitter': self.jitter,
+                'running': self.is_running(),
+                'runs': self.runs,
+                'failures': self.failures,
+                'skipped': self.skipped,
+                'last_start': _isoformat(self.last_start),
+                'last_end': _isoformat(self.last_end),
+                'last_duration': self.last_duration,
+                'last_items': self.last_items,
+                'last_success': self.last_success,
+                'last_error': self.last_error,
+                'next_run': _isoformat(self.next_run)}
+
+
+class CollectorDaemon:
+
+    def __init__(self, jobs, status_file=None):
+
+        if not jobs:
+            raise RuntimeError("No collector jobs configured!")
+
+        self.jobs = jobs
+        self.status_file = status_file
+
+        self.started = None
+
+        self._stop_event = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(jobs), thread_name_prefix='collector')
+
+    def is_healthy(self):
+        """A daemon is healthy if no job failed its last run."""
+        return all(job.last_success is not False for job in self.jobs)
+
+    def status(self):
+
+        return {'pid': os.getpid(),
+                'started': _isoformat(self.started),
+                'updated': _isoformat(time.time()),
+                'healthy': self.is_healthy(),
+                'jobs': {job.name: job.status() for job in self.jobs}}
+
+    def write_status(self):
+
+        if self.status_file:
+            write_status_file(self.status_file, self.status())
+
+    def stop(self):
+        """Stops scheduling new runs, may be called from a signal handler of the loop."""
+
+        if self._stop_event:
+            self._stop_event.set()
+
+    async def _sleep(self, seconds):
+        """
+        :return: True if the daemon is stopped while sleeping.
+        """
+
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), max(seconds, 0))
+        except asyncio.TimeoutError:
+            pass
+
+        return self._stop_event.is_set()
+
+    async def _run_job(self, job):
+
+        loop = asyncio.get_event_loop()
+
+        due_time = loop.time()
+
+        while True:
+
+            delay = random.uniform(0, job.jitter)
+
+            job.next_run = time.time() + (due_time - loop.time()) + delay
+
+            if await self._sleep(due_time + delay - loop.time()):
+                break
+
+            if job.is_running():
+
+                job.skipped += 1
+
+                logging.warning("Skipping run of job %s, the previous run is still running"
+                                % job.name)
+
+            else:
+
+                logging.info("Starting job %s" % job.name)
+
+                job._future = loop.run_in_executor(self._executor, job.run)
+                job._future.add_done_callback(lambda future: self.write_status())
+
+            due_time += job.interval
+
+            # A daemon suspended longer than an interval continues with the next due time.
+            while due_time <= loop.time():
+                due_time += job.interval
+
+        job.next_run = None
+
+        if job.is_running():
+            await job._future
+
+    async def run(self):
+        """Runs the jobs until stop() is called and waits for running jobs."""
+
+        self._stop_event = asyncio.Event()
+
+        self.started = time.time()
+
+        self.write_status()
+
+        try:
+            await asyncio.gather(*(self._run_job(job) for job in self.jobs))
+
+        finally:
+            self._executor.shutdown(wait=True)
+
+        self.write_status()
+
+def write_status_file(path, status):
+    """Replaces the status file atomically, readers never see a partial file."""
+
+    status_dir = os.path.dirname(os.path.abspath(path))
+
+    fd, temp_path = tempfile.mkstemp(dir=status_dir, prefix='.status_')
+
+    try:
+
+        with os.fdopen(fd, 'w') as f:
+            json.dump(status, f, indent=2)
+
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+def read_status_file(path):
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def lock_pid_file(path):
+    """
+    Locks the pid file, so only one daemon runs with it.
+    :return: The open pid file, the lock is held until it is closed.
+    """
+
+    f = open(path, 'a+')
+
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        raise RuntimeError("Daemon already running with pid file: %s" % path)
+
+    f.seek(0)
+    f.truncate()
+    f.write("%d\n" % os.getpid())
+    f.flush()
+
+    return f
+
+def _isoformat(timestamp):
+
+    if timestamp is None:
+        return None
+
+    return datetime.datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Rolling log of the latency, exit status and output size of every lfs call.
+
+Each call is one tab separated line:
+    time  run_id  file_system  group  latency_seconds  exit_status  output_bytes
+
+The log is rotated by size like logging.handlers.RotatingFileHandler,
+so the recent runs are kept at a bounded disk usage.
+"""
+
+import collections
+import logging.handlers
+import datetime
+import logging
+import time
+import os
+
+import numpy as np
+
+FIELD_SEPARATOR = '\t'
+
+LatencyRecord = collections.namedtuple('LatencyRecord',
+    ['time', 'run_id', 'file_system', 'group', 'latency', 'exit_status', 'output_size'])
+
+
+class FlightRecorder:
+
+    def __init__(self, path, max_bytes=10485760, backup_count=5, run_id=None):
+        """
+        :param path: Path of the log file, rotated files get the suffix .1, .2, ...
+        :param run_id: Identifies the calls of one collection run, default is the start time.
+        """
+
+        if run_id is None:
+            run_id = "%s-%d" % (datetime.datetime.now().strftime('%Y%m%dT%H%M%S'), os.getpid())
+
+        self.path = path
+        self.run_id = run_id
+
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count)
+
+        self._handler.setFormatter(logging.Formatter('%(message)s'))
+
+        # Dedicated logger, the records must not show up in the program log.
+        self._logger = logging.getLogger("%s.%s" % (__name__, id(self)))
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(self._handler)
+
+    @classmethod
+    def from_config(cls, config):
+        """Returns a recorder if [flight_recorder] path is set, otherwise None."""
+
+        path = config.get('flight_recorder', 'path', fallback=None)
+
+        if not path:
+            return None
+
+        return cls(path,
+                   config.getint('flight_recorder', 'max_bytes', fallback=10485760),
+                   config.getint('flight_recorder', 'backup_count', fallback=5))
+
+    def record(self, file_system, group, latency, exit_status, output_size):
+
+        self._logger.info(FIELD_SEPARATOR.join((
+            "%.3f" % time.time(),
+            self.run_id,
+            file_system,
+            group,
+            "%.6f" % latency,
+            str(exit_status),
+            str(output_size))))
+
+    def close(self):
+
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+
+
+def read_records(path):
+    """
+    Reads the records of the log file and its rotated files, oldest first.
+    Malformed lines, e.g. of an interrupted write, are skipped.
+    """
+
+    path_list = list()
+
+    index = 1
+
+    while os.path.isfile("%s.%d" % (path, index)):
+        path_list.insert(0, "%s.%d" % (path, index))
+        index += 1
+
+    if os.path.isfile(path):
+        path_list.append(path)
+
+    records = list()
+
+    for log_path in path_list:
+
+        with open(log_path, 'r') as f:
+
+            for line in f:
+
+                fields = line.rstrip('\n').split(FIELD_SEPARATOR)
+
+                if len(fields) != len(LatencyRecord._fields):
+                    continue
+
+                try:
+                    records.append(LatencyRecord(float(fields[0]),
+                                                 fields[1],
+                                                 fields[2],
+                                                 fields[3],
+                                                 float(fields[4]),
+                                                 int(fields[5]),
+                                                 int(fields[6])))
+                except ValueError:
+                    logging.debug("Skipping malformed record: %s" % line)
+
+    return records
+
+def summarize_records(records, num_runs=10, num_top=20):
+    """
+    Creates a summary of the latency percentiles per run and the slowest
+    groups over the last runs.
+    :return: A list of lines.
+    """
+
+    run_dict = collections.OrderedDict()
+
+    for record in records:
+        run_dict.setdefault(record.run_id, list()).append(record)
+
+    run_ids = list(run_dict)[-num_runs:]
+
+    lines = list()
+
+    if not run_ids:
+        return ['No records found.']
+
+    lines.append("%-28s %7s %6s %9s %9s %9s %9s %10s"
+        % ('Run', 'Calls', 'Errors', 'p50 (s)', 'p90 (s)', 'p99 (s)', 'Max (s)', 'Total (s)'))
+
+    group_dict = dict()
+
+    for run_id in run_ids:
+
+        run_records = run_dict[run_id]
+
+        latencies = np.array([record.latency for record in run_records])
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+
+        lines.append("%-28s %7d %6d %9.3f %9.3f %9.3f %9.3f %10.1f"
+            % (run_id, len(run_records),
+               sum(1 for record in run_records if record.exit_status),
+               p50, p90, p99, latencies.max(), latencies.sum()))
+
+        for record in run_records:
+            group_dict.setdefault((record.file_system, record.group), list()).append(record)
+
+    ranking = list()
+
+    for (file_system, group), group_records in group_dict.items():
+
+        latencies = np.array([record.latency for record in group_records])
+
+        ranking.append((float(np.median(latencies)), float(latencies.max()),
+                        file_system, group, len(group_records),
+                        sum(1 for record in group_records if record.exit_status),
+                        max(record.output_size for record in group_records)))
+
+    ranking.sort(reverse=True)
+
+    lines.append('')
+    lines.append("Slowest groups of the last %d runs by median latency:" % len(run_ids))
+    lines.append("%-24s %-20s %6s %6s %11s %9s %9s"
+        % ('Group', 'File System', 'Calls', 'Errors', 'Median (s)', 'Max (s)', 'Bytes'))
+
+    for median, maximum, file_system, group, calls, errors, output_size in ranking[:num_top]:
+
+        lines.append("%-24s %-20s %6d %6d %11.3f %9.3f %9d"
+            % (group, file_system, calls, errors, median, maximum, output_size))
+
+    return lines
@@ -11,23 +11,36 @@
 import logging
 import subprocess
 
-def get_user_groups():
+from utils.instrumentation import stage
+
+def get_user_group_entries():
+    """
+    :return: A list of (gid, group name) tuples of the user groups.
+    """
+
+    user_group_entries = list()
+
+    with stage('getent') as span:
 
-    user_groups = list()
-    output = subprocess.check_output(['getent', 'group']).decode()
+        output = subprocess.check_output(['getent', 'group']).decode()
 
-    output_lines = output.strip().split('\n')
+        output_lines = output.strip().split('\n')
 
-    for line in output_lines:
+        for line in output_lines:
 
-        fields = line.split(':', 3)
-        group = fields[0]
-        gid = int(fields[2])
+            fields = line.split(':', 3)
+            group = fields[0]
+            gid = int(fields[2])
 
-        if gid > 999:
-            logging.debug("Found User Group %s:%s" % (group, gid))
-            user_groups.append(group)
-        else:
-            logging.debug("Ignoring User Group: %s:%s" % (group, gid))
+            if gid > 999:
+                logging.debug("Found User Group %s:%s" % (group, gid))
+                user_group_entries.append((gid, group))
+            else:
+                logging.debug("Ignoring User Group: %s:%s" % (group, gid))
 
-    return user_groups
+        span.items = len(user_group_entries)
+
+    return user_group_entries
+
+def get_user_groups():
+    return [group for _, group in get_user_group_entries()]
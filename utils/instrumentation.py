@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+#
+# -*- coding: utf-8 -*-
+#
+# © Copyright 2023 GSI Helmholtzzentrum für Schwerionenforschung
+#
+# This software is distributed under
+# the terms of the GNU General Public Licence version 3 (GPL Version 3),
+# copied verbatim in the file "LICENCE".
+
+"""
+Records wall time, CPU time, peak RSS and item counts of pipeline stages.
+
+Stages are recorded process wide, like logging, so any function can mark
+a stage without passing an object around:
+
+    with stage('lfs_quota') as span:
+        ...
+        span.items = len(group_names)
+
+CPU time includes finished child processes like lfs and rsync. Stages
+running at the same time, e.g. the background transfer, share the process
+CPU time, so their CPU times overlap.
+"""
+
+import collections
+import contextlib
+import functools
+import threading
+import resource
+import logging
+import time
+import os
+
+METRIC_PREFIX = 'lustre_reports'
+
+_lock = threading.Lock()
+_stages = collections.OrderedDict()
+
+
+class StageStats:
+
+    def __init__(self, name):
+
+        self.name = name
+        self.calls = 0
+        self.items = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_rss = 0
+
+
+class Span:
+    """Handle of a running stage, holds the number of processed items."""
+
+    def __init__(self):
+        self.items = 0
+
+
+def _cpu_time():
+
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+def _peak_rss():
+    """Peak resident set size of the process in bytes, ru_maxrss is in KiB on Linux."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+@contextlib.contextmanager
+def stage(name):
+
+    span = Span()
+
+    start_wall_time = time.perf_counter()
+    start_cpu_time = _cpu_time()
+
+    try:
+        yield span
+
+    finally:
+
+        wall_time = time.perf_counter() - start_wall_time
+        cpu_time = _cpu_time() - start_cpu_time
+
+        with _lock:
+
+            if name not in _stages:
+                _stages[name] = StageStats(name)
+
+            stats = _stages[name]
+
+            stats.calls += 1
+            stats.items += span.items
+            stats.wall_time += wall_time
+            stats.cpu_time += cpu_time
+            stats.peak_rss = max(stats.peak_rss, _peak_rss())
+
+        logging.debug("Stage %s: %.3fs wall, %.3fs CPU, %d items"
+                      % (name, wall_time, cpu_time, span.items))
+
+def timed(name):
+    """Decorator recording each call of a function as stage."""
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+def get_stages():
+
+    with _lock:
+        return list(_stages.values())
+
+def reset():
+
+    with _lock:
+        _stages.clear()
+
+def log_stages():
+
+    for stats in get_stages():
+
+        logging.info("Stage %-28s calls: %4d - items: %8d - wall: %9.3fs - "
+                     "CPU: %9.3fs - peak RSS: %6.1f MiB"
+                     % (stats.name, stats.calls, stats.items, stats.wall_time,
+                        stats.cpu_time, stats.peak_rss / 1048576))
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def create_prometheus_text(job, success, timestamp=None):
+    """
+    Creates the stage metrics in the Prometheus text exposition format.
+    :param job: Name of the entry point, e.g. 'weekly_reports'.
+    :param success: If the run finished without error.
+    """
+
+    if timestamp is None:
+        timestamp = time.time()
+
+    stages = get_stages()
+
+    job_label = 'job="%s"' % _escape_label(job)
+
+    metrics = [
+        ('stage_wall_seconds', 'Wall time of a pipeline stage.',
+            lambda stats: stats.wall_time),
+        ('stage_cpu_seconds', 'CPU time of a pipeline stage including child processes.',
+            lambda stats: stats.cpu_time),
+        ('stage_peak_rss_bytes', 'Peak resident set size of the process at the end of a stage.',
+            lambda stats: stats.peak_rss),
+        ('stage_items', 'Number of items processed by a pipeline stage.',
+            lambda stats: stats.items),
+        ('stage_calls', 'Number of times a pipeline stage ran.',
+            lambda stats: stats.calls),
+    ]
+
+    lines = list()
+
+    for metric, description, value in metrics:
+
+        lines.append("# HELP %s_%s %s" % (METRIC_PREFIX, metric, description))
+        lines.append("# TYPE %s_%s gauge" % (METRIC_PREFIX, metric))
+
+        for stats in stages:
+            lines.append('%s_%s{%s,stage="%s"} %s'
+                % (METRIC_PREFIX, metric, job_label,
+                   _escape_label(stats.name), repr(float(value(stats)))))
+
+    lines.append("# HELP %s_last_run_timestamp_seconds End time of the last run."
+                 % METRIC_PREFIX)
+    lines.append("# TYPE %s_last_run_timestamp_seconds gauge" % METRIC_PREFIX)
+    lines.append("%s_last_run_timestamp_seconds{%s} %s"
+                 % (METRIC_PREFIX, job_label, repr(float(timestamp))))
+
+    lines.append("# HELP %s_last_run_success Whether the last run succeeded."
+                 % METRIC_PREFIX)
+    lines.append("# TYPE %s_last_run_success gauge" % METRIC_PREFIX)
+    lines.append("%s_last_run_success{%s} %d"
+                 % (METRIC_PREFIX, job_label, int(bool(success))))
+
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus_textfile(path, job, success):
+    """
+    Writes the metrics for the node_exporter textfile collector. The file is
+    renamed into place, so the collector never reads a partial file.
+    """
+
+    temp_path = "%s.%d.tmp" % (path, os.getpid())
+
+    with open(temp_path, 'w') as f:
+        f.write(create_prometheus_text(job, success))
+
+    os.rename(temp_path, path)
+
+    logging.debug("Wrote stage metrics: %s" % path)
+
+def export_stages(config, job, success):
+    """
+    Logs the recorded stages and writes them to the textfile configured
+    in the [instrumentation] section, if any. Never raises, so it can be
+    called while handling another error.
+    """
+
+    try:
+
+        log_stages()
+
+        textfile = None
+
+        if config is not None:
+            textfile = config.get('instrumentation', 'textfile', fallback=None)
+
+        if textfile:
+            write_prometheus_textfile(textfile, job, success)
+
+    except Exception:
+        logging.exception('Failed to export stage metrics')
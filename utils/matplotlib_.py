@@ -9,10 +9,12 @@
 # copied verbatim in the file "LICENCE".
 
 import logging
-import matplotlib
 
 def check_matplotlib_version():
 
+    # Imported lazily, so the svg chart backend does not load matplotlib.
+    import matplotlib
+
     mplot_ver = matplotlib.__version__
 
     logging.debug("Running with matplotlib version: %s" % mplot_ver)
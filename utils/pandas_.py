@@ -9,10 +9,14 @@
 # copied verbatim in the file "LICENCE".
 
 import logging
+import numpy as np
 import pandas as pd
 
+from utils.instrumentation import timed
+
 THRESHOLD_DAYS = 28
 
+@timed('data_frame_weekly')
 def create_data_frame_weekly(item_dict):
 
     data_frame = pd.DataFrame()
@@ -59,3 +63,79 @@ def create_data_frame_weekly(item_dict):
 
     else:
         return pd.DataFrame()
+
+def lttb_downsample(data_frame, max_points):
+    """
+    Downsamples each column of a data frame to at most max_points values
+    with the Largest-Triangle-Three-Buckets algorithm.
+    The buckets are shared by all columns, so the point selection is
+    vectorized across all columns of the data frame.
+    :param data_frame: Pandas Data Frame with a DatetimeIndex.
+    :param max_points: Maximum number of points per column (at least 3).
+    :return: A dict with a downsampled Pandas Series for each column.
+    """
+
+    if max_points < 3:
+        raise RuntimeError("LTTB requires at least 3 points, got: %s" % max_points)
+
+    num_rows = len(data_frame)
+
+    if num_rows <= max_points:
+        return {column: data_frame[column] for column in data_frame.columns}
+
+    x = data_frame.index.asi8.astype(np.float64)
+    y = data_frame.values.astype(np.float64)
+
+    num_cols = y.shape[1]
+    cols = np.arange(num_cols)
+
+    # First and last point are always kept, the points in between
+    # are split into (max_points - 2) buckets.
+    num_buckets = max_points - 2
+
+    bucket_edges = \
+        (np.arange(num_buckets + 1) * (num_rows - 2)) // num_buckets + 1
+
+    selected = np.empty((max_points, num_cols), dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = num_rows - 1
+
+    prev_selected = selected[0]
+
+    with np.errstate(invalid='ignore'):
+
+        for i in range(num_buckets):
+
+            start, end = bucket_edges[i], bucket_edges[i + 1]
+
+            if i + 1 < num_buckets:
+                next_start, next_end = bucket_edges[i + 1], bucket_edges[i + 2]
+            else:
+                next_start, next_end = num_rows - 1, num_rows
+
+            next_y = y[next_start:next_end]
+
+            # Mean of the next bucket per column, NaN if it holds no values.
+            next_count = np.sum(~np.isnan(next_y), axis=0)
+            avg_y = np.where(next_count > 0,
+                             np.nansum(next_y, axis=0) / np.maximum(next_count, 1),
+                             np.nan)
+            avg_x = x[next_start:next_end].mean()
+
+            a_x = x[prev_selected]
+            a_y = y[prev_selected, cols]
+
+            b_x = x[start:end, np.newaxis]
+            b_y = y[start:end]
+
+            areas = np.abs((a_x - avg_x) * (b_y - a_y) - (a_x - b_x) * (avg_y - a_y))
+            areas[np.isnan(areas)] = -1.0
+
+            prev_selected = start + np.argmax(areas, axis=0)
+            selected[i + 1] = prev_selected
+
+    logging.debug("Downsampled data frame from %d to %d points per column"
+        % (num_rows, max_points))
+
+    return {column: data_frame[column].iloc[selected[:, index]]
+            for index, column in enumerate(data_frame.columns)}
@@ -8,14 +8,21 @@
 # the terms of the GNU General Public Licence version 3 (GPL Version 3),
 # copied verbatim in the file "LICENCE".
 
+import threading
 import logging
 import subprocess
+import tempfile
+import queue
+import time
 import os
 
-def transfer_report(run_mode, time_point, path, config):
+from utils.instrumentation import stage
 
-    if not path:
-        raise RuntimeError('Empty path for report found!')
+TRANSFER_STATUS_PENDING = 'pending'
+TRANSFER_STATUS_DONE = 'transferred'
+TRANSFER_STATUS_FAILED = 'failed'
+
+def create_remote_target(run_mode, time_point, config):
 
     remote_host = config.get('transfer', 'host')
     remote_path = config.get('transfer', 'path')
@@ -33,14 +40,249 @@ def transfer_report(run_mode, time_point, path, config):
 
     remote_target += service_name + "/"
 
+    return remote_target
+
+def transfer_report(run_mode, time_point, path, config):
+
+    if not path:
+        raise RuntimeError('Empty path for report found!')
+
+    remote_target = create_remote_target(run_mode, time_point, config)
+
     if not os.path.isfile(path):
         raise RuntimeError('File was not found: %s' % path)
 
     try:
 
-        subprocess.check_output(["rsync", path, remote_target]).decode()
+        with stage('rsync') as span:
+            subprocess.check_output(["rsync", path, remote_target]).decode()
+            span.items = 1
 
         logging.debug('rsync %s - %s' % (path, remote_target))
 
     except subprocess.CalledProcessError as e:
         raise RuntimeError(e.output)
+
+def transfer_reports(run_mode, time_point, path_list, config):
+    """
+    Transfers all report files with a single rsync invocation,
+    so only one connection to the rsync daemon is opened per run.
+    Files are listed by --files-from and copied flat into the remote target,
+    unchanged files are skipped by checksum.
+    :param path_list: List of report file paths.
+    :return: List of the transferred file names reported by rsync.
+    """
+
+    if not path_list:
+        raise RuntimeError('Empty report path list found!')
+
+    errors = list()
+    file_names = dict()
+
+    for path in path_list:
+
+        if not path:
+            errors.append('Empty path for report found!')
+
+        elif not os.path.isfile(path):
+            errors.append('File was not found: %s' % path)
+
+        else:
+
+            file_name = os.path.basename(path)
+
+            if file_name in file_names:
+                errors.append('Duplicate file name: %s - %s'
+                              % (file_names[file_name], path))
+            else:
+                file_names[file_name] = path
+
+    if errors:
+        raise RuntimeError("Report transfer failed:\n%s" % '\n'.join(errors))
+
+    remote_target = create_remote_target(run_mode, time_point, config)
+
+    with tempfile.NamedTemporaryFile('w', prefix='rsync-files-', suffix='.txt') as files_from:
+
+        for path in file_names.values():
+            files_from.write(os.path.abspath(path) + '\n')
+
+        files_from.flush()
+
+        cmd = ["rsync",
+               "--checksum",
+               "--no-relative",
+               "--out-format=%n",
+               "--files-from=" + files_from.name,
+               "/",
+               remote_target]
+
+        logging.debug(' '.join(cmd))
+
+        with stage('rsync') as span:
+
+            result = subprocess.run(cmd,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    universal_newlines=True)
+
+            span.items = len(file_names)
+
+    if result.returncode:
+        raise RuntimeError("Report transfer failed with exit code %d to %s:\n%s"
+            % (result.returncode, remote_target, result.stderr.strip()))
+
+    transferred_list = result.stdout.splitlines()
+
+    logging.debug("rsync transferred %d of %d files to %s"
+        % (len(transferred_list), len(file_names), remote_target))
+
+    return transferred_list
+
+class TransferPipeline(object):
+    """
+    Transfers report files in a background thread while further reports
+    are created. Files put into the pipeline are queued and all files
+    queued at a time are sent by one rsync invocation. Failed transfers
+    are retried with exponential backoff.
+
+    close() is the final barrier, it waits until all queued files are
+    processed and logs the status of each file. check() raises an error
+    if any file failed.
+    """
+
+    def __init__(self, run_mode, time_point, config, retries=3, retry_delay=5.0):
+
+        self.run_mode = run_mode
+        self.time_point = time_point
+        self.config = config
+
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+        # Transfer status and error message by file path.
+        self.status = dict()
+        self.errors = dict()
+
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+
+        self._thread = threading.Thread(target=self._run,
+                                        name='TransferPipeline',
+                                        daemon=True)
+        self._thread.start()
+
+    def put(self, path):
+
+        if self._thread is None:
+            raise RuntimeError('Transfer pipeline is not started!')
+
+        self.status[path] = TRANSFER_STATUS_PENDING
+        self._queue.put(path)
+
+    def put_all(self, path_list):
+
+        for path in path_list:
+            self.put(path)
+
+    def close(self):
+
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        for path in sorted(self.status):
+
+            if self.status[path] == TRANSFER_STATUS_FAILED:
+                logging.error("Transfer failed: %s - %s" % (path, self.errors[path]))
+            else:
+                logging.debug("Transfer %s: %s" % (self.status[path], path))
+
+        logging.info("Transferred %d of %d report files"
+            % (len(self.path_list(TRANSFER_STATUS_DONE)), len(self.status)))
+
+    def check(self):
+
+        failed_list = self.path_list(TRANSFER_STATUS_FAILED)
+
+        if failed_list:
+            raise RuntimeError("Report transfer failed for %d files:\n%s"
+                % (len(failed_list), '\n'.join(
+                    "%s - %s" % (path, self.errors[path]) for path in failed_list)))
+
+    def path_list(self, status):
+        return [path for path in sorted(self.status) if self.status[path] == status]
+
+    def _run(self):
+
+        stop = False
+
+        while not stop:
+
+            # Blocks for the next file, then takes all files queued meanwhile.
+            path_list = [self._queue.get()]
+
+            while True:
+                try:
+                    path_list.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in path_list:
+                stop = True
+                path_list = [path for path in path_list if path is not None]
+
+            if path_list:
+                self._transfer(path_list)
+
+    def _transfer(self, path_list):
+
+        valid_list = list()
+
+        for path in path_list:
+
+            if path and os.path.isfile(path):
+                valid_list.append(path)
+            else:
+                self._set_status([path], TRANSFER_STATUS_FAILED,
+                                 'File was not found: %s' % path)
+
+        if not valid_list:
+            return
+
+        for attempt in range(self.retries + 1):
+
+            try:
+
+                transfer_reports(self.run_mode, self.time_point, valid_list, self.config)
+
+                self._set_status(valid_list, TRANSFER_STATUS_DONE)
+
+                return
+
+            except Exception as e:
+
+                if attempt == self.retries:
+                    self._set_status(valid_list, TRANSFER_STATUS_FAILED, str(e))
+                    return
+
+                delay = self.retry_delay * 2 ** attempt
+
+                logging.warning("Transfer of %d files failed, retry in %.1fs: %s"
+                    % (len(valid_list), delay, e))
+
+                time.sleep(delay)
+
+    def _set_status(self, path_list, status, error=None):
+
+        for path in path_list:
+
+            self.status[path] = status
+
+            if error:
+                self.errors[path] = error